@@ -1,6 +1,10 @@
 import logging
+import sys
 
-from sudokusolve import command_line_parser, config, data, plugins, validator
+from sudokusolve import command_line_parser, config, plugins, validator
+
+# the modules of the subcommands, cache and data are only imported when they're used,
+# as importing them takes longer than the rest of start up, see tests/test_startup.py
 
 
 def main(test_sudoku=None):
@@ -15,16 +19,46 @@ def main(test_sudoku=None):
     logging.info(f"Started. {args=}")
     logging.info(f"{config.defaults=}")
 
+    # run a subcommand
+    if args.command == "bench":
+        from sudokusolve import bench
+
+        bench.main(args)
+        exit()
+    if args.command == "generate":
+        from sudokusolve import generator
+
+        generator.main(args)
+        exit()
+    if args.command == "rate":
+        from sudokusolve import rating
+
+        rating.main(args)
+        exit()
+    if args.command == "serve":
+        from sudokusolve import server
+
+        server.main(args)
+        exit()
     # display the available plugins
     if args.plugin_list:
         plugins.list_plugins()
         exit()
     # Choose input
     if args.board_preset is not None:  # test needed as int(0) is a valid preset
-        sudoku_input = data.valid_sudoku_question(args.board_preset)
+        from sudokusolve import data
+
+        try:
+            sudoku_input = data.valid_sudoku_question(
+                args.board_preset, args.preset_size
+            )
+        except IndexError as e:
+            exit(str(e))
     elif args.input_board:
         sudoku_input = args.input_board
     elif test_sudoku:  # for debugging via python
+        from sudokusolve import data
+
         sudoku_input = data.valid_sudoku_question(test_sudoku)
     else:
         sudoku_input = ""
@@ -40,8 +74,29 @@ def main(test_sudoku=None):
     solver_name = args.solver or config.defaults.solver
     solver = plugins.import_plugin("solver", solver_name)
     logging.info(f"Using solver: {solver.__name__}")
+    cache_name = None
+    if args.variants:
+        if not getattr(solver, "supports_variants", False):
+            exit(f"The {solver_name} solver doesn't support variants")
+        cache_name = f"{solver.__name__}[{','.join(sorted(set(args.variants)))}]"
+        solver = solver.SudokuSolver(variants=args.variants)
+        logging.info(f"Using variants: {args.variants}")
+    if config.cache.enabled:
+        from sudokusolve import cache
+
+        solver = cache.cached(solver, name=cache_name)
+    logging.info(f"{config.cache=}")
+    # stop solving when the budget runs out
+    if args.time_limit is not None or args.max_nodes is not None:
+        from sudokusolve.solver import api
+
+        solver = api.BudgetedSolver(solver, args.time_limit, args.max_nodes)
+        logging.info(f"Budget: {args.time_limit=} {args.max_nodes=}")
     # run the program
     ui.run(sudoku_input, solver, validator, max_results)
+    if getattr(solver, "exceeded", None):
+        logging.info(f"Solve stopped early: {solver.exceeded}")
+        print(api.EXCEEDED_MESSAGES[solver.exceeded], file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""Solves many Sudoku boards in parallel.
+
+Boards are split into chunks and each chunk is solved in a worker process by a
+solver plugin, loaded in the worker with plugins.import_plugin. Results come back in
+the same order as the input boards, and a board that can't be solved (e.g. it's not
+a valid input board, propagating its digits shows it has no solution, or the solver
+raises an exception) gets a result with an error message rather than stopping the
+whole batch. Workers given a deadline stop searching when it passes, and the boards
+they haven't finished by then get an error.
+
+Typical usage example:
+
+    for result in batch.solve_many(boards, solver="bitmask", workers=8):
+        if result.error:
+            print(f"{result.board}: {result.error}")
+        else:
+            print(result.solutions[0])
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, NamedTuple
+
+from sudokusolve import config, plugins, validator
+from sudokusolve.solver import api
+
+
+class BoardResult(NamedTuple):
+    board: str
+    solutions: list[str]
+    error: str | None = None
+
+
+def solve_many(
+    boards: Iterable[str],
+    solver: str | None = None,
+    workers: int | None = None,
+    chunksize: int | None = None,
+    max_solutions: int | None = None,
+) -> list[BoardResult]:
+    """Solves every board and returns a BoardResult for each, in input order.
+
+    solver: name of the solver plugin, defaults to the one in the config file
+    workers: number of worker processes, defaults to the number of CPUs. With 1
+        worker the boards are solved in this process.
+    chunksize: number of boards sent to a worker at a time, defaults to splitting the
+        boards into 4 chunks per worker
+    max_solutions: maximum number of solutions per board, defaults to the config file
+    """
+    boards = list(boards)
+    solver = solver or config.defaults.solver
+    workers = workers or os.cpu_count() or 1
+    if max_solutions is None:
+        max_solutions = config.defaults.max_solutions
+    if not chunksize:
+        chunksize = max(1, len(boards) // (workers * 4))
+    chunks = [boards[i : i + chunksize] for i in range(0, len(boards), chunksize)]
+    solve_chunk = partial(solve_boards, solver, max_solutions=max_solutions)
+    results: list[BoardResult] = []
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results.extend(solve_chunk(chunk))
+        return results
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for chunk_results in executor.map(solve_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def solve_boards(
+    solver_name: str,
+    boards: list[str],
+    max_solutions: int,
+    deadline: float | None = None,
+) -> list[BoardResult]:
+    """Solves the boards in this process, as each worker process does.
+
+    deadline: the time.monotonic() to stop solving at, the boards that aren't solved
+        by then get the solutions found so far and an error"""
+    solver = plugins.import_plugin("solver", solver_name)
+    budget = None if deadline is None else api.Budget(deadline)
+    return [_solve_board(solver, board, max_solutions, budget) for board in boards]
+
+
+def _solve_board(
+    solver, board: str, max_solutions: int, budget: api.Budget | None = None
+) -> BoardResult:
+    cleaned_board = validator.clean_string(board)
+    if not validator.validate_input_board(cleaned_board):
+        return BoardResult(board, [], "Input board not valid")
+    if not validator.supports_board(solver, cleaned_board):
+        return BoardResult(board, [], "The solver can't solve boards of this size")
+    if (problem := validator.infeasibility(cleaned_board)) is not None:
+        return BoardResult(board, [], problem.message)
+    try:
+        if budget is None:
+            solutions = solver.solve_sudoku(
+                cleaned_board, validator.solution_validator(solver), max_solutions
+            )
+        else:
+            solutions, _, exceeded = solver.solve_within(
+                cleaned_board,
+                validator.solution_validator(solver),
+                max_solutions,
+                budget,
+            )
+            if exceeded:
+                return BoardResult(board, solutions, api.EXCEEDED_MESSAGES[exceeded])
+    except Exception as e:
+        return BoardResult(board, [], f"{type(e).__name__}: {e}")
+    if not solutions:
+        return BoardResult(board, [], "No solution found")
+    return BoardResult(board, solutions)
@@ -0,0 +1,186 @@
+"""Times the solver plugins over corpora of Sudoku puzzles.
+
+A corpus is either the name of a category in the data file (e.g.
+'single_solution_puzzles') or the path of a text file with one board per line, or of
+a packed boards file (see packed.py). Each
+puzzle is solved a number of times by each solver, after some untimed warm-up
+solves, and the latency percentiles are printed. The timings can also be appended
+to the scores csv file, in the date,sudoku,time,difficulty,alg2,version format used
+by tools/Visualise_Sudoku_Scores.ipynb, with the rating score (see rating.py) of each
+puzzle as its difficulty. By default the 9x9, 16x16 and 25x25 puzzles of the data
+file are timed, and solvers are only timed on the sizes they support (see
+validator.supports_board).
+
+Typical usage example:
+
+    sudokusolve bench -s bitmask -s dlx -c single_solution_puzzles --csv
+"""
+
+import csv
+import datetime
+import statistics
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Iterable, NamedTuple
+
+from sudokusolve import config, data, plugins, rating, validator
+
+DEFAULT_CORPORA = (
+    "single_solution_puzzles",
+    "single_solution_puzzles_16x16",
+    "single_solution_puzzles_25x25",
+)
+PERCENTILES = (50, 90, 99)
+
+
+class PuzzleTiming(NamedTuple):
+    solver: str
+    version: str
+    corpus: str
+    board: str
+    times: list[float]
+    difficulty: float
+
+
+def load_corpus(corpus: str) -> list[str]:
+    """Returns the boards in a data file category, or in a file of boards"""
+    if corpus in data.categories():
+        return [puzzle.question for puzzle in data.sudoku_puzzles(corpus)]
+    path = Path(corpus)
+    if not path.is_file():
+        raise ValueError(f"{corpus!r} is not a data file category or a file")
+    return list(data.read_boards(path))
+
+
+def load_solvers(names: Iterable[str] | None = None) -> dict[str, ModuleType]:
+    """Imports the named solver plugins, or every available solver plugin. Solvers
+    that can't be imported (e.g. missing optional dependencies) are skipped when no
+    names are given."""
+    if names:
+        return {name: plugins.import_plugin("solver", name) for name in names}
+    solvers = {}
+    for name in plugins.find_available_plugins().get("solver", []):
+        try:
+            solvers[name] = plugins.import_plugin("solver", name)
+        except ImportError as e:
+            print(f"Skipping solver {name}: {e}")
+    return solvers
+
+
+def solver_version(solver: ModuleType) -> str:
+    return getattr(getattr(solver, "SudokuSolver", solver), "__version__", "0")
+
+
+def time_solver(
+    solver: ModuleType, board: str, max_solutions: int, repeat: int, warmup: int
+) -> list[float]:
+    """Returns the time in seconds of each of the repeat solves of the board"""
+    completed_board_validator = validator.solution_validator(solver)
+    for _ in range(warmup):
+        solver.solve_sudoku(board, completed_board_validator, max_solutions)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solver.solve_sudoku(board, completed_board_validator, max_solutions)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def board_difficulty(board: str) -> float:
+    """Returns the rating score of the board (see rating.py), or 0 if it can't be
+    rated"""
+    try:
+        return rating.rate_board(board).score
+    except ValueError:
+        return 0.0
+
+
+def percentiles(times: list[float]) -> dict[int, float]:
+    """Returns the PERCENTILES of the times"""
+    if len(times) == 1:
+        return {p: times[0] for p in PERCENTILES}
+    cut_points = statistics.quantiles(times, n=100, method="inclusive")
+    return {p: cut_points[p - 1] for p in PERCENTILES}
+
+
+def benchmark(
+    solvers: dict[str, ModuleType],
+    corpora: Iterable[str],
+    max_solutions: int = 1,
+    repeat: int = 5,
+    warmup: int = 1,
+) -> list[PuzzleTiming]:
+    """Times every solver on every board of every corpus that it supports the size
+    of"""
+    corpora = {corpus: load_corpus(corpus) for corpus in corpora}
+    difficulties = {
+        board: board_difficulty(board)
+        for boards in corpora.values()
+        for board in boards
+    }
+    timings = []
+    for name, solver in solvers.items():
+        version = solver_version(solver)
+        for corpus, boards in corpora.items():
+            for board in boards:
+                if not validator.supports_board(solver, board):
+                    continue
+                times = time_solver(solver, board, max_solutions, repeat, warmup)
+                difficulty = difficulties[board]
+                timings.append(
+                    PuzzleTiming(name, version, corpus, board, times, difficulty)
+                )
+    return timings
+
+
+def append_scores(path: Path, timings: Iterable[PuzzleTiming]) -> None:
+    """Appends a row for every timed solve to the scores csv file"""
+    write_header = not path.exists() or path.stat().st_size == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(["date", "sudoku", "time", "difficulty", "alg2", "version"])
+        for timing in timings:
+            for solve_time in timing.times:
+                writer.writerow(
+                    [
+                        datetime.datetime.now(),
+                        f'"{timing.board}"',
+                        f"{solve_time:.5f}",
+                        timing.difficulty,
+                        True,
+                        f"{timing.solver}-v{timing.version}",
+                    ]
+                )
+
+
+def display_timings(timings: list[PuzzleTiming], per_puzzle: bool = False) -> None:
+    header = "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES)
+    groups: dict[tuple[str, str], list[PuzzleTiming]] = {}
+    for timing in timings:
+        groups.setdefault((timing.solver, timing.corpus), []).append(timing)
+    print(f"{'solver':<16}{'corpus':<32}{'puzzles':>8}{header}{'max ms':>10}")
+    for (solver, corpus), group in groups.items():
+        times = [t for timing in group for t in timing.times]
+        row = "".join(f"{1000 * t:>10.3f}" for t in percentiles(times).values())
+        print(f"{solver:<16}{corpus:<32}{len(group):>8}{row}{1000 * max(times):>10.3f}")
+        if per_puzzle:
+            for timing in group:
+                median = 1000 * statistics.median(timing.times)
+                print(f"    {timing.board} median {median:.3f} ms")
+
+
+def main(args) -> None:
+    """Runs the benchmark from the parsed 'bench' command line arguments"""
+    solvers = load_solvers(args.solvers)
+    timings = benchmark(
+        solvers,
+        args.corpora or DEFAULT_CORPORA,
+        max_solutions=args.max_results,
+        repeat=args.repeat,
+        warmup=args.warmup,
+    )
+    display_timings(timings, args.per_puzzle)
+    if args.csv is not None:
+        append_scores(Path(args.csv or config.filepaths.scores_file), timings)
@@ -0,0 +1,259 @@
+"""Caches the solutions of boards that have been solved before.
+
+CachedSolver wraps any solver plugin and keeps the solutions of the most recently
+solved boards in memory, dropping the least recently used board when it is full.
+It can also keep them in a sqlite file, so repeated boards are still solved
+instantly after a restart. The key is the board and max_solutions, and the counts
+of hits, misses and evictions are kept in stats.
+
+The solutions only depend on the board if the completed board validator accepts
+exactly the valid solutions, so only solves checked with
+validator.validate_solved_board are cached, or with validator.accept_all for
+solvers whose solutions are correct by construction. Solves with any other
+validator are passed straight to the solver.
+
+Typical usage example:
+
+    solver = cache.CachedSolver(plugins.import_plugin("solver", "bitmask"))
+    solutions = solver.solve_sudoku(board, validator.validate_solved_board, 1)
+    print(solver.stats.hits, solver.stats.misses)
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from sudokusolve import config, validator
+from sudokusolve.solver import api
+
+CACHEABLE_VALIDATORS = (validator.validate_solved_board,)
+# only cacheable for solvers that set correct_by_construction
+UNCHECKED_VALIDATORS = (validator.accept_all,)
+
+Key = tuple[str, int]
+
+
+@dataclass
+class CacheStats:
+    """hits: solves answered from the cache (memory or store)
+    store_hits: the hits that were read from the sqlite store
+    misses: solves that had to be passed to the solver
+    evictions: boards dropped from memory to stay within max_entries"""
+
+    hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class SolutionStore:
+    """The solutions of each (solver, board, max_solutions) in a sqlite file"""
+
+    def __init__(self, path: Path) -> None:
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "solver TEXT, board TEXT, max_solutions INTEGER, solutions TEXT, "
+                "PRIMARY KEY (solver, board, max_solutions))"
+            )
+
+    def get(self, solver: str, key: Key) -> list[str] | None:
+        row = self.connection.execute(
+            "SELECT solutions FROM solutions "
+            "WHERE solver = ? AND board = ? AND max_solutions = ?",
+            (solver, *key),
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0].split(",") if row[0] else []
+
+    def put(self, solver: str, key: Key, solutions: list[str]) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                (solver, *key, ",".join(solutions)),
+            )
+
+    def clear(self, solver: str) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM solutions WHERE solver = ?", (solver,))
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class CachedSolver(api.ABCSolver):
+    """solver: the solver plugin (module) or solver object to wrap
+    max_entries: number of boards to keep in memory
+    store: path of the sqlite file to also keep the solutions in, or None
+    name: identifies the solver's solutions in the store, defaults to the name of
+        the plugin module, or the module and class of a solver object"""
+
+    def __init__(
+        self,
+        solver: Any,
+        max_entries: int = 10000,
+        store: Path | None = None,
+        name: str | None = None,
+    ) -> None:
+        self.solver = solver
+        self.max_entries = max_entries
+        self.name = name or getattr(
+            solver, "__name__", f"{type(solver).__module__}.{type(solver).__qualname__}"
+        )
+        self.correct_by_construction = getattr(solver, "correct_by_construction", False)
+        self.board_sides = getattr(solver, "board_sides", (9,))
+        self.variants = getattr(solver, "variants", ())
+        self.store = SolutionStore(store) if store else None
+        self.stats = CacheStats()
+        self._solutions: OrderedDict[Key, list[str]] = OrderedDict()
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> list[str]:
+        """Returns the cached solutions for the board, solving it if they aren't in
+        the cache"""
+        if not self._cacheable(completed_board_validator):
+            return self.solver.solve_sudoku(
+                board, completed_board_validator, max_solutions
+            )
+        key = (board, max_solutions)
+        solutions = self._get(key)
+        if solutions is None:
+            solutions = self.solver.solve_sudoku(
+                board, completed_board_validator, max_solutions
+            )
+            self._add(key, solutions)
+        return list(solutions)
+
+    def solve_with_stats(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> api.SolveResult:
+        """Returns the solver's search statistics when the board isn't cached, and
+        only the wall time when it is"""
+        if not self._cacheable(completed_board_validator) or not hasattr(
+            self.solver, "solve_with_stats"
+        ):
+            return super().solve_with_stats(
+                board, completed_board_validator, max_solutions
+            )
+        start = time.perf_counter()
+        key = (board, max_solutions)
+        solutions = self._get(key)
+        if solutions is None:
+            result = self.solver.solve_with_stats(
+                board, completed_board_validator, max_solutions
+            )
+            self._add(key, result.solutions)
+            return result
+        stats = api.SolveStats(wall_time=time.perf_counter() - start)
+        return api.SolveResult(list(solutions), stats)
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Returns the cached solutions for the board, solving it within the budget
+        if they aren't in the cache. Solves that run out of budget aren't cached."""
+        if not self._cacheable(completed_board_validator) or not hasattr(
+            self.solver, "solve_within"
+        ):
+            return super().solve_within(
+                board, completed_board_validator, max_solutions, budget
+            )
+        start = time.perf_counter()
+        key = (board, max_solutions)
+        solutions = self._get(key)
+        if solutions is None:
+            result = self.solver.solve_within(
+                board, completed_board_validator, max_solutions, budget
+            )
+            if result.exceeded is None:
+                self._add(key, result.solutions)
+            return result
+        stats = api.SolveStats(wall_time=time.perf_counter() - start)
+        return api.BudgetResult(list(solutions), stats)
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Iterator[str]:
+        """Not cached, as the number of solutions wanted isn't known"""
+        return self.solver.iter_solutions(board, completed_board_validator)
+
+    def count_solutions(self, board: api.SudokuBoard, limit: int) -> int:
+        return self.solver.count_solutions(board, limit)
+
+    def clear(self) -> None:
+        """Empties the cache, including this solver's solutions in the store"""
+        self._solutions.clear()
+        if self.store is not None:
+            self.store.clear(self.name)
+
+    def _cacheable(self, completed_board_validator: Callable[[str], bool]) -> bool:
+        """Returns True if the validator accepts exactly the valid solutions of
+        this solver"""
+        if completed_board_validator in CACHEABLE_VALIDATORS:
+            return True
+        return (
+            self.correct_by_construction
+            and completed_board_validator in UNCHECKED_VALIDATORS
+        )
+
+    def _get(self, key: Key) -> list[str] | None:
+        """Returns the solutions from memory, or the store, or None if the board
+        isn't cached. A hit moves the board to the most recently used end."""
+        solutions = self._solutions.get(key)
+        if solutions is not None:
+            self._solutions.move_to_end(key)
+            self.stats.hits += 1
+            return solutions
+        if self.store is not None:
+            solutions = self.store.get(self.name, key)
+            if solutions is not None:
+                self._remember(key, solutions)
+                self.stats.hits += 1
+                self.stats.store_hits += 1
+        return solutions
+
+    def _add(self, key: Key, solutions: list[str]) -> None:
+        """Caches the solutions of a board that missed"""
+        self.stats.misses += 1
+        self._remember(key, list(solutions))
+        if self.store is not None:
+            self.store.put(self.name, key, solutions)
+
+    def _remember(self, key: Key, solutions: list[str]) -> None:
+        self._solutions[key] = solutions
+        while len(self._solutions) > self.max_entries:
+            self._solutions.popitem(last=False)
+            self.stats.evictions += 1
+
+
+def cached(
+    solver: Any,
+    settings: config.CacheSettings | None = None,
+    name: str | None = None,
+) -> Any:
+    """Wraps the solver in a CachedSolver if the cache is enabled in settings
+    (config.cache by default), otherwise returns the solver unchanged. name is
+    passed to CachedSolver."""
+    settings = settings or config.cache
+    if not settings.enabled:
+        return solver
+    store = config.filepaths.cache_file if settings.persistent else None
+    return CachedSolver(solver, settings.max_entries, store, name)
@@ -1,7 +1,7 @@
 import argparse
 
 
-def parse_commandline_args():
+def parse_commandline_args(args: list[str] | None = None):
     parser = argparse.ArgumentParser(
         prog="sudoku", description="Solve any Sudoku puzzle"
     )
@@ -16,9 +16,8 @@ def parse_commandline_args():
     input_parse_group.add_argument(
         "-b",
         "--board-preset",
-        help="use preset Sudoku board 1-6",
+        help="use preset Sudoku board number n, counting from 0",
         action="store",
-        choices=range(0, 7),
         type=int,
     )
     input_parse_group.add_argument(
@@ -48,10 +47,218 @@ def parse_commandline_args():
         type=str,
     )
     parser.add_argument(
+        "--preset-size",
+        help="side of the preset board (default: 9)",
+        action="store",
+        choices=(9, 16, 25),
+        default=9,
+        type=int,
+    )
+    parser.add_argument(
+        "--variant",
+        help="add the constraints of a Sudoku variant, can be repeated",
+        action="append",
+        choices=("diagonal", "windoku", "phistomefel"),
+        default=[],
+        dest="variants",
+    )
+    parser.add_argument(
+        "-m",
+        "--max-results",
+        help="maximum number of solutions to find",
+        action="store",
+        type=int,
+    )
+    parser.add_argument(
+        "--time-limit",
+        help="stop solving after this many seconds and show the solutions found",
+        action="store",
+        type=float,
+    )
+    parser.add_argument(
+        "--max-nodes",
+        help="stop solving after this many search nodes and show the solutions found",
+        action="store",
+        type=int,
+    )
+    subparsers = parser.add_subparsers(dest="command", title="commands")
+    _add_bench_parser(subparsers)
+    _add_generate_parser(subparsers)
+    _add_rate_parser(subparsers)
+    _add_serve_parser(subparsers)
+    return parser.parse_args(args)
+
+
+def _add_bench_parser(subparsers):
+    bench_parser = subparsers.add_parser(
+        "bench", help="time the solver plugins over corpora of puzzles"
+    )
+    bench_parser.add_argument(
+        "-s",
+        "--solver",
+        help="solver plugin to time, can be repeated (default: all solvers)",
+        action="append",
+        dest="solvers",
+        type=str,
+    )
+    bench_parser.add_argument(
+        "-c",
+        "--corpus",
+        help="category of the data file, or a file with one board per line, "
+        "can be repeated (default: the 9x9, 16x16 and 25x25 "
+        "single_solution_puzzles)",
+        action="append",
+        dest="corpora",
+        type=str,
+    )
+    bench_parser.add_argument(
+        "-r",
+        "--repeat",
+        help="number of timed solves of each puzzle",
+        action="store",
+        type=int,
+        default=5,
+    )
+    bench_parser.add_argument(
+        "-w",
+        "--warmup",
+        help="number of untimed solves of each puzzle before timing",
+        action="store",
+        type=int,
+        default=1,
+    )
+    bench_parser.add_argument(
         "-m",
         "--max-results",
         help="maximum number of solutions to find",
         action="store",
         type=int,
+        default=1,
+    )
+    bench_parser.add_argument(
+        "--csv",
+        help="append the timings to a scores csv file (default: the scores file "
+        "in the config)",
+        action="store",
+        nargs="?",
+        const="",
+        type=str,
+    )
+    bench_parser.add_argument(
+        "--per-puzzle",
+        help="show the timings for every puzzle",
+        action="store_true",
+    )
+
+
+def _add_generate_parser(subparsers):
+    generate_parser = subparsers.add_parser(
+        "generate", help="generate new puzzles that have a single solution"
+    )
+    generate_parser.add_argument(
+        "-n",
+        "--count",
+        help="number of puzzles to generate",
+        action="store",
+        type=int,
+        default=1,
+    )
+    generate_parser.add_argument(
+        "-d",
+        "--difficulty",
+        help="difficulty of the puzzles (default: medium)",
+        action="store",
+        choices=["easy", "medium", "hard", "expert"],
+        default="medium",
+    )
+    generate_parser.add_argument(
+        "-w",
+        "--workers",
+        help="number of worker processes (default: the number of CPUs)",
+        action="store",
+        type=int,
+    )
+    generate_parser.add_argument(
+        "--seed",
+        help="seed for the random generator, to generate the same puzzles again",
+        action="store",
+        type=int,
+    )
+    generate_parser.add_argument(
+        "-o",
+        "--output",
+        help="file to write the puzzles to, one per line (default: print them)",
+        action="store",
+        type=str,
+    )
+
+
+def _add_rate_parser(subparsers):
+    rate_parser = subparsers.add_parser(
+        "rate", help="rate the difficulty of every puzzle in corpora of puzzles"
+    )
+    rate_parser.add_argument(
+        "corpora",
+        help="category of the data file, or a file with one board per line",
+        nargs="+",
+        type=str,
+    )
+    rate_parser.add_argument(
+        "-w",
+        "--workers",
+        help="number of worker processes (default: the number of CPUs)",
+        action="store",
+        type=int,
+    )
+
+
+def _add_serve_parser(subparsers):
+    serve_parser = subparsers.add_parser(
+        "serve", help="answer JSON solve requests over HTTP from warm worker processes"
+    )
+    serve_parser.add_argument(
+        "--host",
+        help="address to listen on (default: from the config file)",
+        action="store",
+        type=str,
+    )
+    serve_parser.add_argument(
+        "--port",
+        help="port to listen on, 0 for any free port (default: from the config file)",
+        action="store",
+        type=int,
+    )
+    serve_parser.add_argument(
+        "--unix",
+        help="path of a Unix socket to listen on instead of a port",
+        action="store",
+        type=str,
+    )
+    serve_parser.add_argument(
+        "-s",
+        "--solver",
+        help="solver plugin to load in the workers, can be repeated, the first is "
+        "the default (default: from the config file)",
+        action="append",
+        dest="solvers",
+        type=str,
+    )
+    serve_parser.add_argument(
+        "-w",
+        "--workers",
+        help="number of worker processes (default: the number of CPUs)",
+        action="store",
+        type=int,
+    )
+    serve_parser.add_argument(
+        "--max-pending",
+        help="number of solves queued or running before requests are turned away",
+        action="store",
+        type=int,
+    )
+    serve_parser.add_argument(
+        "--timeout",
+        help="most seconds a request waits for its solves",
+        action="store",
+        type=float,
     )
-    return parser.parse_args()
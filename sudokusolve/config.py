@@ -9,10 +9,14 @@ Typical usage example:
   log_file_path = config.get_filepaths().log_file
 
   default_solver = config.get_defaults().solver
+
+The config file is read the first time one of the settings (defaults, filepaths,
+plugins, cache or server) is used rather than when the module is imported.
 """
 
+from functools import cache as _cache
 from pathlib import Path
-from typing import Dict, NamedTuple
+from typing import Any, Dict, NamedTuple
 
 import tomllib
 
@@ -35,6 +39,26 @@ class PathSettings(NamedTuple):
     parent_directory: Path
     log_file: Path
     data_file: Path
+    puzzle_store: Path
+    scores_file: Path
+    cache_file: Path
+    plugin_manifest: Path
+
+
+class CacheSettings(NamedTuple):
+    enabled: bool
+    max_entries: int
+    persistent: bool
+
+
+class ServerSettings(NamedTuple):
+    host: str
+    port: int
+    workers: int
+    solvers: list[str]
+    max_pending: int
+    timeout: float
+    max_batch: int
 
 
 def _get_defaults(config_data: Dict) -> DefaultSettings:
@@ -51,17 +75,47 @@ def _get_filepaths(config_data: Dict, parent_directory: Path):
         parent_directory=parent_directory,
         log_file=parent_directory / config_data["filepaths"]["log_file"],
         data_file=parent_directory / config_data["filepaths"]["data_file"],
+        puzzle_store=parent_directory / config_data["filepaths"]["puzzle_store"],
+        scores_file=parent_directory / config_data["filepaths"]["scores_file"],
+        cache_file=parent_directory / config_data["filepaths"]["cache_file"],
+        plugin_manifest=parent_directory / config_data["filepaths"]["plugin_manifest"],
     )
 
 
+def _get_cache(config_data: Dict) -> CacheSettings:
+    return CacheSettings(**config_data["cache"])
+
+
+def _get_server(config_data: Dict) -> ServerSettings:
+    return ServerSettings(**config_data["server"])
+
+
 def _read_config(parent_directory: Path) -> Dict:
     with open(parent_directory / PATH_TO_CONFIG_FILE, "rb") as f:
         data = tomllib.load(f)
     return data
 
 
-_parent_directory = Path(__file__).parent
-_config_data = _read_config(_parent_directory)
-defaults = _get_defaults(config_data=_config_data)
-filepaths = _get_filepaths(config_data=_config_data, parent_directory=_parent_directory)
-plugins = _get_plugins(config_data=_config_data)
+@_cache
+def _settings() -> Dict[str, Any]:
+    parent_directory = Path(__file__).parent
+    config_data = _read_config(parent_directory)
+    return {
+        "defaults": _get_defaults(config_data=config_data),
+        "filepaths": _get_filepaths(
+            config_data=config_data, parent_directory=parent_directory
+        ),
+        "plugins": _get_plugins(config_data=config_data),
+        "cache": _get_cache(config_data=config_data),
+        "server": _get_server(config_data=config_data),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    """Reads the config file when a setting is first used (PEP 562)"""
+    try:
+        value = _settings()[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
@@ -6,26 +6,31 @@ and invalid boards. 'puzzles' are returned as a list of NamedTuple,
 each with a single input board (question) and a list of solutions (answers),
 even if there's only 1 solution.
 
+The puzzles are read from a puzzle store (see store.py), which is built from the
+JSON data file the first time it's needed and again whenever the data file changes,
+so a single puzzle can be looked up without parsing the whole file.
+
 Typical usage example:
     puzzle_num = 0
     input_board = data.valid_sudoku_puzzles()[puzzle_num].question
     expected_solution = data.valid_sudoku_puzzles()[puzzle_num].answers[0]
 """
 
-import json
-from typing import NamedTuple
-
-from sudokusolve import config
+from functools import cache
+from pathlib import Path
+from typing import Iterator
 
+from sudokusolve import config, store, validator
+from sudokusolve.store import TestSudoku
 
-class TestSudoku(NamedTuple):
-    question: str
-    answers: list[str]
 
-
-def valid_sudoku_question(puzzle_num: int) -> str:
-    """Retrieves the test Sudoku boards from the data file"""
-    return valid_sudoku_puzzles()[puzzle_num].question
+def valid_sudoku_question(puzzle_num: int, side: int = 9) -> str:
+    """Retrieves a single test Sudoku board of the side (9, 16 or 25) from the data
+    file"""
+    category = "single_solution_puzzles"
+    if side != 9:
+        category += f"_{side}x{side}"
+    return _store().get(category, puzzle_num).question
 
 
 def valid_sudoku_puzzles() -> list[TestSudoku]:
@@ -43,15 +48,60 @@ def multiple_solution_puzzles() -> list[TestSudoku]:
     return _get_sudoku_puzzles("multiple_solution_puzzles")
 
 
-def _get_sudoku_puzzles(category: str) -> list[TestSudoku]:
-    puzzles = _load_data()[category]
-    return [
-        TestSudoku(question=puzzle["question"], answers=puzzle["answers"])
-        for puzzle in puzzles
-    ]
+def categories() -> list[str]:
+    """Returns the names of the categories of puzzles in the data file"""
+    return list(_store().categories)
+
+
+def sudoku_puzzles(category: str) -> list[TestSudoku]:
+    """Retrieves all the puzzles in a category of the data file"""
+    return list(iter_sudoku_puzzles(category))
 
 
-def _load_data():
-    with open(config.filepaths.data_file, "r") as f:
-        data = json.load(f)
-    return data
+def iter_sudoku_puzzles(category: str) -> Iterator[TestSudoku]:
+    """Yields the puzzles in a category of the data file one at a time"""
+    if category not in categories():
+        raise KeyError(f"No category {category!r} in the data file")
+    return _store().iter_puzzles(category)
+
+
+def read_boards(path: Path) -> Iterator[str]:
+    """Yields the boards in a packed file (see packed.py), or in a text file with one
+    board per line"""
+    from sudokusolve import packed
+
+    if packed.is_packed(path):
+        with packed.PackedBoards(path) as boards:
+            yield from boards
+        return
+    with open(path, "r") as f:
+        for line in f:
+            board = validator.clean_string(line)
+            if board:
+                yield board
+
+
+def _get_sudoku_puzzles(category: str) -> list[TestSudoku]:
+    return list(_store().iter_puzzles(category))
+
+
+@cache
+def _store() -> store.PuzzleStore:
+    """Opens the puzzle store, building it first if it's missing, older than the
+    data file or written by another version of store.py. If the data directory can't
+    be written to it's built in a temporary directory instead."""
+    data_file = config.filepaths.data_file
+    path = config.filepaths.puzzle_store
+    if path.exists() and path.stat().st_mtime >= data_file.stat().st_mtime:
+        try:
+            return store.PuzzleStore(path)
+        except store.StoreError:
+            pass
+    try:
+        store.json_to_store(data_file, path)
+    except OSError:
+        import tempfile
+
+        path = Path(tempfile.mkdtemp()) / path.name
+        store.json_to_store(data_file, path)
+    return store.PuzzleStore(path)
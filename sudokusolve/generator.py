@@ -0,0 +1,220 @@
+"""Generates new Sudoku puzzles that have exactly one solution.
+
+Each puzzle starts as a random solved grid, found by a depth first search that
+tries the candidates in a random order. Clues are then removed in a random order,
+and a removal is only kept if the puzzle still has a single solution. Removing more
+clues can only add solutions, so a clue that can't be removed is never tried again
+and each position is checked once.
+
+The checks work on the grids of digit bits used by solver_bitmask, without building
+board strings or running a validator. For the easier difficulties a removal is kept
+if naked and hidden singles alone still solve the puzzle, which also means it has
+one solution. For the harder ones it's kept if none of the other digits that could
+go in the removed clue's position lead to a solution, which
+solver_bitmask.count_grid_solutions checks with a limit of 1. That's quicker than
+counting up to 2 solutions, which would have to find the known solution first.
+
+Typical usage example:
+
+    puzzles = generator.generate_many(1000, "hard", workers=8)
+    print(puzzles[0].question, puzzles[0].solution)
+
+    sudokusolve generate --count 1000 --difficulty hard --output puzzles.txt
+"""
+
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple
+
+from sudokusolve.solver import solver_bitmask
+from sudokusolve.solver.geometry import PEERS
+from sudokusolve.solver.solver_bitmask import Grid
+
+
+class Difficulty(NamedTuple):
+    """min_clues: clues are removed until the puzzle has this many, or none of the
+        remaining clues can be removed
+    solved_by_singles: True if the puzzle must be solvable by naked and hidden
+        singles alone, False if it must need more than that"""
+
+    min_clues: int
+    solved_by_singles: bool
+
+
+DIFFICULTIES = {
+    "easy": Difficulty(min_clues=36, solved_by_singles=True),
+    "medium": Difficulty(min_clues=28, solved_by_singles=True),
+    "hard": Difficulty(min_clues=26, solved_by_singles=False),
+    "expert": Difficulty(min_clues=17, solved_by_singles=False),
+}
+DEFAULT_DIFFICULTY = "medium"
+
+
+class GeneratedPuzzle(NamedTuple):
+    question: str
+    solution: str
+
+
+def generate_puzzle(
+    difficulty: str = DEFAULT_DIFFICULTY, rng: random.Random | None = None
+) -> GeneratedPuzzle:
+    """Returns a new puzzle of the difficulty, with exactly one solution"""
+    settings = DIFFICULTIES[difficulty]
+    rng = rng or random.Random()
+    while True:
+        solution = random_solution(rng)
+        question = remove_clues(solution, settings, rng)
+        if settings.solved_by_singles or not solver_bitmask.solves_with_singles(
+            question
+        ):
+            return GeneratedPuzzle(_grid_to_str(question), _grid_to_str(solution))
+
+
+def generate_many(
+    count: int,
+    difficulty: str = DEFAULT_DIFFICULTY,
+    workers: int | None = None,
+    seed: int | None = None,
+    chunksize: int | None = None,
+) -> list[GeneratedPuzzle]:
+    """Generates count puzzles of the difficulty in worker processes.
+
+    workers: number of worker processes, defaults to the number of CPUs. With 1
+        worker the puzzles are generated in this process.
+    seed: makes the puzzles reproducible, each puzzle has its own random generator
+        seeded from seed and its position, so the puzzles don't depend on workers
+    chunksize: number of puzzles generated by a worker at a time, defaults to
+        splitting the puzzles into 4 chunks per worker
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(
+            f"Unknown difficulty {difficulty!r}, choose from {', '.join(DIFFICULTIES)}"
+        )
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.randrange(2**63)
+    if not chunksize:
+        chunksize = max(1, count // (workers * 4))
+    chunks = [range(i, min(i + chunksize, count)) for i in range(0, count, chunksize)]
+    generate_chunk = partial(_generate_chunk, difficulty, seed)
+    puzzles: list[GeneratedPuzzle] = []
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            puzzles.extend(generate_chunk(chunk))
+        return puzzles
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for chunk_puzzles in executor.map(generate_chunk, chunks):
+            puzzles.extend(chunk_puzzles)
+    return puzzles
+
+
+def random_solution(rng: random.Random) -> Grid:
+    """Returns a random solved grid of digit bits"""
+    stack = [solver_bitmask.grid_state([0] * 81)]
+    while stack:
+        grid, candidates, singles = stack.pop()
+        if not solver_bitmask.propagate(grid, candidates, singles):
+            continue
+        pos = solver_bitmask.position_with_fewest_candidates(candidates)
+        if pos is None:
+            return grid
+        bits = [1 << n for n in range(9) if candidates[pos] >> n & 1]
+        rng.shuffle(bits)
+        for bit in bits:
+            guess_grid, guess_candidates = grid.copy(), candidates.copy()
+            guess_singles: list[int] = []
+            if solver_bitmask.assign(
+                guess_grid, guess_candidates, pos, bit, guess_singles
+            ):
+                stack.append((guess_grid, guess_candidates, guess_singles))
+    raise RuntimeError("The empty board has no solution")
+
+
+def remove_clues(solution: Grid, difficulty: Difficulty, rng: random.Random) -> Grid:
+    """Returns the solution with clues removed in a random order, keeping each
+    removal only if the puzzle still has one solution (solved by singles alone if
+    the difficulty requires it)"""
+    grid = solution.copy()
+    positions = list(range(81))
+    rng.shuffle(positions)
+    clues = 81
+    for pos in positions:
+        if clues <= difficulty.min_clues:
+            break
+        bit = grid[pos]
+        grid[pos] = 0
+        if difficulty.solved_by_singles:
+            unique = solver_bitmask.solves_with_singles(grid)
+        else:
+            unique = not has_other_solution(grid, pos, bit)
+        if unique:
+            clues -= 1
+        else:
+            grid[pos] = bit
+    return grid
+
+
+def has_other_solution(grid: Grid, pos: int, bit: int) -> bool:
+    """Returns True if the grid has a solution with a digit other than bit in the
+    free position pos"""
+    used = 0
+    for peer in PEERS[pos]:
+        used |= grid[peer]
+    others = solver_bitmask.ALL_DIGITS & ~used & ~bit
+    try:
+        while others:
+            other = others & -others
+            others ^= other
+            grid[pos] = other
+            if solver_bitmask.count_grid_solutions(grid, 1):
+                return True
+        return False
+    finally:
+        grid[pos] = 0
+
+
+def display_throughput(
+    count: int, difficulty: str, workers: int, seconds: float
+) -> None:
+    """Prints the puzzles per minute, in total and per worker, to stderr so that the
+    puzzles printed to stdout can be piped"""
+    per_minute = 60 * count / seconds if seconds else float("inf")
+    print(
+        f"Generated {count} {difficulty} puzzles in {seconds:.2f} s with "
+        f"{workers} worker{'s' if workers != 1 else ''}: {per_minute:.0f} per "
+        f"minute, {per_minute / workers:.0f} per minute per worker",
+        file=sys.stderr,
+    )
+
+
+def main(args) -> None:
+    """Generates the puzzles from the parsed 'generate' command line arguments and
+    writes their questions one per line, to the output file or stdout"""
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    puzzles = generate_many(args.count, args.difficulty, workers, args.seed)
+    seconds = time.perf_counter() - start
+    lines = "".join(f"{puzzle.question}\n" for puzzle in puzzles)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(lines)
+    else:
+        print(lines, end="")
+    display_throughput(len(puzzles), args.difficulty, workers, seconds)
+
+
+def _generate_chunk(
+    difficulty: str, seed: int, positions: range
+) -> list[GeneratedPuzzle]:
+    return [
+        generate_puzzle(difficulty, random.Random(f"{seed}-{position}"))
+        for position in positions
+    ]
+
+
+def _grid_to_str(grid: Grid) -> str:
+    return "".join(solver_bitmask.grid_to_str(grid))
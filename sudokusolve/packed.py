@@ -0,0 +1,169 @@
+"""Packs Sudoku boards into 4 bits per position.
+
+Each board is 81 digits, packed 2 to a byte (the first digit in the high nibble)
+with the last low nibble left as 0, so a board takes 41 bytes instead of the 82 of
+a line of text. A packed file is a HEADER (magic, version and number of boards)
+followed by the packed boards, so the boards can be read from a memory map as a
+memoryview or an (N, 41) NumPy array without copying or parsing any lines.
+
+The codecs work on whole chunks of boards with bytes.translate, slicing and a big
+integer shift rather than a Python loop over the digits.
+
+Typical usage example:
+
+    packed.write_packed(path, boards)
+    with packed.PackedBoards(path) as boards:
+        first_board = boards[0]
+        for board in boards:
+            ...
+"""
+
+import mmap
+import os
+import struct
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+MAGIC = b"SUDOKUPK"
+VERSION = 1
+BOARD_SIZE = 81
+PACKED_SIZE = 41
+CHUNK_BOARDS = 100_000
+
+# magic, version, number of boards
+HEADER = struct.Struct("<8sHQ")
+
+TO_NUMBERS = bytes.maketrans(b"0123456789", bytes(range(10)))
+TO_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+HIGH_NIBBLE = bytes(n >> 4 for n in range(256))
+LOW_NIBBLE = bytes(n & 0xF for n in range(256))
+DIGIT_NUMBERS = bytes(range(10))
+
+
+def pack_boards(boards: Iterable[str]) -> bytes:
+    """Packs the 81 digit boards into PACKED_SIZE bytes each"""
+    boards = list(boards)
+    if not boards:
+        return b""
+    text = "\0".join(boards).encode("ascii")
+    # only digits, with the separators exactly BOARD_SIZE digits apart
+    separators = b"\0" * (len(boards) - 1)
+    if (
+        len(text) != len(boards) * (BOARD_SIZE + 1) - 1
+        or text[BOARD_SIZE :: BOARD_SIZE + 1] != separators
+        or text.translate(None, b"0123456789") != separators
+    ):
+        raise ValueError(f"Boards must be {BOARD_SIZE} digits 0-9")
+    numbers = text.translate(TO_NUMBERS) + b"\0"
+    # shifting right 4 bits moves each even digit into the high nibble of the odd
+    # byte after it, so the odd bytes hold the packed pairs
+    value = int.from_bytes(numbers, "big")
+    return ((value >> 4) | value).to_bytes(len(numbers), "big")[1::2]
+
+
+def unpack_boards(data: bytes | memoryview) -> list[str]:
+    """Unpacks boards packed by pack_boards"""
+    if len(data) % PACKED_SIZE:
+        raise ValueError(f"Packed boards are {PACKED_SIZE} bytes each")
+    data = bytes(data)
+    numbers = bytearray(2 * len(data))
+    numbers[0::2] = data.translate(HIGH_NIBBLE)
+    numbers[1::2] = data.translate(LOW_NIBBLE)
+    if numbers[BOARD_SIZE :: BOARD_SIZE + 1].translate(None, b"\0"):
+        raise ValueError("Packed boards have data after the last digit")
+    if numbers.translate(None, DIGIT_NUMBERS):
+        raise ValueError("Packed boards have digits greater than 9")
+    text = numbers.translate(TO_DIGITS).decode("ascii")
+    step = BOARD_SIZE + 1
+    return [text[i : i + BOARD_SIZE] for i in range(0, len(text), step)]
+
+
+def unpack_array(packed):
+    """Unpacks an (N, PACKED_SIZE) uint8 NumPy array (e.g. PackedBoards.as_array) to
+    the (N, 81) int8 array of digits used by solver_numpy_batch"""
+    import numpy as np
+
+    digits = np.empty((len(packed), 2 * PACKED_SIZE), dtype=np.int8)
+    digits[:, 0::2] = packed >> 4
+    digits[:, 1::2] = packed & 0xF
+    return np.ascontiguousarray(digits[:, :BOARD_SIZE])
+
+
+def write_packed(path: Path, boards: Iterable[str]) -> int:
+    """Writes the boards to a packed file, CHUNK_BOARDS at a time so that boards can
+    be a stream of more boards than fit in memory. Returns the number of boards."""
+    count = 0
+    boards = iter(boards)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0))
+        while chunk := list(islice(boards, CHUNK_BOARDS)):
+            f.write(pack_boards(chunk))
+            count += len(chunk)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, count))
+    return count
+
+
+def is_packed(path: Path) -> bool:
+    """Returns True if the file starts with the packed file magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class PackedBoards:
+    """The boards in a packed file, read from a memory map of the file.
+
+    Indexing unpacks a single board, iterating unpacks CHUNK_BOARDS at a time, and
+    data / as_array give the packed boards themselves without copying them."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{self.path} is not a packed boards file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} packed file")
+        if size != HEADER.size + self.count * PACKED_SIZE:
+            self._map.close()
+            raise ValueError(f"{self.path} should have {self.count} boards")
+        self.data = memoryview(self._map)[HEADER.size :]
+
+    def __enter__(self) -> "PackedBoards":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the memory map, which can't be done while an array returned by
+        as_array is still in use"""
+        self.data.release()
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"No board {index} in {self.path}")
+        start = index * PACKED_SIZE
+        return unpack_boards(self.data[start : start + PACKED_SIZE])[0]
+
+    def __iter__(self) -> Iterator[str]:
+        chunk_bytes = CHUNK_BOARDS * PACKED_SIZE
+        for start in range(0, len(self.data), chunk_bytes):
+            yield from unpack_boards(self.data[start : start + chunk_bytes])
+
+    def as_array(self):
+        """Returns the packed boards as an (N, PACKED_SIZE) uint8 NumPy array that
+        shares the memory map, see unpack_array"""
+        import numpy as np
+
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.count, PACKED_SIZE)
@@ -5,18 +5,23 @@ This module looks in the plugin directory.
 for any files that are prefixed with the plugin type,
 and can specific plugins as modules.
 
+The plugins found are saved in a manifest file, along with the modification time of
+each plugin directory, so later runs only scan the directories again when a plugin
+has been added or removed.
+
 Typical usage example:
     solver = import_plugin("solver", "solver_python_sets"
 """
 
 import importlib
-import importlib.util
-import pkgutil
+import json
 from types import ModuleType
 from typing import Dict
 
 from sudokusolve import config
 
+MANIFEST_VERSION = 1
+
 
 def list_plugins() -> None:
     """Prints a list of available plugins to the terminal"""
@@ -41,7 +46,54 @@ def import_plugin(plugin_type: str, plugin_name: str) -> ModuleType:
 def find_available_plugins() -> Dict[str, list[str]]:
     """Returns a dict of the available plugins of the form:
     {plugin_type: [plugin_name1, plugin_name2, ...]}
+
+    The plugins are read from the manifest file if it's up to date, otherwise the
+    plugin directories are scanned and the manifest is rewritten.
     """
+    directories = _plugin_directories()
+    manifest = _read_manifest()
+    if manifest.get("directories") == directories:
+        return manifest["plugins"]
+    plugins = _scan_plugins()
+    _write_manifest({"directories": directories, "plugins": plugins})
+    return plugins
+
+
+def _plugin_directories() -> Dict[str, list]:
+    """Returns the prefix and modification time of each plugin type's directory,
+    which change when a plugin is added to or removed from it"""
+    return {
+        plugin_type: [
+            settings.prefix,
+            (config.filepaths.parent_directory / plugin_type).stat().st_mtime_ns,
+        ]
+        for plugin_type, settings in config.plugins.items()
+    }
+
+
+def _read_manifest() -> Dict:
+    try:
+        with open(config.filepaths.plugin_manifest, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _write_manifest(manifest: Dict) -> None:
+    """Saves the manifest, if the data directory can be written to"""
+    try:
+        with open(config.filepaths.plugin_manifest, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, **manifest}, f)
+    except OSError:
+        pass
+
+
+def _scan_plugins() -> Dict[str, list[str]]:
+    import pkgutil
+
     plugins: Dict[str, list[str]] = {}
     PLUGIN_TYPES = tuple(config.plugins.keys())
     for plugin_type in PLUGIN_TYPES:
@@ -0,0 +1,216 @@
+"""Rates how difficult Sudoku puzzles are.
+
+A puzzle is solved the way a person would: singles are placed until there are none
+left, then the techniques of TECHNIQUE_LADDER are tried from the easiest up, going
+back to the singles whenever one of them removes a candidate. The rating is based on
+the hardest rule that was needed. If the rules get stuck, the rest of the puzzle is
+searched with solver_bitmask, and the number of guesses adds to the score. The
+techniques only support 9x9 boards, so 16x16 and 25x25 boards are rated on the
+singles and the search alone.
+
+Rating a puzzle never takes long: only the first solution is searched for, without
+validating it or checking that it's unique, and the search gives up after
+MAX_SEARCH_NODES nodes. Puzzles that singles solve cost a single propagation, about
+the same as a solve with solver_bitmask, and puzzles that need searching cost one
+pass of the techniques on top of the search, which starts from the candidates the
+techniques left. So puzzles can be rated before being routed to one of the slower
+solvers.
+
+score: LEVELS of the hardest rule, plus log2(1 + guesses) when searching was needed
+name: one of the NAMES, from the score
+
+Typical usage example:
+
+    print(rating.rate_board(board).name)
+    for result in rating.rate_many(boards, workers=8):
+        print(result.board, result.rating.score)
+
+    sudokusolve rate puzzles.txt
+"""
+
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from typing import Iterable, NamedTuple
+
+from sudokusolve import validator
+from sudokusolve.solver import api, solver_bitmask, techniques
+from sudokusolve.solver.geometry import NINE, board_geometry
+
+TECHNIQUE_LADDER = (
+    "pointing_pairs",
+    "box_line_reduction",
+    "naked_pairs",
+    "hidden_pairs",
+    "naked_triples",
+    "hidden_triples",
+    "x_wing",
+)
+LEVELS = {
+    "givens": 0,
+    "naked_singles": 1,
+    "hidden_singles": 2,
+    "pointing_pairs": 3,
+    "box_line_reduction": 3,
+    "naked_pairs": 4,
+    "hidden_pairs": 4,
+    "naked_triples": 5,
+    "hidden_triples": 5,
+    "x_wing": 6,
+    "search": 7,
+}
+# the name of a score is the first one whose maximum score it's within
+NAMES = (
+    (2.0, "easy"),
+    (3.0, "medium"),
+    (5.0, "hard"),
+    (10.0, "expert"),
+    (math.inf, "extreme"),
+)
+MAX_SEARCH_NODES = 2000
+
+
+class Rating(NamedTuple):
+    score: float
+    name: str
+    hardest: str
+    guesses: int
+
+
+class BoardRating(NamedTuple):
+    board: str
+    rating: Rating | None
+    error: str | None = None
+
+
+def rate_board(board: api.SudokuBoard) -> Rating:
+    """Rates the board, raising ValueError if it isn't a valid input board or the
+    rules find that it has no solution"""
+    if not validator.validate_input_board(board):
+        raise ValueError("Input board not valid")
+    geo = board_geometry(board)
+    state = solver_bitmask.initial_state(board, geo)
+    if state is None:
+        raise _no_solution(board)
+    grid, candidates, singles = state
+    stats = api.SolveStats()
+    eliminations: Counter[str] = Counter()
+    ladder = techniques.get_techniques(TECHNIQUE_LADDER if geo is NINE else ())
+    if not solver_bitmask.reduce(
+        grid, candidates, singles, ladder, eliminations, stats, geo
+    ):
+        raise _no_solution(board)
+    used = ["givens", *(+stats.singles), *(+eliminations)]
+    guesses = 0
+    if solver_bitmask.position_with_fewest_candidates(candidates) is not None:
+        guesses = _search_guesses(board, (grid, candidates, singles))
+        used.append("search")
+    hardest = max(used, key=LEVELS.__getitem__)
+    score = LEVELS[hardest] + (math.log2(1 + guesses) if guesses else 0.0)
+    return Rating(round(score, 2), score_name(score), hardest, guesses)
+
+
+def _no_solution(board: api.SudokuBoard) -> ValueError:
+    """The error for a board the rules found has no solution, with the reason if
+    propagation alone finds it"""
+    problem = validator.infeasibility(board)
+    if problem is None:
+        return ValueError("The board has no solution")
+    return ValueError(f"The board has no solution: {problem.message}")
+
+
+def score_name(score: float) -> str:
+    return next(name for max_score, name in NAMES if score <= max_score)
+
+
+def rate_many(
+    boards: Iterable[str], workers: int | None = None, chunksize: int | None = None
+) -> list[BoardRating]:
+    """Rates every board and returns a BoardRating for each, in input order. Boards
+    that can't be rated get an error rather than stopping the rest.
+
+    workers: number of worker processes, defaults to the number of CPUs. With 1
+        worker the boards are rated in this process.
+    chunksize: number of boards sent to a worker at a time, defaults to splitting the
+        boards into 4 chunks per worker
+    """
+    boards = list(boards)
+    workers = workers or os.cpu_count() or 1
+    if not chunksize:
+        chunksize = max(1, len(boards) // (workers * 4))
+    chunks = [boards[i : i + chunksize] for i in range(0, len(boards), chunksize)]
+    results: list[BoardRating] = []
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results.extend(_rate_chunk(chunk))
+        return results
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        for chunk_results in executor.map(_rate_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def display_ratings(results: list[BoardRating], seconds: float, workers: int) -> None:
+    """Prints the board, score, name and hardest rule of each board, then the number
+    of boards with each name and the boards per second to stderr"""
+    names: Counter[str] = Counter()
+    for result in results:
+        if result.rating is None:
+            print(f"{result.board} error: {result.error}")
+            names["error"] += 1
+            continue
+        score, name, hardest, _ = result.rating
+        print(f"{result.board} {score:6.2f} {name:<8} {hardest}")
+        names[name] += 1
+    summary = ", ".join(f"{count} {name}" for name, count in names.items())
+    per_second = len(results) / seconds if seconds else math.inf
+    print(
+        f"Rated {len(results)} boards in {seconds:.2f} s with {workers} "
+        f"worker{'s' if workers != 1 else ''} ({per_second:.0f} per second): "
+        f"{summary}",
+        file=sys.stderr,
+    )
+
+
+def main(args) -> None:
+    """Rates the boards of the corpora from the parsed 'rate' command line
+    arguments"""
+    from sudokusolve import bench
+
+    boards = [board for corpus in args.corpora for board in bench.load_corpus(corpus)]
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = rate_many(boards, workers)
+    display_ratings(results, time.perf_counter() - start, workers)
+
+
+def _search_guesses(
+    board: api.SudokuBoard,
+    state: tuple[solver_bitmask.Grid, solver_bitmask.Candidates, list[int]],
+) -> int:
+    """Returns the guesses the search from the state the rules got stuck in made to
+    find the first solution, or before giving up at MAX_SEARCH_NODES"""
+    stats = api.SolveStats()
+    budget = api.Budget(max_nodes=MAX_SEARCH_NODES)
+    solutions = solver_bitmask.search(board, stats=stats, budget=budget, state=state)
+    with closing(solutions):
+        try:
+            if next(solutions, None) is None:
+                raise ValueError("The board has no solution")
+        except api.BudgetExceeded:
+            pass
+    return stats.guesses
+
+
+def _rate_chunk(boards: list[str]) -> list[BoardRating]:
+    results = []
+    for board in boards:
+        try:
+            results.append(BoardRating(board, rate_board(board)))
+        except ValueError as e:
+            results.append(BoardRating(board, None, str(e)))
+    return results
@@ -0,0 +1,404 @@
+"""Serves Sudoku solves over HTTP from a long-running process.
+
+'sudokusolve serve' listens on a TCP port or a Unix socket and answers JSON
+requests:
+
+    POST /solve  {"board": "...", "solver": "dlx", "max_solutions": 1, "timeout": 5}
+    POST /batch  {"boards": ["...", ...], "solver": "dlx", "max_solutions": 1}
+    GET /health
+
+solver, max_solutions and timeout are optional. A solve is answered with the
+fields of a batch.BoardResult ({"board": ..., "solutions": [...], "error": ...})
+and a batch with {"results": [...]}, in the order of the boards. Connections are
+kept alive between requests.
+
+The solves run in a pool of worker processes that import the solver plugins when
+they start, so a request doesn't pay for starting Python or importing a plugin, and
+asyncio handles the connections while the workers solve. A solve request is one
+job for the pool and a batch is split into a job for each worker.
+
+At most max_pending jobs are queued or running at once, and a request that would
+go over that is answered straight away with 503 and a Retry-After header rather
+than queued (back-pressure). A request that isn't answered within its timeout, which
+is capped at the server's, gets 504 and its jobs that haven't started are
+cancelled. A job that has already started stops searching at the request's
+deadline, so the worker is free again straight away, and counts towards
+max_pending until it does.
+
+Typical usage example:
+
+    sudokusolve serve --port 8765
+    curl -d '{"board": "0030206009..."}' http://127.0.0.1:8765/solve
+
+    sudokusolve serve --unix /tmp/sudoku.sock
+    curl --unix-socket /tmp/sudoku.sock -d '{"boards": [...]}' http://localhost/batch
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Any, NamedTuple
+
+from sudokusolve import batch, config, plugins
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADERS = 100
+# seconds a kept alive connection can wait for its next request
+IDLE_TIMEOUT = 60.0
+RETRY_AFTER_SECONDS = 1
+
+JSON = dict[str, Any]
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    version: str
+    headers: dict[str, str]
+    body: bytes
+
+
+class RequestError(Exception):
+    """A request that can't be answered, with the HTTP status to answer with"""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class SolveServer:
+    """solvers: names of the solver plugins loaded in every worker, the first is
+        used when a request doesn't name one
+    workers: number of worker processes, defaults to the number of CPUs
+    max_pending: number of jobs queued or running before requests are turned away
+    timeout: the most seconds a request waits for its solves
+    max_batch: the most boards in a batch request"""
+
+    def __init__(
+        self,
+        solvers: list[str],
+        workers: int | None = None,
+        max_pending: int = 64,
+        timeout: float = 10.0,
+        max_batch: int = 10000,
+    ) -> None:
+        available = plugins.find_available_plugins().get("solver", [])
+        if not solvers:
+            raise ValueError("The server needs at least one solver")
+        for solver in solvers:
+            if solver not in available:
+                raise ValueError(f"Unknown solver {solver!r}")
+        self.solvers = list(solvers)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_batch = max_batch
+        self.pending = 0
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def start(self) -> None:
+        """Starts the worker processes and waits until they have loaded the
+        solvers"""
+        self._pool = self._new_pool()
+        warm_ups = [self._pool.submit(_warm_up) for _ in range(self.workers)]
+        await asyncio.gather(*map(asyncio.wrap_future, warm_ups))
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def listen(
+        self, host: str = "127.0.0.1", port: int = 0, unix_path: str | None = None
+    ) -> asyncio.Server:
+        """Starts accepting connections on the Unix socket, or else the host and
+        port"""
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def run(
+        self, host: str = "127.0.0.1", port: int = 0, unix_path: str | None = None
+    ) -> None:
+        """Starts the workers and serves requests until cancelled"""
+        await self.start()
+        try:
+            server = await self.listen(host, port, unix_path)
+            address = unix_path or "http://{}:{}".format(
+                *server.sockets[0].getsockname()[:2]
+            )
+            print(
+                f"Serving {', '.join(self.solvers)} with {self.workers} "
+                f"worker{'s' if self.workers != 1 else ''} on {address}",
+                file=sys.stderr,
+            )
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers the requests on a connection until the client closes it"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        _read_request(reader), IDLE_TIMEOUT
+                    )
+                except RequestError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                keep_alive = request.version == "HTTP/1.1" and (
+                    request.headers.get("connection", "").lower() != "close"
+                )
+                status, payload, headers = await self.respond(request)
+                writer.write(_response(status, payload, keep_alive, headers))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(
+        self, request: Request
+    ) -> tuple[HTTPStatus, JSON, dict[str, str]]:
+        """Returns the status, JSON payload and extra headers of the response"""
+        try:
+            if request.path == "/health":
+                _require_method(request, "GET")
+                return HTTPStatus.OK, self.health(), {}
+            if request.path == "/solve":
+                _require_method(request, "POST")
+                return HTTPStatus.OK, await self.solve(_parse_json(request.body)), {}
+            if request.path == "/batch":
+                _require_method(request, "POST")
+                payload = await self.solve_batch(_parse_json(request.body))
+                return HTTPStatus.OK, payload, {}
+            raise RequestError(HTTPStatus.NOT_FOUND, f"No endpoint {request.path}")
+        except RequestError as e:
+            headers = {}
+            if e.status == HTTPStatus.SERVICE_UNAVAILABLE:
+                headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return e.status, {"error": str(e)}, headers
+        except Exception as e:
+            logging.exception(f"Error answering {request.method} {request.path}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(e)}, {}
+
+    def health(self) -> JSON:
+        return {
+            "status": "ok",
+            "solvers": self.solvers,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+        }
+
+    async def solve(self, request: JSON) -> JSON:
+        """Solves the request's board"""
+        board = _field(request, "board", str)
+        results = await self._run(request, [[board]])
+        return results[0]._asdict()
+
+    async def solve_batch(self, request: JSON) -> JSON:
+        """Solves the request's boards, split between the workers"""
+        boards = _field(request, "boards", list)
+        if not all(isinstance(board, str) for board in boards):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "boards must be strings")
+        if len(boards) > self.max_batch:
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"A batch can have at most {self.max_batch} boards",
+            )
+        size = max(1, -(-len(boards) // self.workers))
+        chunks = [boards[i : i + size] for i in range(0, len(boards), size)]
+        results = await self._run(request, chunks)
+        return {"results": [result._asdict() for result in results]}
+
+    async def _run(
+        self, request: JSON, chunks: list[list[str]]
+    ) -> list[batch.BoardResult]:
+        """Solves each chunk of boards as a job in the pool and returns the results
+        of all of them, in order"""
+        solver = request.get("solver", self.solvers[0])
+        if solver not in self.solvers:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST,
+                f"Solver {solver!r} isn't loaded, choose from {self.solvers}",
+            )
+        max_solutions = request.get("max_solutions", 1)
+        if type(max_solutions) is not int or max_solutions < 1:
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST, "max_solutions must be a positive integer"
+            )
+        timeout = request.get("timeout", self.timeout)
+        if type(timeout) not in (int, float) or timeout <= 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "timeout must be positive")
+        timeout = min(timeout, self.timeout)
+        deadline = time.monotonic() + timeout
+        if self.pending + len(chunks) > self.max_pending:
+            raise RequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE, "The server is busy, try again later"
+            )
+        jobs = [
+            self._submit(solver, chunk, max_solutions, deadline) for chunk in chunks
+        ]
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(*map(asyncio.wrap_future, jobs)), timeout
+            )
+        except asyncio.TimeoutError:
+            for job in jobs:
+                job.cancel()
+            raise RequestError(
+                HTTPStatus.GATEWAY_TIMEOUT, f"Not solved within {timeout} s"
+            ) from None
+        except BrokenProcessPool:
+            self._restart_pool()
+            raise RequestError(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                "A worker process stopped, the request can be retried",
+            ) from None
+        return [result for chunk_results in results for result in chunk_results]
+
+    def _submit(
+        self, solver: str, boards: list[str], max_solutions: int, deadline: float
+    ) -> Future[list[batch.BoardResult]]:
+        """Submits a job to the pool, counting it as pending until the worker has
+        finished it or it's cancelled"""
+        loop = asyncio.get_running_loop()
+        job = self._pool.submit(
+            batch.solve_boards, solver, boards, max_solutions, deadline
+        )
+        self.pending += 1
+        job.add_done_callback(lambda _: self._job_done(loop))
+        return job
+
+    def _job_done(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Called in the pool's thread when a job finishes or is cancelled"""
+        try:
+            loop.call_soon_threadsafe(self._count_job_done)
+        except RuntimeError:
+            pass  # the event loop has closed, so there's nothing left to count
+
+    def _count_job_done(self) -> None:
+        self.pending -= 1
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_load_solvers,
+            initargs=(self.solvers,),
+        )
+
+    def _restart_pool(self) -> None:
+        logging.error("A worker process stopped, restarting the pool")
+        self.close()
+        self._pool = self._new_pool()
+
+
+def main(args) -> None:
+    """Runs the server from the parsed 'serve' command line arguments, with the
+    config file's server settings as the defaults"""
+    settings = config.server
+    server = SolveServer(
+        args.solvers or settings.solvers,
+        args.workers or settings.workers or None,
+        args.max_pending or settings.max_pending,
+        args.timeout or settings.timeout,
+        settings.max_batch,
+    )
+    port = settings.port if args.port is None else args.port
+    try:
+        asyncio.run(server.run(args.host or settings.host, port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+    """Reads the next request from the connection, or returns None if the client
+    closed it"""
+    try:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, target, version = request_line.decode("latin-1").split()
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+            if len(headers) > MAX_HEADERS:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "Too many headers")
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request") from None
+    if not 0 <= length <= MAX_BODY_BYTES:
+        raise RequestError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            f"The body can be at most {MAX_BODY_BYTES} bytes",
+        )
+    body = await reader.readexactly(length)
+    return Request(method, target.partition("?")[0], version, headers, body)
+
+
+def _response(
+    status: HTTPStatus,
+    payload: JSON,
+    keep_alive: bool,
+    headers: dict[str, str] | None = None,
+) -> bytes:
+    body = json.dumps(payload).encode()
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        *(f"{name}: {value}" for name, value in (headers or {}).items()),
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _require_method(request: Request, method: str) -> None:
+    if request.method != method:
+        raise RequestError(
+            HTTPStatus.METHOD_NOT_ALLOWED, f"{request.path} only accepts {method}"
+        )
+
+
+def _parse_json(body: bytes) -> JSON:
+    try:
+        request = json.loads(body)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "The body isn't JSON") from None
+    if not isinstance(request, dict):
+        raise RequestError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+    return request
+
+
+def _field(request: JSON, name: str, field_type: type) -> Any:
+    value = request.get(name)
+    if not isinstance(value, field_type):
+        raise RequestError(
+            HTTPStatus.BAD_REQUEST, f"{name} must be a {field_type.__name__}"
+        )
+    return value
+
+
+def _load_solvers(solvers: list[str]) -> None:
+    for solver in solvers:
+        plugins.import_plugin("solver", solver)
+
+
+def _warm_up() -> int:
+    return os.getpid()
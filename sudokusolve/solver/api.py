@@ -1,10 +1,160 @@
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import Callable
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Generator, Iterator, NamedTuple, Protocol
+
+from sudokusolve import validator
+from sudokusolve.solver import feasibility
 
 SudokuBoard = str
 
 
+@dataclass
+class SolveStats:
+    """How much work a solve took. Solvers fill in as much as they can track,
+    anything else is left as 0.
+
+    nodes: search nodes expanded (the initial board counts as 1)
+    guesses: digits tried in a position with more than one candidate
+    backtracks: nodes that turned out to have no solution
+    max_depth: the deepest level the search reached
+    singles: digits placed by each rule, e.g. {"naked_singles": 40}"""
+
+    wall_time: float = 0.0
+    nodes: int = 0
+    guesses: int = 0
+    backtracks: int = 0
+    max_depth: int = 0
+    singles: Counter[str] = field(default_factory=Counter)
+
+
+class CancelFlag(Protocol):
+    """Tells a long search to stop, e.g. a threading.Event or multiprocessing.Event"""
+
+    def is_set(self) -> bool: ...
+
+
+class SolveResult(NamedTuple):
+    solutions: list[SudokuBoard]
+    stats: SolveStats
+
+
+# why a solve stopped before it finished, see Budget
+EXCEEDED_MESSAGES = {
+    "deadline": "The deadline passed before the solve finished",
+    "nodes": "The node budget ran out before the solve finished",
+    "cancelled": "The solve was cancelled",
+}
+
+
+class BudgetExceeded(Exception):
+    """Raised by Budget.spend, reason is one of EXCEEDED_MESSAGES"""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(EXCEEDED_MESSAGES[reason])
+        self.reason = reason
+
+
+@dataclass
+class Budget:
+    """Limits on how much a solve may do. Searches call spend every so often with
+    the nodes they've expanded since the last call, which raises BudgetExceeded once
+    a limit is reached, so a search may go a few nodes over max_nodes.
+
+    deadline: the time.monotonic() to stop at, or None for no time limit
+    max_nodes: the search nodes the solve may expand, or None for no limit
+    cancel: stops the solve once it's set, e.g. a threading.Event
+    nodes: the search nodes spent so far"""
+
+    deadline: float | None = None
+    max_nodes: int | None = None
+    cancel: CancelFlag | None = None
+    nodes: int = 0
+
+    @classmethod
+    def within(
+        cls,
+        seconds: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancelFlag | None = None,
+    ) -> "Budget":
+        """A budget with a deadline seconds from now"""
+        deadline = None if seconds is None else time.monotonic() + seconds
+        return cls(deadline, max_nodes, cancel)
+
+    def spend(self, nodes: int = 0) -> None:
+        self.nodes += nodes
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise BudgetExceeded("nodes")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise BudgetExceeded("deadline")
+        if self.cancel is not None and self.cancel.is_set():
+            raise BudgetExceeded("cancelled")
+
+
+class BudgetResult(NamedTuple):
+    """exceeded: the reason the budget ran out (see EXCEEDED_MESSAGES), in which
+    case solutions are the ones found before it did, or None if the solve finished"""
+
+    solutions: list[SudokuBoard]
+    stats: SolveStats
+    exceeded: str | None = None
+
+
+def take_within(
+    solutions: Iterator[SudokuBoard], max_solutions: int, budget: Budget
+) -> tuple[list[SudokuBoard], str | None]:
+    """Takes up to max_solutions solutions from a search that spends the budget,
+    stopping early if it raises BudgetExceeded. Returns the solutions and the reason
+    the budget ran out, or None if it didn't. The search is closed."""
+    found: list[SudokuBoard] = []
+    try:
+        budget.spend()
+        while len(found) < max_solutions:
+            solution = next(solutions, None)
+            if solution is None:
+                break
+            found.append(solution)
+    except BudgetExceeded as e:
+        return found, e.reason
+    finally:
+        _close(solutions)
+    return found, None
+
+
+def spend_between(
+    solutions: Iterator[SudokuBoard], budget: Budget
+) -> Generator[SudokuBoard, None, None]:
+    """Yields the solutions, checking the budget after each one, for solvers that
+    can't check it during their search"""
+    try:
+        for solution in solutions:
+            yield solution
+            budget.spend()
+    finally:
+        _close(solutions)
+
+
+def _close(solutions: Iterator[SudokuBoard]) -> None:
+    """Closes a search that's a generator, so it can clean up"""
+    close = getattr(solutions, "close", None)
+    if close is not None:
+        close()
+
+
 class ABCSolver(ABC):
+    # True if every solution the solver finds is a valid solved board, so callers
+    # can skip checking them (see validator.solution_validator)
+    correct_by_construction: bool = False
+    # the sides of the boards the solver can solve, out of geometry.SIZES (see
+    # validator.supports_board)
+    board_sides: tuple[int, ...] = (9,)
+    # True if the solver takes a variants argument with the names of the
+    # variants.VARIANTS whose constraints its solutions must meet
+    supports_variants: bool = False
+
     @abstractmethod
     def __init__(self) -> None:
         pass
@@ -17,3 +167,136 @@ class ABCSolver(ABC):
         max_solutions: int,
     ) -> list[SudokuBoard]:
         pass
+
+    def iter_solutions(
+        self,
+        board: SudokuBoard,
+        completed_board_validator: Callable[[SudokuBoard], bool] | None = None,
+    ) -> Iterator[SudokuBoard]:
+        """Yields the solutions that pass the validator one at a time, so the caller
+        decides when to stop. The validator defaults to
+        validator.solution_validator(self).
+
+        Solvers should override this to suspend the search between solutions, by
+        default every solution is found before the first one is yielded."""
+        yield from self.solve_sudoku(
+            board,
+            completed_board_validator or validator.solution_validator(self),
+            sys.maxsize,
+        )
+
+    def count_solutions(self, board: SudokuBoard, limit: int) -> int:
+        """Returns the number of solutions to the board, stopping at limit.
+
+        Solvers should override this to count solutions during the search without
+        building and validating the solution strings. By default the solutions of
+        solvers that aren't correct_by_construction are validated first."""
+        return len(self.solve_sudoku(board, validator.solution_validator(self), limit))
+
+    def solve_with_stats(
+        self,
+        board: SudokuBoard,
+        completed_board_validator: Callable[[SudokuBoard], bool],
+        max_solutions: int = 1,
+    ) -> SolveResult:
+        """Solves the board and also returns statistics about the search.
+
+        Solvers should override this to count the search statistics, by default only
+        the wall time is measured."""
+        stats = SolveStats()
+        start = time.perf_counter()
+        solutions = self.solve_sudoku(board, completed_board_validator, max_solutions)
+        stats.wall_time = time.perf_counter() - start
+        return SolveResult(solutions, stats)
+
+    def solve_within(
+        self,
+        board: SudokuBoard,
+        completed_board_validator: Callable[[SudokuBoard], bool],
+        max_solutions: int,
+        budget: Budget,
+    ) -> BudgetResult:
+        """Solves the board as solve_with_stats until the budget runs out, returning
+        the solutions found by then.
+
+        Solvers should override this to spend the budget during the search, by
+        default it's only checked before the search and after each solution."""
+        stats = SolveStats()
+        start = time.perf_counter()
+        solutions = spend_between(
+            self.iter_solutions(board, completed_board_validator), budget
+        )
+        found, exceeded = take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return BudgetResult(found, stats, exceeded)
+
+    def is_unique(self, board: SudokuBoard) -> bool:
+        """Returns True if the board has exactly one solution. Boards that
+        feasibility.check_board rejects aren't searched, the minimum clue counts
+        only apply to solvers without variants."""
+        return unique_by_count(
+            self.count_solutions, board, not getattr(self, "variants", ())
+        )
+
+
+def unique_by_count(
+    count_solutions: Callable[[SudokuBoard, int], int],
+    board: SudokuBoard,
+    require_unique: bool = True,
+) -> bool:
+    """Returns True if the board has exactly one solution, counting up to 2 with
+    count_solutions unless feasibility.check_board rejects the board first.
+
+    require_unique: apply the minimum clue counts, which only hold without variants"""
+    if feasibility.check_board(board, require_unique=require_unique):
+        return False
+    return count_solutions(board, 2) == 1
+
+
+class BudgetedSolver(ABCSolver):
+    """Wraps a solver so that each solve_sudoku and solve_with_stats stops when a new
+    Budget.within(seconds, max_nodes, cancel) runs out, returning the solutions found
+    by then. The reason the last solve stopped early is left in exceeded.
+
+    solver: the solver plugin (module) or solver object to wrap"""
+
+    def __init__(
+        self,
+        solver: ABCSolver,
+        seconds: float | None = None,
+        max_nodes: int | None = None,
+        cancel: CancelFlag | None = None,
+    ) -> None:
+        self.solver = solver
+        self.seconds = seconds
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.correct_by_construction = getattr(solver, "correct_by_construction", False)
+        self.board_sides = getattr(solver, "board_sides", (9,))
+        self.variants = getattr(solver, "variants", ())
+        self.exceeded: str | None = None
+
+    def solve_sudoku(
+        self,
+        board: SudokuBoard,
+        completed_board_validator: Callable[[SudokuBoard], bool],
+        max_solutions: int = 1,
+    ) -> list[SudokuBoard]:
+        return self.solve_with_stats(
+            board, completed_board_validator, max_solutions
+        ).solutions
+
+    def solve_with_stats(
+        self,
+        board: SudokuBoard,
+        completed_board_validator: Callable[[SudokuBoard], bool],
+        max_solutions: int = 1,
+    ) -> SolveResult:
+        budget = Budget.within(self.seconds, self.max_nodes, self.cancel)
+        solutions, stats, self.exceeded = self.solver.solve_within(
+            board, completed_board_validator, max_solutions, budget
+        )
+        return SolveResult(solutions, stats)
+
+    def count_solutions(self, board: SudokuBoard, limit: int) -> int:
+        return len(self.solve_sudoku(board, lambda _: True, limit))
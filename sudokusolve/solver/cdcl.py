@@ -0,0 +1,292 @@
+"""A conflict driven clause learning (CDCL) SAT solver in pure Python.
+
+Clauses are lists of DIMACS style literals: variable v (counting from 1) is the
+literal v and its negation -v. Internally literal v is 2 * (v - 1) and -v is
+2 * (v - 1) + 1, so a literal's negation is lit ^ 1 and lists can be indexed by
+literal.
+
+Binary clauses are kept as implication lists. Longer clauses are watched by their
+first two literals, so a clause is only looked at when one of its watched literals
+becomes false. A conflict is analysed back to the first unique implication point and
+the learnt clause is added, then the search jumps back to the level where the learnt
+clause asserts a literal. Variables are chosen by activity (VSIDS), bumped when they
+take part in a conflict, with their last value (phase saving), and the search
+restarts after a Luby sequence of conflicts.
+
+Typical usage example:
+
+    sat = cdcl.Solver(num_vars)
+    for clause in clauses:
+        sat.add_clause(clause)
+    while sat.solve():
+        model = sat.model()
+        sat.add_clause([-v if model[v - 1] else v for v in range(1, num_vars + 1)])
+"""
+
+import heapq
+from typing import Iterable
+
+from sudokusolve.solver import api
+
+Clause = list[int]
+
+RESTART_CONFLICTS = 64  # conflicts before the first restart, scaled by luby(n)
+CANCEL_CHECK_NODES = 64  # decisions between checks of the budget
+VAR_DECAY = 0.95
+RESCALE_ACTIVITY = 1e100
+TRUE, FALSE, FREE = 1, -1, 0
+
+
+def luby(n: int) -> int:
+    """The nth term (counting from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    index, size, power = n - 1, 1, 0
+    while size < index + 1:
+        size = 2 * size + 1
+        power += 1
+    while size - 1 != index:
+        size >>= 1
+        power -= 1
+        index %= size
+    return 1 << power
+
+
+class Solver:
+    """num_vars: number of variables, numbered from 1"""
+
+    def __init__(self, num_vars: int) -> None:
+        self.num_vars = num_vars
+        # per literal
+        self.values = [FREE] * (2 * num_vars)
+        self.implications: list[list[tuple[int, Clause]]] = [
+            [] for _ in range(2 * num_vars)
+        ]
+        self.watches: list[list[Clause]] = [[] for _ in range(2 * num_vars)]
+        # per variable
+        self.level = [0] * num_vars
+        self.reason: list[Clause | None] = [None] * num_vars
+        self.activity = [0.0] * num_vars
+        self.phase = [0] * num_vars
+        self.seen = [False] * num_vars
+        self.order = [(0.0, var) for var in range(num_vars)]
+        self.var_inc = 1.0
+        self.trail: list[int] = []
+        self.trail_lim: list[int] = []
+        self.qhead = 0
+        self.ok = True
+        self.decisions = self.conflicts = self.propagations = 0
+        self.restarts = self.max_level = 0
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """Adds a clause of DIMACS literals, going back to level 0 first. Returns
+        False if the clauses can no longer be satisfied."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        clause: Clause = []
+        for literal in literals:
+            lit = 2 * (literal - 1) if literal > 0 else 2 * (-literal - 1) + 1
+            value = self.values[lit]
+            if value == TRUE or lit ^ 1 in clause:
+                return True
+            if value == FREE and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._attach(clause)
+        return self.ok
+
+    def solve(self, budget: api.Budget | None = None) -> bool:
+        """Searches for an assignment that satisfies every clause. Returns True if
+        one is found (see model) or False if there is none. Each decision counts as
+        a node of the budget, which is spent every CANCEL_CHECK_NODES decisions and
+        raises api.BudgetExceeded when it runs out."""
+        if not self.ok:
+            return False
+        restart = 1
+        conflicts_left = RESTART_CONFLICTS * luby(restart)
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self.var_inc /= VAR_DECAY
+                conflicts_left -= 1
+                if conflicts_left <= 0:
+                    self._cancel_until(0)
+                    self.restarts += 1
+                    restart += 1
+                    conflicts_left = RESTART_CONFLICTS * luby(restart)
+                continue
+            var = self._pick_branch_var()
+            if var is None:
+                return True
+            self.decisions += 1
+            if budget is not None and not self.decisions % CANCEL_CHECK_NODES:
+                budget.spend(CANCEL_CHECK_NODES)
+            self.trail_lim.append(len(self.trail))
+            self.max_level = max(self.max_level, len(self.trail_lim))
+            self._enqueue(2 * var + self.phase[var], None)
+
+    def model(self) -> list[bool]:
+        """The value of each variable after solve returned True, model[v - 1] for
+        variable v"""
+        values = self.values
+        return [values[2 * var] == TRUE for var in range(self.num_vars)]
+
+    def _attach(self, clause: Clause) -> None:
+        if len(clause) == 2:
+            first, second = clause
+            self.implications[first].append((second, clause))
+            self.implications[second].append((first, clause))
+        else:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+    def _enqueue(self, lit: int, reason: Clause | None) -> None:
+        self.values[lit] = TRUE
+        self.values[lit ^ 1] = FALSE
+        var = lit >> 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> Clause | None:
+        """Assigns the literals implied by the trail, returning a clause with every
+        literal false if there's a conflict"""
+        values, trail, watches = self.values, self.trail, self.watches
+        enqueue = self._enqueue
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            for other, clause in self.implications[false_lit]:
+                value = values[other]
+                if value == FALSE:
+                    return clause
+                if value == FREE:
+                    enqueue(other, clause)
+            watching = watches[false_lit]
+            kept: list[Clause] = []
+            for index, clause in enumerate(watching):
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if values[first] == TRUE:
+                    kept.append(clause)
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if values[lit] != FALSE:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == FALSE:
+                        kept.extend(watching[index + 1 :])
+                        watches[false_lit] = kept
+                        return clause
+                    enqueue(first, clause)
+            watches[false_lit] = kept
+        return None
+
+    def _analyze(self, conflict: Clause) -> tuple[Clause, int]:
+        """Returns the clause learnt from the conflict, with the literal it asserts
+        first, and the level to go back to"""
+        seen, level, reason, trail = self.seen, self.level, self.reason, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        to_clear = []
+        counter = 0
+        lit = -1
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                var = q >> 1
+                if q == lit or seen[var] or not level[var]:
+                    continue
+                seen[var] = True
+                to_clear.append(var)
+                self._bump(var)
+                if level[var] == current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            counter -= 1
+            if not counter:
+                break
+            clause = reason[lit >> 1]  # type: ignore[assignment]
+        learnt[0] = lit ^ 1
+        for var in to_clear:
+            seen[var] = False
+        back_level = 0
+        if len(learnt) > 1:
+            highest = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            back_level = level[learnt[1] >> 1]
+        return learnt, back_level
+
+    def _bump(self, var: int) -> None:
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > RESCALE_ACTIVITY:
+            for v in range(self.num_vars):
+                activity[v] /= RESCALE_ACTIVITY
+            self.var_inc /= RESCALE_ACTIVITY
+            self._rebuild_order()
+
+    def _cancel_until(self, level: int) -> None:
+        if len(self.trail_lim) <= level:
+            return
+        values, reason, phase = self.values, self.reason, self.phase
+        activity, order = self.activity, self.order
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            values[lit] = values[lit ^ 1] = FREE
+            reason[var] = None
+            phase[var] = lit & 1
+            heapq.heappush(order, (-activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+        if len(order) > 4 * self.num_vars:
+            self._rebuild_order()
+
+    def _rebuild_order(self) -> None:
+        values, activity = self.values, self.activity
+        self.order = [
+            (-activity[var], var)
+            for var in range(self.num_vars)
+            if values[2 * var] == FREE
+        ]
+        heapq.heapify(self.order)
+
+    def _pick_branch_var(self) -> int | None:
+        """The free variable with the highest activity, or None if every variable
+        is assigned. The heap may hold old entries for a variable, which are
+        skipped."""
+        values, order = self.values, self.order
+        while order:
+            _, var = heapq.heappop(order)
+            if values[2 * var] == FREE:
+                return var
+        return None
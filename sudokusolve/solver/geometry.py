@@ -0,0 +1,124 @@
+"""Precomputed position tables for 9x9, 16x16 and 25x25 Sudoku boards.
+
+A board of side N (made of boxes of side sqrt(N)) has N * N positions, numbered row
+by row. A unit is a row, column or square, and the peers of a position are the other
+positions that share a unit with it (20 of them on a 9x9 board). Variants add
+units and other constraints to these tables, see variants.py.
+
+Boards are strings with one character per position: "0" for a free position and
+the first N characters of SYMBOLS for the digits, so 16x16 boards use 1-9 and A-G
+and 25x25 boards 1-9 and A-P. The tables for a size are built the first time
+geometry is called for it. The module constants (ROWS, PEERS etc.) are the tables
+for 9x9 boards.
+
+Typical usage example:
+
+    for peer in geometry.PEERS[position]:
+        ...
+
+    geo = geometry.board_geometry(board)
+    for peer in geo.peers[position]:
+        ...
+"""
+
+from functools import cache
+from typing import NamedTuple
+
+Positions = tuple[int, ...]
+
+SIZES = (9, 16, 25)
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"
+EMPTY = "0"
+MAX_SIDE = max(SIZES)
+
+
+class Geometry(NamedTuple):
+    """side: number of positions in each unit, and of digits
+    digits: the characters of the digits, digits[n] is the digit with bit 1 << n
+    all_digits: the mask with a bit set for every digit
+    digit_bits: the bit of each character of a board, 0 for EMPTY
+    bit_digits: the character of each digit bit
+    units: the rows, columns and squares, then the extra units of any variants
+    equal_sets: pairs of sets of positions that must hold the same digits the same
+        number of times, added by variants"""
+
+    box: int
+    side: int
+    cells: int
+    digits: str
+    all_digits: int
+    digit_bits: dict[str, int]
+    bit_digits: dict[int, str]
+    rows: tuple[Positions, ...]
+    cols: tuple[Positions, ...]
+    sqrs: tuple[Positions, ...]
+    units: tuple[Positions, ...]
+    row_of: Positions
+    col_of: Positions
+    sqr_of: Positions
+    peers: tuple[Positions, ...]
+    equal_sets: tuple[tuple[Positions, Positions], ...] = ()
+
+
+@cache
+def geometry(side: int) -> Geometry:
+    """Returns the tables for boards of the side, which must be one of SIZES"""
+    if side not in SIZES:
+        raise ValueError(f"Boards must be {', '.join(f'{s}x{s}' for s in SIZES)}")
+    box = int(side**0.5)
+    cells = side * side
+    digits = SYMBOLS[:side]
+    rows = tuple(tuple(range(r * side, (r + 1) * side)) for r in range(side))
+    cols = tuple(tuple(range(c, cells, side)) for c in range(side))
+    row_of = tuple(pos // side for pos in range(cells))
+    col_of = tuple(pos % side for pos in range(cells))
+    sqr_of = tuple((row // box) * box + col // box for row, col in zip(row_of, col_of))
+    sqrs = tuple(
+        tuple(pos for pos in range(cells) if sqr_of[pos] == s) for s in range(side)
+    )
+    units = rows + cols + sqrs
+    return Geometry(
+        box=box,
+        side=side,
+        cells=cells,
+        digits=digits,
+        all_digits=(1 << side) - 1,
+        digit_bits={EMPTY: 0, **{digit: 1 << n for n, digit in enumerate(digits)}},
+        bit_digits={1 << n: digit for n, digit in enumerate(digits)},
+        rows=rows,
+        cols=cols,
+        sqrs=sqrs,
+        units=units,
+        row_of=row_of,
+        col_of=col_of,
+        sqr_of=sqr_of,
+        peers=unit_peers(cells, units),
+    )
+
+
+def unit_peers(cells: int, units: tuple[Positions, ...]) -> tuple[Positions, ...]:
+    """Returns the peers of each position, the other positions of the units it's in"""
+    peers: list[set[int]] = [set() for _ in range(cells)]
+    for unit in units:
+        for pos in unit:
+            peers[pos].update(unit)
+    return tuple(tuple(sorted(peers[pos] - {pos})) for pos in range(cells))
+
+
+def board_geometry(board: str) -> Geometry:
+    """Returns the tables for the size of the board, from its length"""
+    side = int(len(board) ** 0.5)
+    if side * side != len(board) or side not in SIZES:
+        raise ValueError(f"A board of {len(board)} positions is not a supported size")
+    return geometry(side)
+
+
+NINE = geometry(9)
+ROWS = NINE.rows
+COLS = NINE.cols
+SQRS = NINE.sqrs
+UNITS = NINE.units
+ROW_OF = NINE.row_of
+COL_OF = NINE.col_of
+SQR_OF = NINE.sqr_of
+PEERS = NINE.peers
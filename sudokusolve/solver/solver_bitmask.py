@@ -0,0 +1,545 @@
+"""Solves Sudoku boards using integer bitmasks for the candidates.
+
+Each free position holds a 9-bit mask of the digits still available to it (bit 0 is
+the digit 1, bit 8 the digit 9). Placing a digit clears that bit from the position's
+20 peers, so naked singles fall out as masks with a single bit set and hidden singles
+as bits that appear exactly once across a row, column or square. When neither rule
+applies, the position with the fewest candidates is chosen and each option is tried
+on a copy of the board.
+
+16x16 and 25x25 boards work the same way with 16 and 25-bit masks, using the tables
+of geometry.board_geometry. The extra techniques only support 9x9 boards. Variants
+(see variants.py) add their units to the same tables, and their equal sets are
+checked along with the singles.
+
+Typical usage example:
+
+    solutions = solver_bitmask.solve_sudoku(board, validator.validate_solved_board, 1)
+"""
+
+import time
+from collections import Counter
+from contextlib import closing
+from itertools import islice
+from typing import Callable, Generator, Iterable, Iterator
+
+from sudokusolve.solver import api, techniques, variants
+from sudokusolve.solver.geometry import (
+    MAX_SIDE,
+    NINE,
+    SIZES,
+    Geometry,
+    board_geometry,
+)
+
+Grid = list[int]
+Candidates = list[int]
+
+DIGITS = NINE.digits
+ALL_DIGITS = NINE.all_digits
+BIT_TO_DIGIT = NINE.bit_digits
+CANCEL_CHECK_NODES = 64
+
+
+class SudokuSolver(api.ABCSolver):
+    """techniques: names of the extra elimination techniques (see
+        techniques.TECHNIQUES) to apply after the singles and before guessing
+    variants: names of the variants.VARIANTS whose constraints the solutions must
+        also meet
+    regions: extra regions of positions that must each hold every digit once, e.g.
+        the irregular regions drawn on a puzzle"""
+
+    __version__ = "3"
+    correct_by_construction = True
+    board_sides = SIZES
+    supports_variants = True
+
+    def __init__(
+        self,
+        techniques: Iterable[str] = (),
+        variants: Iterable[str] = (),
+        regions: Iterable[Iterable[int]] = (),
+    ) -> None:
+        self.techniques = tuple(techniques)
+        self.variants = tuple(variants)
+        self.regions = tuple(tuple(region) for region in regions)
+        self.valid_solutions: list[str] = []
+        self.eliminations: Counter[str] = Counter()
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+        techniques: Iterable[str] | None = None,
+    ) -> list[str]:
+        """Finds up to max_solutions solutions using constraint propagation on the
+        candidate masks, falling back to depth first search.
+
+        techniques overrides the techniques the solver was created with for this
+        solve. The number of candidates each one removed is left in eliminations."""
+        return self._solve(board, completed_board_validator, max_solutions, techniques)
+
+    def solve_with_stats(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+        techniques: Iterable[str] | None = None,
+    ) -> api.SolveResult:
+        """Solves the board as solve_sudoku, also counting the search statistics"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._solve(
+            board, completed_board_validator, max_solutions, techniques, stats
+        )
+        stats.wall_time = time.perf_counter() - start
+        return api.SolveResult(solutions, stats)
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Solves the board as solve_with_stats until the budget runs out, which the
+        search checks every CANCEL_CHECK_NODES nodes"""
+        self.eliminations = Counter()
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._iter_solutions(
+            board, completed_board_validator, self.techniques, stats, budget
+        )
+        found, exceeded = api.take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return api.BudgetResult(found, stats, exceeded)
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+        techniques: Iterable[str] | None = None,
+    ) -> Iterator[str]:
+        """Yields each solution as soon as the search finds it, the search is
+        suspended until the next one is requested"""
+        self.eliminations = Counter()
+        if techniques is None:
+            techniques = self.techniques
+        return self._iter_solutions(board, completed_board_validator, techniques)
+
+    def _solve(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        techniques: Iterable[str] | None,
+        stats: api.SolveStats | None = None,
+    ) -> list[str]:
+        self.eliminations = Counter()
+        if techniques is None:
+            techniques = self.techniques
+        solutions = self._iter_solutions(
+            board, completed_board_validator, techniques, stats
+        )
+        with closing(solutions):
+            self.valid_solutions = list(islice(solutions, max(max_solutions, 0)))
+        return self.valid_solutions
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        techniques: Iterable[str],
+        stats: api.SolveStats | None = None,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        geo = board_geometry(board)
+        grids = search(
+            board,
+            techniques,
+            self.eliminations,
+            stats,
+            variant_names=self.variants,
+            regions=self.regions,
+            budget=budget,
+        )
+        for grid in grids:
+            solution = "".join(grid_to_str(grid, geo))
+            if completed_board_validator is None or completed_board_validator(solution):
+                yield solution
+
+    def count_solutions(self, board: api.SudokuBoard, limit: int) -> int:
+        """Counts the solved grids found by the search, stopping at limit"""
+        self.eliminations = Counter()
+        solutions = search(
+            board,
+            self.techniques,
+            self.eliminations,
+            variant_names=self.variants,
+            regions=self.regions,
+        )
+        return sum(1 for _ in islice(solutions, max(limit, 0)))
+
+
+def grid_to_str(grid: Grid, geo: Geometry = NINE) -> Generator[str, None, None]:
+    bit_digits = geo.bit_digits
+    for bit in grid:
+        yield bit_digits.get(bit, "0")
+
+
+def initial_state(
+    board: api.SudokuBoard, geo: Geometry | None = None
+) -> tuple[Grid, Candidates, list[int]] | None:
+    """Returns the grid (the bit of the digit in each position, 0 if free), the
+    candidate masks and the pending naked singles for the board, or None if the given
+    digits contradict each other. geo defaults to the tables for the board's size."""
+    geo = geo or board_geometry(board)
+    return grid_state(list(map(geo.digit_bits.__getitem__, board)), geo)
+
+
+def grid_state(
+    given: Grid, geo: Geometry = NINE
+) -> tuple[Grid, Candidates, list[int]] | None:
+    """Returns the state for a board given as a grid of digit bits (0 if free), as
+    for initial_state"""
+    grid = [0] * geo.cells
+    candidates = [geo.all_digits] * geo.cells
+    singles: list[int] = []
+    peers = geo.peers
+    for pos, bit in enumerate(given):
+        if bit and not assign(grid, candidates, pos, bit, singles, peers):
+            return None
+    return grid, candidates, singles
+
+
+def assign(
+    grid: Grid,
+    candidates: Candidates,
+    pos: int,
+    bit: int,
+    singles: list[int],
+    peers: tuple[tuple[int, ...], ...] = NINE.peers,
+) -> bool:
+    """Places the digit bit at pos and removes it from the candidates of its peers
+    (the peers table of the board's geometry).
+
+    Peers left with a single candidate are appended to singles. Returns False if the
+    digit is not available at pos or a peer is left with no candidates."""
+    if not candidates[pos] & bit:
+        return False
+    grid[pos] = bit
+    candidates[pos] = 0
+    for peer in peers[pos]:
+        mask = candidates[peer]
+        if mask & bit:
+            mask ^= bit
+            candidates[peer] = mask
+            if not mask:
+                return False
+            if not mask & (mask - 1):
+                singles.append(peer)
+    return True
+
+
+def propagate(
+    grid: Grid,
+    candidates: Candidates,
+    singles: list[int],
+    stats: api.SolveStats | None = None,
+    geo: Geometry = NINE,
+) -> bool:
+    """Places naked and hidden singles until neither rule finds anything new.
+
+    If stats is given, the digits placed by each rule are added to stats.singles.
+    Returns False if the board is found to have no solution."""
+    if stats is None:
+        return _propagate(grid, candidates, singles, None, geo)
+    free_before = grid.count(0)
+    hidden_before = stats.singles["hidden_singles"]
+    solvable = _propagate(grid, candidates, singles, stats, geo)
+    hidden_placed = stats.singles["hidden_singles"] - hidden_before
+    stats.singles["naked_singles"] += free_before - grid.count(0) - hidden_placed
+    return solvable
+
+
+def _propagate(
+    grid: Grid,
+    candidates: Candidates,
+    singles: list[int],
+    stats: api.SolveStats | None,
+    geo: Geometry = NINE,
+) -> bool:
+    peers, all_digits = geo.peers, geo.all_digits
+    while True:
+        placed_hidden = False
+        while singles:
+            pos = singles.pop()
+            mask = candidates[pos]
+            if mask and not assign(grid, candidates, pos, mask, singles, peers):
+                return False
+        for unit in geo.units:
+            once = twice = placed = 0
+            for pos in unit:
+                mask = candidates[pos]
+                twice |= once & mask
+                once |= mask
+                placed |= grid[pos]
+            if once | placed != all_digits:
+                return False
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for pos in unit:
+                    if candidates[pos] & bit:
+                        if not assign(grid, candidates, pos, bit, singles, peers):
+                            return False
+                        if stats is not None:
+                            stats.singles["hidden_singles"] += 1
+                        placed_hidden = True
+                        break
+        if not singles and not placed_hidden:
+            if not geo.equal_sets:
+                return True
+            matched = _match_equal_sets(grid, candidates, singles, geo.equal_sets)
+            if matched is None:
+                return False
+            if not matched:
+                return True
+
+
+def _match_equal_sets(
+    grid: Grid,
+    candidates: Candidates,
+    singles: list[int],
+    equal_sets: tuple[tuple[tuple[int, ...], tuple[int, ...]], ...],
+) -> bool | None:
+    """Prunes the candidates of pairs of sets of positions that must hold the same
+    digits, by comparing the number of times each digit is placed in one set with the
+    number of times it could be in the other.
+
+    Positions left with a single candidate are appended to singles. Returns True if
+    a candidate was removed, False if not, or None if the counts can't match."""
+    pruned = False
+    for first, second in equal_sets:
+        digits = 0
+        for pos in first + second:
+            digits |= grid[pos] | candidates[pos]
+        while digits:
+            bit = digits & -digits
+            digits ^= bit
+            counts = []
+            for positions in (first, second):
+                placed = sum(1 for pos in positions if grid[pos] == bit)
+                free = [pos for pos in positions if candidates[pos] & bit]
+                counts.append((placed, free))
+            (placed_a, free_a), (placed_b, free_b) = counts
+            if placed_a + len(free_a) < placed_b or placed_b + len(free_b) < placed_a:
+                return None
+            for (placed, free), (other_placed, other_free) in (
+                (counts[0], counts[1]),
+                (counts[1], counts[0]),
+            ):
+                if placed + len(free) != other_placed or not free + other_free:
+                    continue
+                # the set holds the digit as often as it can, as does the other one
+                pruned = True
+                for pos in free:
+                    candidates[pos] = bit
+                    singles.append(pos)
+                for pos in other_free:
+                    mask = candidates[pos] & ~bit
+                    if not mask:
+                        return None
+                    candidates[pos] = mask
+                    if not mask & (mask - 1):
+                        singles.append(pos)
+                break
+    return pruned
+
+
+def count_grid_solutions(given: Grid, limit: int, geo: Geometry = NINE) -> int:
+    """Counts the solutions of a board given as a grid of digit bits (0 if free),
+    stopping at limit.
+
+    This is for callers that count solutions in an inner loop (e.g. generator.py): it
+    works on the grid without building board strings and keeps no statistics."""
+    state = grid_state(given, geo)
+    if state is None or limit <= 0:
+        return 0
+    count = 0
+    stack = [state]
+    while stack:
+        grid, candidates, singles = stack.pop()
+        if not _propagate(grid, candidates, singles, None, geo):
+            continue
+        pos = position_with_fewest_candidates(candidates)
+        if pos is None:
+            count += 1
+            if count >= limit:
+                return count
+            continue
+        mask = candidates[pos]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            guess_grid, guess_candidates = grid.copy(), candidates.copy()
+            guess_singles: list[int] = []
+            if assign(guess_grid, guess_candidates, pos, bit, guess_singles, geo.peers):
+                stack.append((guess_grid, guess_candidates, guess_singles))
+    return count
+
+
+def solves_with_singles(given: Grid, geo: Geometry = NINE) -> bool:
+    """Returns True if naked and hidden singles alone solve the board given as a grid
+    of digit bits, which also means it has exactly one solution"""
+    state = grid_state(given, geo)
+    if state is None:
+        return False
+    grid, candidates, singles = state
+    return _propagate(grid, candidates, singles, None, geo) and 0 not in grid
+
+
+def position_with_fewest_candidates(candidates: Candidates) -> int | None:
+    """Returns the free position with the fewest candidates, or None if the board is
+    full"""
+    best_pos = None
+    best_count = MAX_SIDE + 1
+    for pos, mask in enumerate(candidates):
+        if mask:
+            count = mask.bit_count()
+            if count < best_count:
+                best_pos, best_count = pos, count
+                if count == 2:
+                    break
+    return best_pos
+
+
+def reduce(
+    grid: Grid,
+    candidates: Candidates,
+    singles: list[int],
+    extra_techniques: list[tuple[str, techniques.Technique]],
+    eliminations: Counter,
+    stats: api.SolveStats | None = None,
+    geo: Geometry = NINE,
+) -> bool:
+    """Propagates the singles, then applies the extra techniques, until none of them
+    change anything or the board is full. Returns False if the board is found to have
+    no solution."""
+    while propagate(grid, candidates, singles, stats, geo):
+        if 0 not in grid:
+            return True
+        removed = techniques.apply_techniques(
+            candidates, singles, extra_techniques, eliminations
+        )
+        if removed < 0:
+            return False
+        if not removed:
+            return True
+    return False
+
+
+def search(
+    board: api.SudokuBoard,
+    technique_names: Iterable[str] = (),
+    eliminations: Counter | None = None,
+    stats: api.SolveStats | None = None,
+    cancel: api.CancelFlag | None = None,
+    variant_names: Iterable[str] = (),
+    regions: Iterable[Iterable[int]] = (),
+    budget: api.Budget | None = None,
+    state: tuple[Grid, Candidates, list[int]] | None = None,
+) -> Generator[Grid, None, None]:
+    """Yields every solved grid for the board, depth first.
+
+    technique_names are the extra techniques to apply before guessing, and the
+    number of candidates each one removes is added to eliminations. The search
+    statistics are added to stats if given. The search stops early once cancel is
+    set, and raises api.BudgetExceeded once the budget runs out, both of which are
+    checked every CANCEL_CHECK_NODES nodes. variant_names are the variants whose
+    constraints the solutions must meet, and regions extra units as in
+    variants.compile_geometry. state is the grid, candidates and pending
+    singles to start from instead of initial_state(board), e.g. after techniques
+    have removed candidates."""
+    geo = board_geometry(board)
+    if variant_names or regions:
+        geo = variants.compile_geometry(geo.side, variant_names, regions)
+    extra_techniques = techniques.get_techniques(technique_names)
+    if extra_techniques and geo.side != 9:
+        raise ValueError("The techniques only support 9x9 boards")
+    if eliminations is None:
+        eliminations = Counter()
+    if state is None:
+        state = initial_state(board, geo)
+    if state is None:
+        if stats is not None:
+            stats.nodes += 1
+            stats.backtracks += 1
+        return
+    nodes = guesses = backtracks = max_depth = 0
+    stack = [(*state, 0)]
+    try:
+        while stack:
+            grid, candidates, singles, depth = stack.pop()
+            nodes += 1
+            if not nodes % CANCEL_CHECK_NODES:
+                if cancel is not None and cancel.is_set():
+                    return
+                if budget is not None:
+                    budget.spend(CANCEL_CHECK_NODES)
+            if depth > max_depth:
+                max_depth = depth
+            if extra_techniques:
+                if not reduce(
+                    grid,
+                    candidates,
+                    singles,
+                    extra_techniques,
+                    eliminations,
+                    stats,
+                    geo,
+                ):
+                    backtracks += 1
+                    continue
+            elif not propagate(grid, candidates, singles, stats, geo):
+                backtracks += 1
+                continue
+            pos = position_with_fewest_candidates(candidates)
+            if pos is None:
+                yield grid
+                continue
+            mask = candidates[pos]
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                guesses += 1
+                guess_grid, guess_candidates = grid.copy(), candidates.copy()
+                guess_singles: list[int] = []
+                if assign(
+                    guess_grid, guess_candidates, pos, bit, guess_singles, geo.peers
+                ):
+                    stack.append(
+                        (guess_grid, guess_candidates, guess_singles, depth + 1)
+                    )
+                else:
+                    backtracks += 1
+    finally:
+        if stats is not None:
+            stats.nodes += nodes
+            stats.guesses += guesses
+            stats.backtracks += backtracks
+            stats.max_depth = max(stats.max_depth, max_depth)
+
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
+board_sides = _solver.board_sides
+supports_variants = _solver.supports_variants
@@ -0,0 +1,324 @@
+"""Solves Sudoku boards as an exact cover problem using Knuth's Algorithm X.
+
+Each of the 729 (position, digit) choices is a row of the exact cover matrix that
+covers 4 of its 324 columns: the position is filled, and the digit is in its row,
+its column and its square. The matrix is held as dancing links, i.e. circular doubly
+linked lists stored in flat index arrays, so covering and uncovering a column during
+the search is O(1) per node and no candidate state is rebuilt when backtracking.
+
+16x16 and 25x25 boards have matrices of 4096 rows by 1024 columns and 15625 rows by
+2500 columns, built the first time a board of that size is solved.
+
+Typical usage example:
+
+    solutions = solver_dlx.solve_sudoku(board, validator.validate_solved_board, 10)
+"""
+
+import time
+from contextlib import closing
+from functools import cache
+from itertools import islice
+from typing import Callable, Generator, Iterator
+
+from sudokusolve.solver import api
+from sudokusolve.solver.geometry import (
+    NINE,
+    SIZES,
+    Geometry,
+    board_geometry,
+    geometry,
+)
+
+NUM_COLUMNS = 324
+ROOT = 0
+CANCEL_CHECK_NODES = 64
+
+
+class Links:
+    """The dancing links arrays for boards of the geometry's size. Nodes 0 to
+    row_start - 1 are the root and the column headers, the 4 nodes for matrix row
+    number rid start at index row_start + 4 * rid"""
+
+    def __init__(self, geo: Geometry = NINE) -> None:
+        self.geo = geo
+        num_columns = 4 * geo.cells
+        self.row_start = num_columns + 1
+        self.left = [n - 1 for n in range(self.row_start)]
+        self.right = [n + 1 for n in range(self.row_start)]
+        self.left[ROOT] = num_columns
+        self.right[num_columns] = ROOT
+        self.up = list(range(self.row_start))
+        self.down = list(range(self.row_start))
+        self.column = list(range(self.row_start))
+        self.size = [0] * self.row_start
+        self.row_id = [-1] * self.row_start
+        for row_id in range(geo.cells * geo.side):
+            self._add_row(row_id, matrix_columns(row_id, geo))
+
+    def _add_row(self, row_id: int, columns: tuple[int, ...]) -> None:
+        first = len(self.column)
+        for offset, col in enumerate(columns):
+            node = first + offset
+            self.left.append(first + (offset - 1) % len(columns))
+            self.right.append(first + (offset + 1) % len(columns))
+            self.up.append(self.up[col])
+            self.down.append(col)
+            self.down[self.up[col]] = node
+            self.up[col] = node
+            self.column.append(col)
+            self.row_id.append(row_id)
+            self.size[col] += 1
+
+    def copy(self) -> "Links":
+        links = Links.__new__(Links)
+        links.geo, links.row_start = self.geo, self.row_start
+        for name in ("left", "right", "up", "down", "column", "size", "row_id"):
+            setattr(links, name, getattr(self, name).copy())
+        return links
+
+
+@cache
+def empty_matrix(side: int) -> Links:
+    """The matrix for boards of the side, with no rows covered, to be copied"""
+    return Links(geometry(side))
+
+
+def matrix_columns(row_id: int, geo: Geometry = NINE) -> tuple[int, ...]:
+    """The 4 column headers covered by placing digit number (row_id % side) in
+    position row_id // side"""
+    side, cells = geo.side, geo.cells
+    position, digit = divmod(row_id, side)
+    return (
+        1 + position,
+        1 + cells + geo.row_of[position] * side + digit,
+        1 + 2 * cells + geo.col_of[position] * side + digit,
+        1 + 3 * cells + geo.sqr_of[position] * side + digit,
+    )
+
+
+class SudokuSolver(api.ABCSolver):
+    __version__ = "1"
+    correct_by_construction = True
+    board_sides = SIZES
+
+    def __init__(self) -> None:
+        self.valid_solutions: list[str] = []
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> list[str]:
+        """Finds up to max_solutions solutions by enumerating exact covers"""
+        return self._solve(board, completed_board_validator, max_solutions)
+
+    def solve_with_stats(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> api.SolveResult:
+        """Solves the board as solve_sudoku, also counting the search statistics"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._solve(board, completed_board_validator, max_solutions, stats)
+        stats.wall_time = time.perf_counter() - start
+        return api.SolveResult(solutions, stats)
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Solves the board as solve_with_stats until the budget runs out, which the
+        search checks every CANCEL_CHECK_NODES nodes"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._iter_solutions(
+            board, completed_board_validator, stats, budget
+        )
+        found, exceeded = api.take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return api.BudgetResult(found, stats, exceeded)
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Iterator[str]:
+        """Yields each solution as soon as the search finds it, the search is
+        suspended until the next one is requested"""
+        return self._iter_solutions(board, completed_board_validator)
+
+    def _solve(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        stats: api.SolveStats | None = None,
+    ) -> list[str]:
+        solutions = self._iter_solutions(board, completed_board_validator, stats)
+        with closing(solutions):
+            self.valid_solutions = list(islice(solutions, max(max_solutions, 0)))
+        return self.valid_solutions
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        stats: api.SolveStats | None = None,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        geo = board_geometry(board)
+        links = empty_matrix(geo.side).copy()
+        for chosen in search(board, links, stats, budget):
+            solution = list(board)
+            for node in chosen:
+                position, digit = divmod(links.row_id[node], geo.side)
+                solution[position] = geo.digits[digit]
+            solution_str = "".join(solution)
+            if completed_board_validator is None or completed_board_validator(
+                solution_str
+            ):
+                yield solution_str
+
+    def count_solutions(self, board: api.SudokuBoard, limit: int) -> int:
+        """Counts the exact covers, stopping at limit"""
+        links = empty_matrix(board_geometry(board).side).copy()
+        return sum(1 for _ in islice(search(board, links), max(limit, 0)))
+
+
+def search(
+    board: api.SudokuBoard,
+    links: Links,
+    stats: api.SolveStats | None = None,
+    budget: api.Budget | None = None,
+) -> Generator[list[int], None, None]:
+    """Yields the nodes of the matrix rows chosen for each exact cover of the
+    board's free positions, using links for the board's size. The list yielded is
+    reused by the search, so is only valid until the next solution is requested. The
+    given digits are removed from the matrix first, and the links are left modified
+    so must not be shared between
+    searches. The search statistics are added to stats if given, a column with only
+    one row left counts as a single rather than a guess. api.BudgetExceeded is raised
+    once the budget runs out, which is checked every CANCEL_CHECK_NODES nodes."""
+    left, right, up, down = links.left, links.right, links.up, links.down
+    column, size = links.column, links.size
+
+    def cover(col: int) -> None:
+        left[right[col]] = left[col]
+        right[left[col]] = right[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                up[down[j]] = up[j]
+                down[up[j]] = down[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(col: int) -> None:
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                up[down[j]] = j
+                down[up[j]] = j
+                j = left[j]
+            i = up[i]
+        left[right[col]] = col
+        right[left[col]] = col
+
+    def select(node: int) -> None:
+        j = right[node]
+        while j != node:
+            cover(column[j])
+            j = right[j]
+
+    def deselect(node: int) -> None:
+        j = left[node]
+        while j != node:
+            uncover(column[j])
+            j = left[j]
+
+    geo = links.geo
+    covered: set[int] = set()
+    for position, num in enumerate(board):
+        if num == "0":
+            continue
+        digit = geo.digit_bits[num].bit_length() - 1
+        columns = matrix_columns(position * geo.side + digit, geo)
+        if covered.intersection(columns):
+            return
+        covered.update(columns)
+        for col in columns:
+            cover(col)
+
+    chosen: list[int] = []
+    nodes = guesses = backtracks = singles = max_depth = 0
+    try:
+        while True:
+            backtrack = True
+            nodes += 1
+            if budget is not None and not nodes % CANCEL_CHECK_NODES:
+                budget.spend(CANCEL_CHECK_NODES)
+            if right[ROOT] == ROOT:
+                yield chosen
+            else:
+                col = best = right[ROOT]
+                fewest = size[col]
+                while col != ROOT and fewest > 1:
+                    if size[col] < fewest:
+                        best, fewest = col, size[col]
+                    col = right[col]
+                if fewest:
+                    cover(best)
+                    node = down[best]
+                    select(node)
+                    chosen.append(node)
+                    if fewest == 1:
+                        singles += 1
+                    else:
+                        guesses += 1
+                    if len(chosen) > max_depth:
+                        max_depth = len(chosen)
+                    backtrack = False
+                else:
+                    backtracks += 1
+            while backtrack:
+                if not chosen:
+                    return
+                node = chosen.pop()
+                deselect(node)
+                col = column[node]
+                node = down[node]
+                if node == col:
+                    uncover(col)
+                else:
+                    select(node)
+                    chosen.append(node)
+                    guesses += 1
+                    backtrack = False
+    finally:
+        if stats is not None:
+            stats.nodes += nodes
+            stats.guesses += guesses
+            stats.backtracks += backtracks
+            stats.max_depth = max(stats.max_depth, max_depth)
+            stats.singles["forced_rows"] += singles
+
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
+board_sides = _solver.board_sides
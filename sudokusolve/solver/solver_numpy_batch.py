@@ -0,0 +1,275 @@
+"""Solves many Sudoku boards at once using NumPy.
+
+The candidates for a batch of N boards are held as an (N, 81) array of 9-bit masks
+(the packed form of an (N, 81, 9) boolean array, see candidates), and naked singles
+and hidden singles are placed on every board in the batch with vectorised
+operations until no board changes. Boards that are still incomplete
+after propagation are then solved one at a time by solver_bitmask.
+
+Needs NumPy to be installed.
+
+Typical usage example:
+
+    solutions = solver_numpy_batch.solve_many(boards)
+    first_solution_of_each_board = [solved[0] for solved in solutions if solved]
+"""
+
+import time
+from typing import Callable, Generator, Sequence
+
+import numpy as np
+
+from sudokusolve import packed
+from sudokusolve.solver import api, solver_bitmask
+
+DEFAULT_CHUNKSIZE = 10_000
+
+
+def _unit_positions() -> np.ndarray:
+    rows = [list(range(r * 9, r * 9 + 9)) for r in range(9)]
+    cols = [list(range(c, 81, 9)) for c in range(9)]
+    offsets = (0, 1, 2, 9, 10, 11, 18, 19, 20)
+    sqrs = [[a + b + o for o in offsets] for a in range(0, 81, 27) for b in (0, 3, 6)]
+    return np.array(rows + cols + sqrs, dtype=np.intp)
+
+
+UNITS = _unit_positions()
+# index of each (unit, position in unit) slot in a flattened (27 * 9) unit array, for
+# the 3 units each board position belongs to
+POSITION_UNIT_SLOTS = np.array(
+    [
+        [u * 9 + list(UNITS[u]).index(pos) for u in range(27) if pos in UNITS[u]]
+        for pos in range(81)
+    ],
+    dtype=np.intp,
+)
+ALL_DIGITS = 0b111111111
+DIGIT_TO_BIT = np.array([0] + [1 << n for n in range(9)], dtype=np.uint16)
+BIT_TO_DIGIT = np.zeros(ALL_DIGITS + 1, dtype=np.int8)
+BIT_TO_DIGIT[DIGIT_TO_BIT[1:]] = np.arange(1, 10, dtype=np.int8)
+POPCOUNT = np.array([n.bit_count() for n in range(ALL_DIGITS + 1)], dtype=np.uint8)
+MASK_TO_CANDIDATES = (np.arange(ALL_DIGITS + 1)[:, None] >> np.arange(9)) & 1 == 1
+
+
+class SudokuSolver(api.ABCSolver):
+    __version__ = "1"
+    correct_by_construction = True
+
+    def __init__(self) -> None:
+        self.valid_solutions: list[str] = []
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> list[str]:
+        """Solves a single board as a batch of 1"""
+        self.__init__()
+        self.valid_solutions = solve_many(
+            [board], completed_board_validator, max_solutions
+        )[0]
+        return self.valid_solutions
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Generator[str, None, None]:
+        """Propagates the board as a batch of 1, then yields the solutions of the
+        bitmask search as it finds them"""
+        grids = boards_to_array([board])
+        if propagate(grids)[0]:
+            return
+        propagated = array_to_boards(grids)[0]
+        yield from solver_bitmask.SudokuSolver().iter_solutions(
+            propagated, completed_board_validator
+        )
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Propagates the board as a batch of 1, then searches it with
+        solver_bitmask, which spends the budget during the search"""
+        start = time.perf_counter()
+        grids = boards_to_array([board])
+        if propagate(grids)[0]:
+            stats = api.SolveStats(wall_time=time.perf_counter() - start)
+            return api.BudgetResult([], stats)
+        result = solver_bitmask.SudokuSolver().solve_within(
+            array_to_boards(grids)[0], completed_board_validator, max_solutions, budget
+        )
+        result.stats.wall_time = time.perf_counter() - start
+        return result
+
+
+def solve_many(
+    boards: Sequence[api.SudokuBoard],
+    completed_board_validator: Callable[[str], bool] = lambda _: True,
+    max_solutions: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[list[str]]:
+    """Returns the list of solutions for each board, in the same order as boards.
+
+    Boards are propagated chunksize at a time to bound the memory used by the
+    candidate arrays (roughly 2.5 kB per board)."""
+    solutions: list[list[str]] = []
+    for start in range(0, len(boards), chunksize):
+        solutions.extend(
+            _solve_chunk(
+                boards[start : start + chunksize],
+                completed_board_validator,
+                max_solutions,
+            )
+        )
+    return solutions
+
+
+def solve_packed(
+    packed_boards: np.ndarray,
+    completed_board_validator: Callable[[str], bool] = lambda _: True,
+    max_solutions: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> list[list[str]]:
+    """Solves boards in the packed format (see sudokusolve.packed), given as an
+    (N, 41) uint8 array such as PackedBoards.as_array(), without converting them to
+    strings first. Returns the list of solutions for each board, in order."""
+    solutions: list[list[str]] = []
+    for start in range(0, len(packed_boards), chunksize):
+        grids = packed.unpack_array(packed_boards[start : start + chunksize])
+        solutions.extend(_solve_grids(grids, completed_board_validator, max_solutions))
+    return solutions
+
+
+def boards_to_array(boards: Sequence[api.SudokuBoard]) -> np.ndarray:
+    """Converts 81 character board strings to an (N, 81) array of digits"""
+    if any(len(board) != 81 for board in boards):
+        raise ValueError("Boards must have 81 digits")
+    encoded = "".join(boards).encode("ascii")
+    digits = np.frombuffer(encoded, dtype=np.uint8) - ord("0")
+    return digits.astype(np.int8).reshape(len(boards), 81)
+
+
+def array_to_boards(grids: np.ndarray) -> list[str]:
+    """Converts an (N, 81) array of digits back to board strings"""
+    text = (grids.astype(np.uint8) + ord("0")).tobytes().decode("ascii")
+    return [text[i : i + 81] for i in range(0, len(text), 81)]
+
+
+def candidate_masks(grids: np.ndarray) -> np.ndarray:
+    """Returns the (N, 81) masks of the digits available in each free position, bit
+    0 is the digit 1 and bit 8 the digit 9. Positions with a digit are 0."""
+    n = len(grids)
+    bits = DIGIT_TO_BIT[grids].reshape(n, 9, 9)
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    cols = np.bitwise_or.reduce(bits, axis=1)
+    sqrs = np.bitwise_or.reduce(
+        np.bitwise_or.reduce(bits.reshape(n, 3, 3, 3, 3), axis=4), axis=2
+    )
+    sqrs = sqrs.repeat(3, axis=1).repeat(3, axis=2)
+    used = rows[:, :, None] | cols[:, None, :] | sqrs
+    return np.where(bits == 0, ~used & ALL_DIGITS, 0).reshape(n, 81)
+
+
+def candidates(grids: np.ndarray) -> np.ndarray:
+    """Returns the (N, 81, 9) candidates, True where a digit is available in a
+    free position"""
+    return MASK_TO_CANDIDATES[candidate_masks(grids)]
+
+
+def propagate(grids: np.ndarray) -> np.ndarray:
+    """Places naked and hidden singles on every board until none of them change.
+
+    grids is updated in place. Returns a boolean array, True for boards that were
+    found to have no solution: a digit appears twice in a unit, a position has no
+    candidates, a digit has nowhere to go in a unit, or a position is forced to be
+    two different digits."""
+    failed = np.zeros(len(grids), dtype=bool)
+    active = np.arange(len(grids))
+    while active.size:
+        active_grids = grids[active]
+        masks = candidate_masks(active_grids)
+        unit_bits = DIGIT_TO_BIT[active_grids][:, UNITS]
+        unit_masks = masks[:, UNITS]
+
+        placed = np.bitwise_or.reduce(unit_bits, axis=2)
+        duplicates = POPCOUNT[placed] < np.count_nonzero(unit_bits, axis=2)
+        # once/twice: the digits seen in at least one / two positions of each unit
+        once = np.zeros(placed.shape, dtype=np.uint16)
+        twice = np.zeros(placed.shape, dtype=np.uint16)
+        for idx in range(9):
+            twice |= once & unit_masks[:, :, idx]
+            once |= unit_masks[:, :, idx]
+        missing_digits = (once | placed) != ALL_DIGITS
+        stuck_positions = (active_grids == 0) & (masks == 0)
+
+        # naked singles - only one digit available in a position
+        forced = np.where(POPCOUNT[masks] == 1, masks, 0)
+        # hidden singles - only one position available for a digit in a unit
+        hidden = (unit_masks & (once & ~twice)[:, :, None]).reshape(len(active), -1)
+        for slot in POSITION_UNIT_SLOTS.T:
+            forced |= hidden[:, slot]
+        clashes = POPCOUNT[forced] > 1
+
+        bad = (
+            duplicates.any(axis=1)
+            | missing_digits.any(axis=1)
+            | stuck_positions.any(axis=1)
+            | clashes.any(axis=1)
+        )
+        failed[active[bad]] = True
+        changed = ~bad & forced.any(axis=1)
+        grids[active] = np.where(forced != 0, BIT_TO_DIGIT[forced], active_grids)
+        active = active[changed]
+    return failed
+
+
+def _solve_chunk(
+    boards: Sequence[api.SudokuBoard],
+    completed_board_validator: Callable[[str], bool],
+    max_solutions: int,
+) -> list[list[str]]:
+    if not boards:
+        return []
+    return _solve_grids(
+        boards_to_array(boards), completed_board_validator, max_solutions
+    )
+
+
+def _solve_grids(
+    grids: np.ndarray,
+    completed_board_validator: Callable[[str], bool],
+    max_solutions: int,
+) -> list[list[str]]:
+    failed = propagate(grids)
+    complete = (grids != 0).all(axis=1)
+    solutions: list[list[str]] = []
+    for board, is_failed, is_complete in zip(array_to_boards(grids), failed, complete):
+        if is_failed or max_solutions < 1:
+            solutions.append([])
+        elif is_complete:
+            # only forced digits were placed, so this is the only solution
+            valid = completed_board_validator(board)
+            solutions.append([board] if valid else [])
+        else:
+            solutions.append(
+                solver_bitmask.SudokuSolver().solve_sudoku(
+                    board, completed_board_validator, max_solutions
+                )
+            )
+    return solutions
+
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
+board_sides = _solver.board_sides
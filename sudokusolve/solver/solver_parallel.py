@@ -0,0 +1,374 @@
+"""Solves a single hard Sudoku board using several CPU cores.
+
+The top levels of the search tree are expanded in this process, with the same
+propagation and guessing as solver_bitmask, until there are a few subtrees for each
+worker. The subtrees are disjoint, so each one is searched in a worker process and
+the workers send their solutions back on a queue as they find them. Once the caller
+has enough solutions a shared stop flag is set, the workers that are still searching
+give up and the subtrees that haven't started are cancelled. Solutions come back in
+the order the workers find them, which can change from one solve to the next.
+
+Boards that are solved (or found to have no solution) while splitting never start
+the worker processes, so easy boards cost about the same as solver_bitmask.
+
+solve_within checks the deadline and cancel flag of its budget while it waits for
+the workers, and stops them when the budget runs out. The workers add the nodes they
+expand to a counter shared with this process every
+solver_bitmask.CANCEL_CHECK_NODES nodes, and stop themselves once the total reaches
+max_nodes.
+
+Typical usage example:
+
+    solver = solver_parallel.SudokuSolver(workers=8)
+    solutions = solver.solve_sudoku(board, validator.validate_solved_board, 1)
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, replace
+from multiprocessing.queues import Queue
+from itertools import islice
+from typing import Any, Callable, Generator, Iterable, Iterator
+
+from sudokusolve.solver import api, solver_bitmask
+from sudokusolve.solver.geometry import SIZES, board_geometry
+from sudokusolve.solver.solver_bitmask import Candidates, Grid
+
+SUBTREES_PER_WORKER = 4
+RESULTS_QUEUE_SIZE = 1000
+POLL_SECONDS = 0.1
+
+Subtree = tuple[Grid, Candidates, list[int], int]
+
+_stop: api.CancelFlag | None = None
+_results: Queue | None = None
+_budget: "SharedBudget | None" = None
+
+
+class SudokuSolver(api.ABCSolver):
+    """workers: number of worker processes, defaults to the number of CPUs
+    subtrees_per_worker: how many subtrees to split the search into for each worker,
+        more subtrees balance the work better but repeat more of the propagation"""
+
+    __version__ = "1"
+    correct_by_construction = True
+    board_sides = SIZES
+
+    def __init__(
+        self, workers: int | None = None, subtrees_per_worker: int = SUBTREES_PER_WORKER
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.subtrees_per_worker = subtrees_per_worker
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> list[str]:
+        """Finds up to max_solutions solutions, searching the subtrees in parallel"""
+        return self._solve(board, completed_board_validator, max_solutions)
+
+    def solve_with_stats(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> api.SolveResult:
+        """Solves the board as solve_sudoku, adding up the search statistics of the
+        split and of every worker"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._solve(board, completed_board_validator, max_solutions, stats)
+        stats.wall_time = time.perf_counter() - start
+        return api.SolveResult(solutions, stats)
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Solves the board as solve_with_stats until the budget runs out"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._iter_solutions(
+            board, completed_board_validator, stats, budget
+        )
+        found, exceeded = api.take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return api.BudgetResult(found, stats, exceeded)
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Iterator[str]:
+        """Yields each solution as soon as a worker finds it, the workers stop when
+        the iterator is closed"""
+        return self._iter_solutions(board, completed_board_validator, api.SolveStats())
+
+    def _solve(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        stats: api.SolveStats | None = None,
+    ) -> list[str]:
+        if stats is None:
+            stats = api.SolveStats()
+        solutions = self._iter_solutions(board, completed_board_validator, stats)
+        with closing(solutions):
+            return list(islice(solutions, max(max_solutions, 0)))
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        stats: api.SolveStats,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        solved, subtrees = split(board, self.workers * self.subtrees_per_worker, stats)
+        if budget is not None:
+            budget.spend(stats.nodes)
+        for solution in solved:
+            if completed_board_validator is None or completed_board_validator(solution):
+                yield solution
+        if not subtrees:
+            return
+        if self.workers == 1:
+            for subtree_board, depth in subtrees:
+                subtree_stats = api.SolveStats()
+                solutions = iter_subtree(subtree_board, subtree_stats, budget=budget)
+                try:
+                    for solution in solutions:
+                        if completed_board_validator is None or (
+                            completed_board_validator(solution)
+                        ):
+                            yield solution
+                finally:
+                    solutions.close()
+                    merge_stats(stats, subtree_stats, depth)
+            return
+        yield from self._iter_in_parallel(
+            subtrees, completed_board_validator, stats, budget
+        )
+
+    def _iter_in_parallel(
+        self,
+        subtrees: list[tuple[api.SudokuBoard, int]],
+        completed_board_validator: Callable[[str], bool] | None,
+        stats: api.SolveStats,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        """Searches each subtree in a worker process, yielding the solutions as they
+        arrive on the results queue. Each worker puts a (subtree, None) on the queue
+        when it has finished its subtree. The budget is checked every POLL_SECONDS
+        and after each solution."""
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        results = context.Queue(RESULTS_QUEUE_SIZE)
+        worker_budget = None
+        if budget is not None:
+            worker_budget = SharedBudget(
+                max_nodes=budget.max_nodes,
+                cancel=stop,
+                shared_nodes=context.Value("q", budget.nodes),
+            )
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, len(subtrees)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(stop, results, worker_budget),
+        )
+        futures = {
+            executor.submit(_stream_subtree, index, subtree_board): depth
+            for index, (subtree_board, depth) in enumerate(subtrees)
+        }
+        try:
+            running = len(futures)
+            while running:
+                if worker_budget is not None:
+                    budget.spend(worker_budget.total() - budget.nodes)
+                try:
+                    _, solution = results.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    _raise_worker_errors(futures)
+                    continue
+                if solution is None:
+                    running -= 1
+                elif completed_board_validator is None or completed_board_validator(
+                    solution
+                ):
+                    yield solution
+            if worker_budget is not None:
+                budget.spend(worker_budget.total() - budget.nodes)
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future, depth in futures.items():
+                if not future.cancelled() and future.exception() is None:
+                    merge_stats(stats, future.result(), depth)
+
+
+@dataclass
+class SharedBudget(api.Budget):
+    """The budget of a worker's subtree. The nodes it spends are added to a counter
+    shared with the parent and the other workers, and max_nodes is checked against
+    their total.
+
+    shared_nodes: a multiprocessing.Value holding the nodes spent by all of them
+    shared: the nodes this budget has added to shared_nodes"""
+
+    shared_nodes: Any = None
+    shared: int = 0
+
+    def spend(self, nodes: int = 0) -> None:
+        self.nodes = self.share(nodes)
+        super().spend()
+
+    def share(self, nodes: int) -> int:
+        """Adds nodes to the shared counter, returning the new total"""
+        self.shared += nodes
+        with self.shared_nodes.get_lock():
+            self.shared_nodes.value += nodes
+            return self.shared_nodes.value
+
+    def total(self) -> int:
+        """The nodes spent by all the budgets sharing the counter"""
+        return self.shared_nodes.value
+
+
+def split(
+    board: api.SudokuBoard, target: int, stats: api.SolveStats
+) -> tuple[list[str], list[tuple[api.SudokuBoard, int]]]:
+    """Expands the search tree breadth first until there are at least target
+    subtrees, or nothing left to expand.
+
+    Returns the solutions found while expanding and a (board, depth) for each
+    subtree, where board has the guess of the subtree filled in."""
+    geo = board_geometry(board)
+    state = solver_bitmask.initial_state(board)
+    if state is None:
+        stats.nodes += 1
+        stats.backtracks += 1
+        return [], []
+    solved: list[str] = []
+    frontier: deque[Subtree] = deque([(*state, 0)])
+    while frontier and len(frontier) < target:
+        grid, candidates, singles, depth = frontier.popleft()
+        stats.nodes += 1
+        stats.max_depth = max(stats.max_depth, depth)
+        if not solver_bitmask.propagate(grid, candidates, singles, stats, geo):
+            stats.backtracks += 1
+            continue
+        pos = solver_bitmask.position_with_fewest_candidates(candidates)
+        if pos is None:
+            solved.append("".join(solver_bitmask.grid_to_str(grid, geo)))
+            continue
+        mask = candidates[pos]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            stats.guesses += 1
+            guess_grid, guess_candidates = grid.copy(), candidates.copy()
+            guess_singles: list[int] = []
+            if solver_bitmask.assign(
+                guess_grid, guess_candidates, pos, bit, guess_singles, geo.peers
+            ):
+                frontier.append(
+                    (guess_grid, guess_candidates, guess_singles, depth + 1)
+                )
+            else:
+                stats.backtracks += 1
+    subtrees = [
+        ("".join(solver_bitmask.grid_to_str(grid, geo)), depth)
+        for grid, _, _, depth in frontier
+    ]
+    return solved, subtrees
+
+
+def iter_subtree(
+    board: api.SudokuBoard,
+    stats: api.SolveStats | None = None,
+    cancel: api.CancelFlag | None = None,
+    budget: api.Budget | None = None,
+) -> Generator[str, None, None]:
+    """Yields the solutions of the subtree board"""
+    geo = board_geometry(board)
+    grids = solver_bitmask.search(board, stats=stats, cancel=cancel, budget=budget)
+    with closing(grids):
+        for grid in grids:
+            yield "".join(solver_bitmask.grid_to_str(grid, geo))
+
+
+def merge_stats(stats: api.SolveStats, subtree_stats: api.SolveStats, depth: int):
+    """Adds the statistics of a subtree searched at depth to stats"""
+    stats.nodes += subtree_stats.nodes
+    stats.guesses += subtree_stats.guesses
+    stats.backtracks += subtree_stats.backtracks
+    stats.max_depth = max(stats.max_depth, subtree_stats.max_depth + depth)
+    stats.singles.update(subtree_stats.singles)
+
+
+def _raise_worker_errors(futures: Iterable[Future]) -> None:
+    for future in futures:
+        if future.done() and not future.cancelled() and future.exception():
+            raise future.exception()
+
+
+def _init_worker(
+    stop: api.CancelFlag, results: Queue, budget: SharedBudget | None
+) -> None:
+    global _stop, _results, _budget
+    _stop, _results, _budget = stop, results, budget
+    # a worker may be stopped with solutions still buffered for the queue
+    results.cancel_join_thread()
+
+
+def _put(item: tuple[int, str | None]) -> bool:
+    """Puts the item on the results queue, giving up if the search is stopped while
+    the queue is full"""
+    while not _stop.is_set():
+        try:
+            _results.put(item, timeout=POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _stream_subtree(index: int, board: api.SudokuBoard) -> api.SolveStats:
+    stats = api.SolveStats()
+    budget = None if _budget is None else replace(_budget, shared=0)
+    solutions = iter_subtree(board, stats, _stop, budget)
+    try:
+        with closing(solutions):
+            for solution in solutions:
+                if not _put((index, solution)):
+                    break
+    except api.BudgetExceeded:
+        pass
+    finally:
+        # the search only spends its nodes every CANCEL_CHECK_NODES nodes
+        if budget is not None:
+            budget.share(stats.nodes - budget.shared)
+    _put((index, None))
+    return stats
+
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
+board_sides = _solver.board_sides
@@ -1,91 +1,135 @@
 import itertools
+import time
+from contextlib import closing
 from typing import Callable, Generator
 
-DIGITS_1_TO_9 = {str(n) for n in range(1, 10)}
-DIGITS_0_TO_9 = {str(n) for n in range(0, 10)}
+from sudokusolve import validator
+from sudokusolve.solver import api, variants
+from sudokusolve.solver.geometry import COL_OF, COLS, ROW_OF, ROWS, SQR_OF, SQRS
+
+NUMBERS_1_TO_9 = frozenset(range(1, 10))
+CANCEL_CHECK_NODES = 64
+
+# boards are held as a bytearray of the numbers 0-9, not their characters
+TO_NUMBERS = bytes.maketrans(b"0123456789", bytes(range(10)))
+TO_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+Board = bytearray
+Available = tuple[frozenset[int], ...]
 
 
 def row_gen() -> Generator[tuple[int, ...], None, None]:
-    for pos in range(0, 81):
-        row_start = (pos // 9) * 9
-        yield tuple(range(row_start, row_start + 9))
+    for pos in range(81):
+        yield ROWS[ROW_OF[pos]]
 
 
 def col_gen() -> Generator[tuple[int, ...], None, None]:
     for pos in range(81):
-        col = pos % 9
-        yield tuple(col + n for n in range(0, 81, 9))
+        yield COLS[COL_OF[pos]]
 
 
 def sqr_gen() -> Generator[tuple[int, ...], None, None]:
     for pos in range(81):
-        r = (pos // 27) * 27
-        c = ((pos // 3) % 3) * 3
-        offsets = (0, 1, 2, 9, 10, 11, 18, 19, 20)
-        yield tuple(r + c + o for o in offsets)
+        yield SQRS[SQR_OF[pos]]
+
+
+def peers_gen() -> Generator[tuple[int, ...], None, None]:
+    for pos, rcs in enumerate(RCS_POSITIONS):
+        yield tuple(sorted(set(itertools.chain(*rcs)).difference({pos})))
 
 
 RCS_POSITIONS = tuple(zip(row_gen(), col_gen(), sqr_gen()))
-ROW_POSITIONS = tuple(itertools.islice(row_gen(), 0, 81, 9))
-COL_POSITIONS = tuple(itertools.islice(col_gen(), 9))
-SQR_POSITIONS = tuple(
-    sqr for i, sqr in enumerate(sqr_gen()) if i in (0, 3, 6, 27, 30, 33, 54, 57, 60)
-)
+ROW_POSITIONS = ROWS
+COL_POSITIONS = COLS
+SQR_POSITIONS = SQRS
+UNIT_POSITIONS = ROW_POSITIONS + COL_POSITIONS + SQR_POSITIONS
+PEERS = tuple(peers_gen())
 PHISTOMEFAL_POSITIONS = (
     (0, 1, 9, 10, 7, 8, 16, 17, 63, 64, 72, 73, 70, 71, 79, 80),
-    (20, 21, 22, 23, 24, 29, 33, 38, 42, 47, 51, 56, 57, 58, 59, 60),
+    variants.phistomefel_ring(),
 )
 
 
-def phistomefel_ring_gen(): ...
+def to_board(board: str) -> Board:
+    return bytearray(board.encode("ascii").translate(TO_NUMBERS))
 
 
-def unknown_positions_gen(board):
+def to_str(board: Board) -> str:
+    return board.translate(TO_DIGITS).decode("ascii")
+
+
+def unknown_positions_gen(board: Board):
     for num in board:
-        yield num == "0"
+        yield num == 0
 
 
-def available_number_gen(board):
+def available_number_gen(board: Board):
     for idx, number in enumerate(board):
-        if number == "0":
-            rcs = {board[n] for n in itertools.chain(*RCS_POSITIONS[idx]) if n != "0"}
-            yield DIGITS_1_TO_9.difference(rcs)
+        if number == 0:
+            yield NUMBERS_1_TO_9.difference([board[n] for n in PEERS[idx]])
         else:
-            yield {number}
+            yield frozenset((number,))
 
 
-def only_number_in_position_gen(board):
+def only_number_in_position_gen(board: Board, available_numbers: Available):
     for idx, numbers in itertools.compress(
-        enumerate(available_number_gen(board)), unknown_positions_gen(board)
+        enumerate(available_numbers), unknown_positions_gen(board)
     ):
         if len(numbers) == 1:
-            yield idx, numbers.pop()
+            yield idx, next(iter(numbers))
 
 
-def only_position_in_rcs_gen(board):
-    available_numbers = tuple(available_number_gen(board))
-    unknown_positions = tuple(unknown_positions_gen(board))
-    for rcs in itertools.chain(ROW_POSITIONS, COL_POSITIONS, SQR_POSITIONS):
-        positions_for_each_number = {d: [] for d in DIGITS_1_TO_9}
+def only_position_in_rcs_gen(board: Board, available_numbers: Available):
+    for rcs in UNIT_POSITIONS:
+        positions_for_each_number: dict[int, list[int]] = {d: [] for d in range(1, 10)}
         for pos in rcs:
             for num in available_numbers[pos]:
                 positions_for_each_number[num].append(pos)
         for num, positions in positions_for_each_number.items():
-            if len(positions) == 1 and unknown_positions[positions[0]]:
-                yield positions.pop(), num
+            if len(positions) == 1 and board[positions[0]] == 0:
+                yield positions[0], num
 
 
-def substitute_board(board, substitutions: dict[int, str]):
-    for idx, num in enumerate(board):
-        if idx in substitutions:
-            yield substitutions[idx]
-        else:
-            yield num
+def no_options_gen(board: Board, available_numbers: Available):
+    """Yields the free positions that have no numbers available"""
+    for idx, numbers in itertools.compress(
+        enumerate(available_numbers), unknown_positions_gen(board)
+    ):
+        if not numbers:
+            yield idx
+
+
+def merge_substitutions(
+    board: Board, available_numbers: Available
+) -> dict[int, int] | None:
+    """Returns the naked and hidden singles as one dict of substitutions, or None if
+    two of them disagree on a position or put the same number twice in a unit"""
+    substitutions: dict[int, int] = {}
+    placed: set[tuple[int, int]] = set()
+    for pos, num in itertools.chain(
+        only_number_in_position_gen(board, available_numbers),
+        only_position_in_rcs_gen(board, available_numbers),
+    ):
+        if pos in substitutions:
+            if substitutions[pos] != num:
+                return None
+            continue
+        for unit in (ROW_OF[pos], 9 + COL_OF[pos], 18 + SQR_OF[pos]):
+            if (unit, num) in placed:
+                return None
+            placed.add((unit, num))
+        substitutions[pos] = num
+    return substitutions
+
 
+def substitute_board(board: Board, substitutions: dict[int, int]) -> None:
+    for idx, num in substitutions.items():
+        board[idx] = num
 
-def position_with_fewest_numbers(board):
+
+def position_with_fewest_numbers(board: Board, available_numbers: Available):
     return min(
-        filter(lambda x: len(x[1]) > 1, enumerate(available_number_gen(board))),
+        itertools.compress(enumerate(available_numbers), unknown_positions_gen(board)),
         key=lambda x: len(x[1]),
     )
 
@@ -93,30 +137,90 @@ def position_with_fewest_numbers(board):
 def solve_sudoku(
     board, completed_board_validator: Callable[[str], bool], max_solutions: int = 1
 ):
-    boards = []
-    solved_boards = []
+    solutions = iter_solutions(board, completed_board_validator)
+    with closing(solutions):
+        return list(itertools.islice(solutions, max(max_solutions, 0)))
+
+
+def iter_solutions(
+    board, completed_board_validator: Callable[[str], bool] | None = None
+) -> Generator[str, None, None]:
+    """Yields each solution as soon as it is found, the search is suspended until
+    the next one is requested. The validator defaults to validate_solved_board."""
+    return _iter_solutions(
+        board, completed_board_validator or validator.validate_solved_board
+    )
+
+
+def _iter_solutions(
+    board,
+    completed_board_validator: Callable[[str], bool] | None,
+    budget: api.Budget | None = None,
+) -> Generator[str, None, None]:
+    """Each pass of the loop counts as a node of the budget, which is spent every
+    CANCEL_CHECK_NODES nodes"""
+    boards: list[Board] = []
+    current = to_board(board)
+    nodes = 0
     while True:
-        only_possible_numbers = {i: n for i, n in only_number_in_position_gen(board)}
-        only_position_in_rcs = {i: n for i, n in only_position_in_rcs_gen(board)}
-        substitutions = only_possible_numbers | only_position_in_rcs
-        if substitutions:
-            board = "".join(substitute_board(board, substitutions))
+        nodes += 1
+        if budget is not None and not nodes % CANCEL_CHECK_NODES:
+            budget.spend(CANCEL_CHECK_NODES)
+        available_numbers = tuple(available_number_gen(current))
+        if any(no_options_gen(current, available_numbers)):
+            pass
+        elif (substitutions := merge_substitutions(current, available_numbers)) is None:
+            pass
+        elif substitutions:
+            substitute_board(current, substitutions)
             continue
-        elif not any(unknown_positions_gen(board)) and completed_board_validator(board):
-            solved_boards.append(board)
-            if len(solved_boards) >= max_solutions:
-                break
+        elif not any(unknown_positions_gen(current)):
+            solved_board = to_str(current)
+            if completed_board_validator is None or completed_board_validator(
+                solved_board
+            ):
+                yield solved_board
         else:
-            try:
-                pos, numbers = position_with_fewest_numbers(board)
-                substitions = [{pos: n} for n in numbers]
-                boards.extend(
-                    "".join(substitute_board(board, subs)) for subs in substitions
-                )
-            except ValueError:
-                pass
+            pos, numbers = position_with_fewest_numbers(current, available_numbers)
+            for n in numbers:
+                guess = current.copy()
+                guess[pos] = n
+                boards.append(guess)
         try:
-            board = boards.pop()
+            current = boards.pop()
         except IndexError:
             break
-    return solved_boards
+
+
+def count_solutions(board, limit: int) -> int:
+    return len(solve_sudoku(board, validator.validate_solved_board, limit))
+
+
+def is_unique(board) -> bool:
+    return api.unique_by_count(count_solutions, board)
+
+
+def solve_with_stats(
+    board, completed_board_validator: Callable[[str], bool], max_solutions: int = 1
+) -> api.SolveResult:
+    stats = api.SolveStats()
+    start = time.perf_counter()
+    solutions = solve_sudoku(board, completed_board_validator, max_solutions)
+    stats.wall_time = time.perf_counter() - start
+    return api.SolveResult(solutions, stats)
+
+
+def solve_within(
+    board,
+    completed_board_validator: Callable[[str], bool],
+    max_solutions: int,
+    budget: api.Budget,
+) -> api.BudgetResult:
+    """Solves the board until the budget runs out, returning the solutions found by
+    then. The search spends the budget every CANCEL_CHECK_NODES nodes."""
+    stats = api.SolveStats()
+    start = time.perf_counter()
+    solutions = _iter_solutions(board, completed_board_validator, budget)
+    found, exceeded = api.take_within(solutions, max_solutions, budget)
+    stats.wall_time = time.perf_counter() - start
+    return api.BudgetResult(found, stats, exceeded)
@@ -0,0 +1,27 @@
+"""Solves Sudoku boards with the set based algorithms of solver_python_sets, keeping
+the candidates up to date as digits are placed.
+
+See solver_python_sets.IncrementalSudokuSolver: rather than rebuilding the
+candidates and the available positions of each digit on every loop, each change is
+recorded on a trail, and backtracking after a wrong guess unwinds the trail instead
+of restoring a copy of the board.
+
+Typical usage example:
+
+    solutions = solver_python_incremental.solve_sudoku(
+        board, validator.validate_solved_board, 10
+    )
+"""
+
+from sudokusolve.solver.solver_python_sets import (
+    IncrementalSudokuSolver as SudokuSolver,
+)
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
@@ -1,10 +1,23 @@
+import time
+from contextlib import closing
 from dataclasses import dataclass
-from itertools import chain
-from typing import Callable
+from itertools import chain, islice
+from typing import Any, Callable, Generator
+from sudokusolve import validator
 from sudokusolve.solver import api
+from sudokusolve.solver.geometry import COL_OF, COLS, PEERS, ROW_OF, ROWS, SQR_OF, SQRS
 
 DigitsInPosition = set[str]
 DigitsInPositions = list[DigitsInPosition]
+UndoRecord = tuple[Any, ...]  # (undo function, *args)
+CANCEL_CHECK_NODES = 64
+
+
+def _unit_indexes(position: int) -> tuple[int, int, int]:
+    return ROW_OF[position], 9 + COL_OF[position], 18 + SQR_OF[position]
+
+
+UNIT_INDEXES = tuple(_unit_indexes(position) for position in range(81))
 
 
 class BoardError(Exception):
@@ -67,7 +80,7 @@ class SudokuSolver(api.ABCSolver):
         6 7 8
         e.g. position 0,3 will be square 0, 0,4 in square 1, and 8,7 in square 8.
         """
-        return ((row // 3) * 3) + (col // 3)
+        return SQR_OF[row * 9 + col]
 
     @staticmethod
     def get_index(position: int) -> tuple[int, int]:
@@ -78,22 +91,15 @@ class SudokuSolver(api.ABCSolver):
 
     def get_row(self, position: int) -> DigitsInPosition:
         """Return set of numbers in row at given position"""
-        r, _ = self.get_index(position)
-        row_start = r * 9
-        return set(self.board[row_start : row_start + 9])
+        return set(self.board[pos] for pos in ROWS[ROW_OF[position]])
 
     def get_col(self, position: int) -> DigitsInPosition:
         """Return set of numbers in column at given position"""
-        _, c = self.get_index(position)
-        return set(self.board[pos] for pos in range(c, 81, 9))
+        return set(self.board[pos] for pos in COLS[COL_OF[position]])
 
     def get_sqr(self, position: int) -> DigitsInPosition:
         """Return set of numbers in square at given position"""
-        r, c = self.get_index(position)
-        sq_start_pos = (r // 3) * 27 + (c // 3) * 3
-        # offsets from starting position to visit every position in square
-        offsets = (0, 1, 2, 9, 10, 11, 18, 19, 20)
-        return set(self.board[sq_start_pos + offset] for offset in offsets)
+        return set(self.board[pos] for pos in SQRS[SQR_OF[position]])
 
     def get_not_available(self, position: int) -> DigitsInPosition:
         """Return set of numbers that are not available in given position"""
@@ -190,16 +196,63 @@ class SudokuSolver(api.ABCSolver):
         max_solutions: int = 1,
     ) -> list[str]:
         """Try to solve any Sudoku board using 3 algorithms, alg1, alg2, and alg3"""
+        solutions = self.iter_solutions(board, completed_board_validator)
+        with closing(solutions):
+            return list(islice(solutions, max(max_solutions, 0)))
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Generator[str, None, None]:
+        """Yields each solution as soon as it is found, the search is suspended
+        until the next one is requested. The validator defaults to
+        validator.solution_validator(self)."""
+        return self._iter_solutions(
+            board, completed_board_validator or validator.solution_validator(self)
+        )
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Solves the board until the budget runs out, counting each pass of the
+        search loop as a node, and spending the budget every CANCEL_CHECK_NODES
+        nodes"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._iter_solutions(board, completed_board_validator, budget)
+        found, exceeded = api.take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return api.BudgetResult(found, stats, exceeded)
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
         self.__init__()
         self.board = list(board)
-        while len(self.valid_solutions) < max_solutions:
+        nodes = 0
+        while True:
+            nodes += 1
+            if budget is not None and not nodes % CANCEL_CHECK_NODES:
+                budget.spend(CANCEL_CHECK_NODES)
             # TODO: having to check for duplicate solutions - should not happen!
             if (
                 "0" not in self.board
-                and completed_board_validator("".join(self.board))
+                and (
+                    completed_board_validator is None
+                    or completed_board_validator("".join(self.board))
+                )
                 and "".join(self.board) not in self.valid_solutions
             ):
                 self.valid_solutions.append("".join(self.board))
+                yield self.valid_solutions[-1]
                 if not self.try_next_board_option():
                     break
 
@@ -226,7 +279,204 @@ class SudokuSolver(api.ABCSolver):
             if not self.try_next_board_option():
                 break
 
-        return self.valid_solutions
+
+class IncrementalSudokuSolver(SudokuSolver):
+    """Keeps the candidates for each position, and the available positions for each
+    digit in each row, column and square, up to date as digits are placed rather than
+    rebuilding them on every loop.
+
+    Every change is recorded on a trail as an (undo function, *args) record, so
+    backtracking after a wrong guess unwinds the trail back to the point of the guess
+    instead of restoring a copy of the board."""
+
+    __version__ = "1"
+    correct_by_construction = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.candidates: DigitsInPositions = []
+        self.unit_digits: list[DigitsInPosition] = [set() for _ in range(27)]
+        self.trail: list[UndoRecord] = []
+        self.decisions: list[tuple[int, int, list[str]]] = []
+        self.singles: list[int] = []
+        self.hidden_singles: list[tuple[int, str]] = []
+
+    def initialise_available_pos(self):
+        super().initialise_available_pos()
+        # the available positions for the 9 rows, then 9 columns, then 9 squares
+        self.available_pos_units: list[DigitsInPositions] = (
+            self.available_pos_row + self.available_pos_col + self.available_pos_sqr
+        )
+
+    def get_unit_indexes(self, position: int) -> tuple[int, int, int]:
+        """Returns the indexes of the row, column and square of a position in
+        available_pos_units"""
+        return UNIT_INDEXES[position]
+
+    def initialise_candidates(self) -> bool:
+        """Works out the candidates and available positions from scratch, once per
+        solve. Returns False if a digit is given twice in a row, column or square, or
+        can't be placed anywhere in one"""
+        units = self.available_pos_units
+        for position, num_str in enumerate(self.board):
+            if num_str == "0":
+                self.candidates.append(self.get_available(position))
+            else:
+                self.candidates.append(set())
+                for unit in self.get_unit_indexes(position):
+                    if num_str in self.unit_digits[unit]:
+                        return False
+                    self.unit_digits[unit].add(num_str)
+        for position, available in enumerate(self.candidates):
+            if len(available) == 1:
+                self.singles.append(position)
+            for unit in self.get_unit_indexes(position):
+                for num in available:
+                    units[unit][int(num)].add(position)
+        for unit, (digits, available_pos) in enumerate(zip(self.unit_digits, units)):
+            for num in self.DIGITS_1_TO_9.difference(digits):
+                if not available_pos[int(num)]:
+                    return False
+                if len(available_pos[int(num)]) == 1:
+                    self.hidden_singles.append((unit, num))
+        return all(
+            self.candidates[position]
+            for position, num in enumerate(self.board)
+            if num == "0"
+        )
+
+    def remove_available_pos(self, unit: int, num: str, position: int) -> bool:
+        """Removes a position from the available positions for a digit in a row,
+        column or square. Returns False if that leaves nowhere for the digit"""
+        available_pos = self.available_pos_units[unit][int(num)]
+        available_pos.discard(position)
+        self.trail.append((available_pos.add, position))
+        if len(available_pos) == 1:
+            self.hidden_singles.append((unit, num))
+        elif not available_pos and num not in self.unit_digits[unit]:
+            return False
+        return True
+
+    def place(self, position: int, num: str) -> bool:
+        """Puts a digit on the board and removes it from the candidates of every
+        peer. Returns False if that leaves a position or a digit with no options"""
+        trail = self.trail
+        self.board[position] = num
+        trail.append((self.board.__setitem__, position, "0"))
+        units = self.get_unit_indexes(position)
+        for unit in units:
+            self.unit_digits[unit].add(num)
+            trail.append((self.unit_digits[unit].discard, num))
+        available = self.candidates[position]
+        self.candidates[position] = set()
+        trail.append((self.candidates.__setitem__, position, available))
+        for other_num in available:
+            for unit in units:
+                if not self.remove_available_pos(unit, other_num, position):
+                    return False
+        for peer in PEERS[position]:
+            peer_available = self.candidates[peer]
+            if num not in peer_available:
+                continue
+            peer_available.discard(num)
+            trail.append((peer_available.add, num))
+            if not peer_available:
+                return False
+            if len(peer_available) == 1:
+                self.singles.append(peer)
+            for unit in self.get_unit_indexes(peer):
+                if not self.remove_available_pos(unit, num, peer):
+                    return False
+        return True
+
+    def undo(self, trail_length: int) -> None:
+        """Unwinds the trail until it's back to trail_length records"""
+        trail = self.trail
+        while len(trail) > trail_length:
+            undo_function, *args = trail.pop()
+            undo_function(*args)
+        self.singles.clear()
+        self.hidden_singles.clear()
+
+    def propagate(self) -> bool:
+        """Places naked singles (alg1) and hidden singles (alg2) until there are
+        none left. Returns False if the board can't be solved from here"""
+        units = self.available_pos_units
+        while self.singles or self.hidden_singles:
+            if self.singles:
+                position = self.singles.pop()
+                available = self.candidates[position]
+                if len(available) == 1:
+                    if not self.place(position, next(iter(available))):
+                        return False
+            else:
+                unit, num = self.hidden_singles.pop()
+                available_pos = units[unit][int(num)]
+                if len(available_pos) == 1 and num not in self.unit_digits[unit]:
+                    if not self.place(next(iter(available_pos)), num):
+                        return False
+        return True
+
+    def next_decision(self) -> bool:
+        """Backtracks to the most recent guess that still has untried digits and
+        tries the next one. Returns False when every guess has been exhausted"""
+        while self.decisions:
+            trail_length, position, untried = self.decisions[-1]
+            self.undo(trail_length)
+            if not untried:
+                self.decisions.pop()
+            elif self.place(position, untried.pop()):
+                return True
+        return False
+
+    def position_with_fewest_candidates(self) -> BoardPosition | None:
+        return min(
+            (
+                BoardPosition(possible_values=available, position=position)
+                for position, available in enumerate(self.candidates)
+                if available
+            ),
+            key=lambda x: x.options_count,
+            default=None,
+        )
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        """Try to solve any Sudoku board using alg1 and alg2 on incrementally
+        maintained candidates, guessing (alg3) when neither makes progress. Each
+        solution is yielded as soon as it is found."""
+        self.__init__()
+        self.board = list(board)
+        consistent = self.initialise_candidates()
+        nodes = 0
+        while consistent:
+            nodes += 1
+            if budget is not None and not nodes % CANCEL_CHECK_NODES:
+                budget.spend(CANCEL_CHECK_NODES)
+            if self.propagate():
+                lowest = self.position_with_fewest_candidates()
+                if lowest is None:
+                    solution = "".join(self.board)
+                    if completed_board_validator is None or completed_board_validator(
+                        solution
+                    ):
+                        self.valid_solutions.append(solution)
+                        yield solution
+                else:
+                    untried = sorted(lowest.possible_values)
+                    self.decisions.append((len(self.trail), lowest.position, untried))
+            if not self.next_decision():
+                break
 
 
-solve_sudoku = SudokuSolver().solve_sudoku
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
@@ -0,0 +1,207 @@
+"""Solves Sudoku boards by encoding them as CNF for the CDCL SAT solver in cdcl.py.
+
+There's a variable for each digit that a free position can still take, given the
+digits of its peers. The clauses say that each free position has exactly one digit,
+and that each digit missing from a unit is in exactly one of the unit's positions
+("exactly one" is a clause of every choice plus a clause for each pair of choices
+that can't both be true). Each solution found adds a clause that blocks it, so the
+next solve finds a different one.
+
+Clause learning means a contradiction hidden deep in the search tree is only found
+once, which makes this the solver for the pathological boards (e.g. near-empty
+boards with no solution) that the backtracking solvers thrash on. It's slower than
+solver_bitmask on ordinary puzzles.
+
+Typical usage example:
+
+    solutions = solver_sat.solve_sudoku(board, validator.validate_solved_board, 1)
+"""
+
+import time
+from contextlib import closing
+from itertools import combinations, islice
+from typing import Callable, Generator, Iterator, NamedTuple
+
+from sudokusolve.solver import api, cdcl
+from sudokusolve.solver.geometry import SIZES, Geometry, board_geometry
+
+
+class Encoding(NamedTuple):
+    """choices: the (position, digit index) of each variable, choices[v - 1] for
+    variable v
+    clauses: lists of DIMACS literals"""
+
+    choices: list[tuple[int, int]]
+    clauses: list[list[int]]
+
+
+def encode(board: api.SudokuBoard, geo: Geometry) -> Encoding | None:
+    """Returns the CNF encoding of the board, or None if its given digits
+    contradict each other"""
+    digit_bits = geo.digit_bits
+    grid = [digit_bits[num] for num in board]
+    choices: list[tuple[int, int]] = []
+    variables: dict[tuple[int, int], int] = {}
+    clauses: list[list[int]] = []
+    for pos, bit in enumerate(grid):
+        taken = 0
+        for peer in geo.peers[pos]:
+            taken |= grid[peer]
+        if bit:
+            if taken & bit:
+                return None
+            continue
+        cell = []
+        for digit in range(geo.side):
+            if not taken >> digit & 1:
+                choices.append((pos, digit))
+                variables[pos, digit] = len(choices)
+                cell.append(len(choices))
+        clauses.append(cell)
+        clauses.extend([-a, -b] for a, b in combinations(cell, 2))
+    for unit in geo.units:
+        placed = 0
+        for pos in unit:
+            placed |= grid[pos]
+        for digit in range(geo.side):
+            if placed >> digit & 1:
+                continue
+            places = [
+                variables[pos, digit] for pos in unit if (pos, digit) in variables
+            ]
+            clauses.append(places)
+            clauses.extend([-a, -b] for a, b in combinations(places, 2))
+    return Encoding(choices, clauses)
+
+
+class SudokuSolver(api.ABCSolver):
+    __version__ = "1"
+    correct_by_construction = True
+    board_sides = SIZES
+
+    def __init__(self) -> None:
+        self.valid_solutions: list[str] = []
+
+    def solve_sudoku(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> list[str]:
+        """Finds up to max_solutions solutions, blocking each one found"""
+        return self._solve(board, completed_board_validator, max_solutions)
+
+    def solve_with_stats(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int = 1,
+    ) -> api.SolveResult:
+        """Solves the board as solve_sudoku, also counting the search statistics:
+        decisions are counted as guesses and conflicts as backtracks"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._solve(board, completed_board_validator, max_solutions, stats)
+        stats.wall_time = time.perf_counter() - start
+        return api.SolveResult(solutions, stats)
+
+    def solve_within(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        budget: api.Budget,
+    ) -> api.BudgetResult:
+        """Solves the board as solve_with_stats until the budget runs out, counting
+        each decision as a node"""
+        stats = api.SolveStats()
+        start = time.perf_counter()
+        solutions = self._iter_solutions(
+            board, completed_board_validator, stats, budget
+        )
+        found, exceeded = api.take_within(solutions, max_solutions, budget)
+        stats.wall_time = time.perf_counter() - start
+        return api.BudgetResult(found, stats, exceeded)
+
+    def iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None = None,
+    ) -> Iterator[str]:
+        """Yields each solution as soon as it's found, the next one is only searched
+        for when it's requested"""
+        return self._iter_solutions(board, completed_board_validator)
+
+    def count_solutions(self, board: api.SudokuBoard, limit: int) -> int:
+        """Counts the solutions, stopping at limit"""
+        return sum(1 for _ in islice(search(board), max(limit, 0)))
+
+    def _solve(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool],
+        max_solutions: int,
+        stats: api.SolveStats | None = None,
+    ) -> list[str]:
+        solutions = self._iter_solutions(board, completed_board_validator, stats)
+        with closing(solutions):
+            self.valid_solutions = list(islice(solutions, max(max_solutions, 0)))
+        return self.valid_solutions
+
+    def _iter_solutions(
+        self,
+        board: api.SudokuBoard,
+        completed_board_validator: Callable[[str], bool] | None,
+        stats: api.SolveStats | None = None,
+        budget: api.Budget | None = None,
+    ) -> Generator[str, None, None]:
+        for solution in search(board, stats, budget):
+            if completed_board_validator is None or completed_board_validator(solution):
+                yield solution
+
+
+def search(
+    board: api.SudokuBoard,
+    stats: api.SolveStats | None = None,
+    budget: api.Budget | None = None,
+) -> Generator[str, None, None]:
+    """Yields every solution of the board. The search statistics are added to stats
+    if given, and the budget is spent as in cdcl.Solver.solve."""
+    geo = board_geometry(board)
+    encoding = encode(board, geo)
+    if encoding is None:
+        return
+    choices, clauses = encoding
+    sat = cdcl.Solver(len(choices))
+    for clause in clauses:
+        sat.add_clause(clause)
+    try:
+        while sat.solve(budget):
+            solution = list(board)
+            chosen = []
+            for var, value in enumerate(sat.model(), 1):
+                if value:
+                    pos, digit = choices[var - 1]
+                    solution[pos] = geo.digits[digit]
+                    chosen.append(-var)
+            yield "".join(solution)
+            if not sat.add_clause(chosen):
+                return
+    finally:
+        if stats is not None:
+            stats.nodes += sat.decisions + 1
+            stats.guesses += sat.decisions
+            stats.backtracks += sat.conflicts
+            stats.max_depth = max(stats.max_depth, sat.max_level)
+            stats.singles["propagations"] += sat.propagations
+
+
+_solver = SudokuSolver()
+solve_sudoku = _solver.solve_sudoku
+count_solutions = _solver.count_solutions
+is_unique = _solver.is_unique
+solve_with_stats = _solver.solve_with_stats
+solve_within = _solver.solve_within
+iter_solutions = _solver.iter_solutions
+correct_by_construction = _solver.correct_by_construction
+board_sides = _solver.board_sides
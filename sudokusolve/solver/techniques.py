@@ -0,0 +1,181 @@
+"""Candidate elimination techniques that prune the search before guessing.
+
+Each technique looks at the candidate masks used by solver_bitmask (a 9-bit mask of
+the available digits for each position, 0 for positions that have a digit) and
+yields (position, digits to remove) eliminations. The techniques are registered by
+name in TECHNIQUES so that they can be switched on for a solve, and
+apply_techniques runs them in order, counting the eliminations each one makes.
+
+Typical usage example:
+
+    eliminations = collections.Counter()
+    chosen = get_techniques(["naked_pairs", "x_wing"])
+    apply_techniques(candidates, singles, chosen, eliminations)
+"""
+
+from collections import Counter
+from functools import partial
+from itertools import combinations
+from typing import Callable, Generator, Iterable
+
+from sudokusolve.solver.geometry import COL_OF, COLS, ROW_OF, ROWS, SQR_OF, SQRS, UNITS
+
+Candidates = list[int]
+Elimination = tuple[int, int]
+Technique = Callable[[Candidates], Generator[Elimination, None, None]]
+
+DIGIT_BITS = tuple(1 << n for n in range(9))
+
+
+def naked_subsets(
+    candidates: Candidates, size: int
+) -> Generator[Elimination, None, None]:
+    """size positions in a unit that only have size digits between them - those
+    digits can be removed from the rest of the unit"""
+    for unit in UNITS:
+        small = [pos for pos in unit if 2 <= candidates[pos].bit_count() <= size]
+        for subset in combinations(small, size):
+            digits = 0
+            for pos in subset:
+                digits |= candidates[pos]
+            if digits.bit_count() == size:
+                for pos in unit:
+                    if pos not in subset and candidates[pos] & digits:
+                        yield pos, digits
+
+
+def hidden_subsets(
+    candidates: Candidates, size: int
+) -> Generator[Elimination, None, None]:
+    """size digits that can only go in the same size positions of a unit - every
+    other digit can be removed from those positions"""
+    for unit in UNITS:
+        positions_for_digit = {}
+        for bit in DIGIT_BITS:
+            positions = [pos for pos in unit if candidates[pos] & bit]
+            if 2 <= len(positions) <= size:
+                positions_for_digit[bit] = positions
+        for digits in combinations(positions_for_digit, size):
+            positions = set()
+            for bit in digits:
+                positions.update(positions_for_digit[bit])
+            if len(positions) == size:
+                keep = sum(digits)
+                for pos in positions:
+                    if candidates[pos] & ~keep:
+                        yield pos, candidates[pos] & ~keep
+
+
+def pointing_pairs(candidates: Candidates) -> Generator[Elimination, None, None]:
+    """A digit that can only go in one row (or column) of a square can be removed
+    from the rest of that row (or column)"""
+    for sqr_index, sqr in enumerate(SQRS):
+        for bit in DIGIT_BITS:
+            positions = [pos for pos in sqr if candidates[pos] & bit]
+            if len(positions) < 2:
+                continue
+            for line_of, lines in ((ROW_OF, ROWS), (COL_OF, COLS)):
+                line_indexes = {line_of[pos] for pos in positions}
+                if len(line_indexes) == 1:
+                    for pos in lines[line_indexes.pop()]:
+                        if SQR_OF[pos] != sqr_index and candidates[pos] & bit:
+                            yield pos, bit
+
+
+def box_line_reduction(candidates: Candidates) -> Generator[Elimination, None, None]:
+    """A digit that can only go in one square within a row (or column) can be
+    removed from the rest of that square"""
+    for lines in (ROWS, COLS):
+        for line in lines:
+            for bit in DIGIT_BITS:
+                positions = [pos for pos in line if candidates[pos] & bit]
+                if len(positions) < 2:
+                    continue
+                sqr_indexes = {SQR_OF[pos] for pos in positions}
+                if len(sqr_indexes) == 1:
+                    for pos in SQRS[sqr_indexes.pop()]:
+                        if pos not in line and candidates[pos] & bit:
+                            yield pos, bit
+
+
+def x_wing(candidates: Candidates) -> Generator[Elimination, None, None]:
+    """A digit that can only go in the same 2 columns of 2 rows must be in the
+    corners of that rectangle, so can be removed from the rest of both columns (and
+    the same with rows and columns swapped)"""
+    for lines, line_of, cross_lines, cross_of in (
+        (ROWS, ROW_OF, COLS, COL_OF),
+        (COLS, COL_OF, ROWS, ROW_OF),
+    ):
+        for bit in DIGIT_BITS:
+            pairs: dict[tuple[int, ...], list[int]] = {}
+            for line_index, line in enumerate(lines):
+                crossings = tuple(cross_of[p] for p in line if candidates[p] & bit)
+                if len(crossings) == 2:
+                    pairs.setdefault(crossings, []).append(line_index)
+            for crossings, line_indexes in pairs.items():
+                if len(line_indexes) != 2:
+                    continue
+                for cross_index in crossings:
+                    for pos in cross_lines[cross_index]:
+                        if line_of[pos] not in line_indexes and candidates[pos] & bit:
+                            yield pos, bit
+
+
+TECHNIQUES: dict[str, Technique] = {
+    "naked_pairs": partial(naked_subsets, size=2),
+    "hidden_pairs": partial(hidden_subsets, size=2),
+    "pointing_pairs": pointing_pairs,
+    "box_line_reduction": box_line_reduction,
+    "naked_triples": partial(naked_subsets, size=3),
+    "hidden_triples": partial(hidden_subsets, size=3),
+    "x_wing": x_wing,
+}
+
+
+def get_techniques(names: Iterable[str]) -> list[tuple[str, Technique]]:
+    """Looks up the techniques by name, in the order given"""
+    try:
+        return [(name, TECHNIQUES[name]) for name in names]
+    except KeyError as e:
+        raise ValueError(f"Unknown technique {e}") from None
+
+
+def eliminate(
+    candidates: Candidates, eliminations: Iterable[Elimination], singles: list[int]
+) -> int:
+    """Removes the digits from the candidates, appending positions left with one
+    candidate to singles. Returns the number of digits removed, or -1 if a position
+    is left with no candidates."""
+    removed = 0
+    for pos, bits in eliminations:
+        mask = candidates[pos]
+        bits &= mask
+        if not bits:
+            continue
+        mask ^= bits
+        candidates[pos] = mask
+        removed += bits.bit_count()
+        if not mask:
+            return -1
+        if not mask & (mask - 1):
+            singles.append(pos)
+    return removed
+
+
+def apply_techniques(
+    candidates: Candidates,
+    singles: list[int],
+    techniques: list[tuple[str, Technique]],
+    eliminations: Counter,
+) -> int:
+    """Runs the techniques in order until one of them removes a candidate, so that
+    cheaper techniques (and singles) get another go before the expensive ones.
+
+    Returns the number of candidates removed, or -1 if the board has no solution."""
+    for name, technique in techniques:
+        removed = eliminate(candidates, list(technique(candidates)), singles)
+        if removed:
+            if removed > 0:
+                eliminations[name] += removed
+            return removed
+    return 0
@@ -0,0 +1,148 @@
+"""Sudoku variants, compiled into the position tables of geometry.py.
+
+A variant adds constraints to the classic rules. Extra units (the two diagonals of
+X-Sudoku, the windows of Windoku, or any other regions that must hold every digit)
+are added to the units and peers of a Geometry, so solver_bitmask places and checks
+them exactly as it does the rows, columns and squares, at no extra cost per node.
+
+The Phistomefel ring is a multiset equality: on a 9x9 board the 16 positions of the
+ring around the centre square hold the same digits as the 16 positions of the 2x2
+corners. That's true of every classic Sudoku, so the variant never changes the
+solutions, but solver_bitmask uses it to prune the branches where the number of
+times a digit can be in the ring and the corners no longer match.
+
+Typical usage example:
+
+    geo = variants.compile_geometry(9, ["diagonal"])
+    solver = solver_bitmask.SudokuSolver(variants=["diagonal", "phistomefel"])
+    solver = solver_bitmask.SudokuSolver(regions=irregular_regions)
+"""
+
+from functools import cache
+from typing import Callable, Iterable, NamedTuple
+
+from sudokusolve.solver.geometry import Geometry, Positions, geometry, unit_peers
+
+
+class Constraints(NamedTuple):
+    """units: sets of side positions that must hold every digit once
+    equal_sets: pairs of sets of positions that must hold the same digits"""
+
+    units: tuple[Positions, ...] = ()
+    equal_sets: tuple[tuple[Positions, Positions], ...] = ()
+
+
+def diagonals(geo: Geometry) -> Constraints:
+    """The two main diagonals, as in X-Sudoku"""
+    side = geo.side
+    return Constraints(
+        units=(
+            tuple(n * (side + 1) for n in range(side)),
+            tuple((n + 1) * (side - 1) for n in range(side)),
+        )
+    )
+
+
+def windows(geo: Geometry) -> Constraints:
+    """The squares that start one position in from each square and are a position
+    apart, as in Windoku (4 of them on a 9x9 board)"""
+    box, side = geo.box, geo.side
+    starts = range(1, side - box + 1, box + 1)
+    return Constraints(
+        units=tuple(
+            tuple((row + r) * side + col + c for r in range(box) for c in range(box))
+            for row in starts
+            for col in starts
+        )
+    )
+
+
+def phistomefel(geo: Geometry) -> Constraints:
+    """The Phistomefel ring and the corners of a 9x9 board"""
+    if geo.side != 9:
+        raise ValueError("The Phistomefel ring is only defined for 9x9 boards")
+    return Constraints(equal_sets=((phistomefel_ring(), phistomefel_corners()),))
+
+
+def phistomefel_ring() -> Positions:
+    """The 16 positions around the centre square, two positions in from the edge"""
+    return tuple(
+        r * 9 + c
+        for r in range(2, 7)
+        for c in range(2, 7)
+        if r in (2, 6) or c in (2, 6)
+    )
+
+
+def phistomefel_corners() -> Positions:
+    """The 16 positions of the 2x2 corners of a 9x9 board"""
+    return tuple(r * 9 + c for r in (0, 1, 7, 8) for c in (0, 1, 7, 8))
+
+
+def extra_regions(geo: Geometry, regions: Iterable[Iterable[int]]) -> Constraints:
+    """Regions of side positions that must each hold every digit once, e.g. the
+    irregular regions drawn on a puzzle"""
+    units = tuple(tuple(sorted(region)) for region in regions)
+    for unit in units:
+        if len(set(unit)) != geo.side or not 0 <= min(unit) <= max(unit) < geo.cells:
+            raise ValueError(
+                f"A region must be {geo.side} different positions on the board: {unit}"
+            )
+    return Constraints(units=units)
+
+
+VARIANTS: dict[str, Callable[[Geometry], Constraints]] = {
+    "diagonal": diagonals,
+    "windoku": windows,
+    "phistomefel": phistomefel,
+}
+
+
+def compile_geometry(
+    side: int,
+    names: Iterable[str] = (),
+    regions: Iterable[Iterable[int]] = (),
+) -> Geometry:
+    """Returns the tables for boards of the side with the constraints of the named
+    VARIANTS and the extra regions added. The tables are built once for each
+    combination."""
+    return _compile(
+        side, tuple(sorted(set(names))), tuple(tuple(region) for region in regions)
+    )
+
+
+def is_solution(board: str, geo: Geometry) -> bool:
+    """Returns True if the solved board meets every constraint of the geometry"""
+    digits = set(geo.digits)
+    return all({board[pos] for pos in unit} == digits for unit in geo.units) and all(
+        sorted(board[pos] for pos in first) == sorted(board[pos] for pos in second)
+        for first, second in geo.equal_sets
+    )
+
+
+@cache
+def _compile(
+    side: int, names: tuple[str, ...], regions: tuple[tuple[int, ...], ...]
+) -> Geometry:
+    geo = geometry(side)
+    for name in names:
+        if name not in VARIANTS:
+            raise ValueError(
+                f"Unknown variant {name!r}, choose from {', '.join(VARIANTS)}"
+            )
+    added = [VARIANTS[name](geo) for name in names]
+    if regions:
+        added.append(extra_regions(geo, regions))
+    units = geo.units + tuple(
+        unit
+        for constraints in added
+        for unit in constraints.units
+        if unit not in geo.units
+    )
+    return geo._replace(
+        units=units,
+        peers=unit_peers(geo.cells, units),
+        equal_sets=tuple(
+            pair for constraints in added for pair in constraints.equal_sets
+        ),
+    )
@@ -0,0 +1,250 @@
+"""Stores Sudoku puzzles in a file of fixed-width records.
+
+The file starts with a header and a table of the categories, each with the index of
+its first puzzle and the number of puzzles in it. Then come the puzzle records (the
+question, and the index and number of its answers) and finally the answer records.
+Every record in a section is the same size (the boards are board_size characters,
+81 unless the store holds larger boards), so a puzzle is found by its category
+and puzzle id with a little arithmetic and read from a memory map of the file,
+without reading the rest of the file. Iterating over a category reads its records
+in order, so it works for millions of puzzles. The modules that are only needed to
+write a store are imported when one is written, so reading one starts quickly.
+
+Typical usage example:
+
+    store.write_store(path, {"daily": puzzles})
+    with store.PuzzleStore(path) as puzzle_store:
+        puzzle = puzzle_store.get("daily", 42)
+        for puzzle in puzzle_store.iter_puzzles("daily"):
+            ...
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, NamedTuple
+
+MAGIC = b"SUDOKUPS"
+VERSION = 2
+BOARD_SIZE = 81
+MAX_CATEGORY_NAME = 64
+
+# magic, version, board size, number of categories, puzzles, answers
+HEADER = struct.Struct("<8sHHHQQ")
+# name, first puzzle, number of puzzles
+CATEGORY = struct.Struct(f"<{MAX_CATEGORY_NAME}sQQ")
+
+
+class TestSudoku(NamedTuple):
+    question: str
+    answers: list[str]
+
+
+class StoreError(Exception):
+    """The file is not a puzzle store, or was written by a different version"""
+
+
+class Category(NamedTuple):
+    start: int
+    count: int
+
+
+def records(board_size: int) -> tuple[struct.Struct, struct.Struct]:
+    """The puzzle (question, first answer, number of answers) and answer records of
+    a store of boards of board_size characters"""
+    return struct.Struct(f"<{board_size}sQI"), struct.Struct(f"<{board_size}s")
+
+
+def write_store(
+    path: Path,
+    categories: Mapping[str, Iterable[TestSudoku]],
+    board_size: int = BOARD_SIZE,
+) -> None:
+    """Writes the puzzles of each category to a new store file.
+
+    The puzzles are streamed to the file (the answers via a temporary file), so the
+    iterables can be generators over more puzzles than fit in memory. The file is
+    written alongside and moved into place, so readers never see half a store.
+    board_size is the most characters a board can have, e.g. 625 for 25x25 boards."""
+    import shutil
+    import tempfile
+
+    path = Path(path)
+    puzzle_record, answer_record = records(board_size)
+    names = list(categories)
+    for name in names:
+        if len(name.encode()) > MAX_CATEGORY_NAME:
+            raise ValueError(f"Category name {name!r} is too long")
+    table: list[Category] = []
+    puzzle_count = answer_count = 0
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with open(fd, "w+b") as f, tempfile.TemporaryFile() as answers:
+            f.seek(HEADER.size + CATEGORY.size * len(names))
+            for name in names:
+                start = puzzle_count
+                for puzzle in categories[name]:
+                    question = _encode(puzzle.question, board_size)
+                    f.write(
+                        puzzle_record.pack(question, answer_count, len(puzzle.answers))
+                    )
+                    for answer in puzzle.answers:
+                        answers.write(answer_record.pack(_encode(answer, board_size)))
+                    answer_count += len(puzzle.answers)
+                    puzzle_count += 1
+                table.append(Category(start, puzzle_count - start))
+            answers.seek(0)
+            shutil.copyfileobj(answers, f)
+            f.seek(0)
+            f.write(
+                HEADER.pack(
+                    MAGIC, VERSION, board_size, len(names), puzzle_count, answer_count
+                )
+            )
+            for name, category in zip(names, table):
+                f.write(CATEGORY.pack(name.encode(), *category))
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def json_to_store(json_path: Path, store_path: Path) -> None:
+    """Converts a data file in the sudoku_data.json format to a store file, with
+    records big enough for its largest board"""
+    import json
+
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    board_size = max(
+        [
+            len(board)
+            for puzzles in data.values()
+            for puzzle in puzzles
+            for board in (puzzle["question"], *puzzle["answers"])
+        ],
+        default=BOARD_SIZE,
+    )
+    write_store(
+        store_path,
+        {
+            category: (
+                TestSudoku(puzzle["question"], puzzle["answers"]) for puzzle in puzzles
+            )
+            for category, puzzles in data.items()
+        },
+        max(board_size, BOARD_SIZE),
+    )
+
+
+class PuzzleStore:
+    """Reads the puzzles from a store file, which is memory mapped rather than read
+    into memory"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise StoreError(f"{self.path} is not a puzzle store")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _read_header(self) -> None:
+        magic, version = HEADER.unpack_from(self._map)[:2]
+        if magic != MAGIC:
+            raise StoreError(f"{self.path} is not a puzzle store")
+        if version != VERSION:
+            raise StoreError(f"{self.path} is version {version}, not {VERSION}")
+        _, _, self.board_size, category_count, puzzle_count, answer_count = (
+            HEADER.unpack_from(self._map)
+        )
+        self._puzzle_record, self._answer_record = records(self.board_size)
+        self.categories: dict[str, Category] = {}
+        for n in range(category_count):
+            name, start, count = CATEGORY.unpack_from(
+                self._map, HEADER.size + n * CATEGORY.size
+            )
+            self.categories[name.rstrip(b"\0").decode()] = Category(start, count)
+        self._puzzles_offset = HEADER.size + category_count * CATEGORY.size
+        self._answers_offset = (
+            self._puzzles_offset + puzzle_count * self._puzzle_record.size
+        )
+        self.puzzle_count = puzzle_count
+        self.answer_count = answer_count
+        expected_size = self._answers_offset + answer_count * self._answer_record.size
+        if len(self._map) != expected_size:
+            raise StoreError(f"{self.path} is truncated or has extra data")
+
+    def __enter__(self) -> "PuzzleStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self.puzzle_count
+
+    def count(self, category: str) -> int:
+        """Returns the number of puzzles in the category"""
+        return self._category(category).count
+
+    def get(self, category: str, puzzle_id: int) -> TestSudoku:
+        """Returns a puzzle by its position in the category, negative positions
+        count back from the end as for a list"""
+        start, count = self._category(category)
+        if puzzle_id < 0:
+            puzzle_id += count
+        if not 0 <= puzzle_id < count:
+            raise IndexError(f"No puzzle {puzzle_id} in category {category!r}")
+        return self._puzzle(start + puzzle_id)
+
+    def iter_puzzles(self, category: str | None = None) -> Iterator[TestSudoku]:
+        """Yields the puzzles of the category, or of every category, in order"""
+        if category is None:
+            start, count = 0, self.puzzle_count
+        else:
+            start, count = self._category(category)
+        for index in range(start, start + count):
+            yield self._puzzle(index)
+
+    def _category(self, category: str) -> Category:
+        try:
+            return self.categories[category]
+        except KeyError:
+            raise KeyError(f"No category {category!r} in {self.path}") from None
+
+    def _puzzle(self, index: int) -> TestSudoku:
+        question, first_answer, answer_count = self._puzzle_record.unpack_from(
+            self._map, self._puzzles_offset + index * self._puzzle_record.size
+        )
+        board_size = self.board_size
+        offset = self._answers_offset + first_answer * board_size
+        answers = self._map[offset : offset + answer_count * board_size]
+        return TestSudoku(
+            _decode(question),
+            [
+                _decode(answers[i : i + board_size])
+                for i in range(0, len(answers), board_size)
+            ],
+        )
+
+
+def _encode(board: str, board_size: int) -> bytes:
+    """Boards shorter than board_size (e.g. a blank question) are padded with NULs"""
+    encoded = board.encode("ascii")
+    if len(encoded) > board_size or b"\0" in encoded:
+        raise ValueError(f"Boards can have at most {board_size} digits: {board!r}")
+    return encoded
+
+
+def _decode(board: bytes) -> str:
+    return board.rstrip(b"\0").decode("ascii")
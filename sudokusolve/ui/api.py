@@ -17,10 +17,11 @@ class ABCUI(ABC):
         if not value:
             value = self._get_input()
         cleaned_board = self.validator.clean_string(value)
-        if self.validator.validate_input_board(cleaned_board):
-            self._board = cleaned_board
-        else:
+        if not self.validator.validate_input_board(cleaned_board):
             raise ValueError
+        if (problem := self.validator.infeasibility(cleaned_board)) is not None:
+            raise ValueError(problem.message)
+        self._board = cleaned_board
 
     @abstractmethod
     def run(self):
@@ -47,9 +47,16 @@ class AppControls(BoxLayout):
         sudoku_input = "".join(
             [btn.text if btn.text != " " else "0" for btn in sudoku_buttons]
         )
+        if (problem := validator.infeasibility(sudoku_input)) is not None:
+            Popup(
+                title="No solution",
+                content=Label(text=problem.message),
+                size_hint=(0.8, 0.3),
+            ).open()
+            return
 
         solved_boards = solver.solve_sudoku(
-            sudoku_input, validator.validate_solved_board, max_solutions
+            sudoku_input, validator.solution_validator(solver), max_solutions
         )
         for input_num, solve_num, btn in zip(
             sudoku_input, solved_boards[0], sudoku_buttons
@@ -8,6 +8,7 @@ from rich.live import Live
 from rich.panel import Panel
 from rich.theme import Theme
 
+from sudokusolve import rating
 from sudokusolve.ui import rich_functions
 
 theme = Theme(
@@ -25,16 +26,21 @@ def run(input_board: str | None, solver, validator, max_solutions: int = 1):
     if not input_board:
         input_board = _get_input()
     cleaned_input_board = _clean_and_validate(input_board, validator)
-    solved_boards = solver.solve_sudoku(
-        cleaned_input_board, validator.validate_solved_board, max_solutions
+    solved_boards, stats = solver.solve_with_stats(
+        cleaned_input_board, validator.solution_validator(solver), max_solutions
     )
-    _display_animated(cleaned_input_board, solved_boards[0])
+    board_rating = rating.rate_board(cleaned_input_board)
+    _display_animated(cleaned_input_board, solved_boards[0], stats, board_rating)
 
 
 def _clean_and_validate(input_board: str, validator) -> str:
     cleaned_input_board = validator.clean_string(input_board)
     if not validator.validate_input_board(cleaned_input_board):
         raise ValueError("Input board not valid")
+    if len(cleaned_input_board) != 81:
+        raise ValueError("This user interface only displays 9x9 boards")
+    if (problem := validator.infeasibility(cleaned_input_board)) is not None:
+        raise ValueError(problem.message)
     return cleaned_input_board
 
 
@@ -42,7 +48,7 @@ def _get_input() -> str:
     return input("Enter Sudoku board:")
 
 
-def _display_animated(input_board, solved_board) -> None:
+def _display_animated(input_board, solved_board, stats, board_rating) -> None:
     """Display a formatted Sudoku board in the terminal using the rich library"""
     console = Console(theme=theme, height=18, width=28, style="standard")
     layout = Layout()
@@ -95,8 +101,9 @@ def _display_animated(input_board, solved_board) -> None:
 
             # Statistics panel
         statistics = Panel(
-            f"[standard]Speed: [data]{1000*(1):5.1f} [standard]ms\n"
-            f"[standard]Difficulty: [data]{1}[/data]",
+            f"[standard]Speed: [data]{1000*stats.wall_time:5.1f} [standard]ms\n"
+            f"[standard]Difficulty: "
+            f"[data]{board_rating.name} {board_rating.score:.1f}[/data]",
             title="Statistics",
             style="standard",
         )
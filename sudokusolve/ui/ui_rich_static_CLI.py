@@ -4,6 +4,7 @@ from rich.layout import Layout
 from rich.panel import Panel
 from rich.theme import Theme
 
+from sudokusolve import rating
 from sudokusolve.ui import rich_functions
 
 theme = Theme(
@@ -21,16 +22,21 @@ def run(input_board: str | None, solver, validator, max_solutions: int = 1):
     if not input_board:
         input_board = _get_input()
     cleaned_input_board = _clean_and_validate(input_board, validator)
-    solved_boards = solver.solve_sudoku(
-        cleaned_input_board, validator.validate_solved_board, max_solutions
+    solved_boards, stats = solver.solve_with_stats(
+        cleaned_input_board, validator.solution_validator(solver), max_solutions
     )
-    _display_board(cleaned_input_board, solved_boards[0])
+    board_rating = rating.rate_board(cleaned_input_board)
+    _display_board(cleaned_input_board, solved_boards[0], stats, board_rating)
 
 
 def _clean_and_validate(input_board: str, validator) -> str:
     cleaned_input_board = validator.clean_string(input_board)
     if not validator.validate_input_board(cleaned_input_board):
         raise ValueError("Input board not valid")
+    if len(cleaned_input_board) != 81:
+        raise ValueError("This user interface only displays 9x9 boards")
+    if (problem := validator.infeasibility(cleaned_input_board)) is not None:
+        raise ValueError(problem.message)
     return cleaned_input_board
 
 
@@ -38,7 +44,7 @@ def _get_input() -> str:
     return input("Enter Sudoku board:")
 
 
-def _display_board(input_board, solved_board) -> None:
+def _display_board(input_board, solved_board, stats, board_rating) -> None:
     console = Console(theme=theme, height=18, width=30, style="standard")
     layout = Layout()
 
@@ -53,7 +59,8 @@ def _display_board(input_board, solved_board) -> None:
 
     # Statistics panel
     statistics = Panel(
-        f"Speed: [data]{1000*(0):5.1f} [standard]ms\n" f"Difficulty: [data]{0}[/data]",
+        f"Speed: [data]{1000*stats.wall_time:5.1f} [standard]ms\n"
+        f"Difficulty: [data]{board_rating.name} {board_rating.score:.1f}[/data]",
         title="Statistics",
     )
 
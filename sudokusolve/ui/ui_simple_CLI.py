@@ -1,30 +1,37 @@
+from itertools import islice
+from typing import Iterable
+
 MAX_BOARDS_TO_DISPLAY = 5
 
 
 def run(input_board: str | None, solver, validator, max_solutions: int = 1):
     if not input_board:
         input_board = _get_input()
-    cleaned_input_board = _clean_and_validate(input_board, validator)
+    cleaned_input_board = _clean_and_validate(input_board, validator, solver)
     print("Input board:")
     _display_board(cleaned_input_board)
-    solved_boards = solver.solve_sudoku(
-        cleaned_input_board, validator.validate_solved_board, max_solutions
+    solved_boards = solver.iter_solutions(
+        cleaned_input_board, validator.solution_validator(solver)
+    )
+    _display_all_solutions(
+        islice(solved_boards, min(max_solutions, MAX_BOARDS_TO_DISPLAY))
     )
-    _display_all_solutions(solved_boards)
 
 
-def _clean_and_validate(input_board: str, validator) -> str:
+def _clean_and_validate(input_board: str, validator, solver) -> str:
     cleaned_input_board = validator.clean_string(input_board)
     if not validator.validate_input_board(cleaned_input_board):
         raise ValueError("Input board not valid")
+    if not validator.supports_board(solver, cleaned_input_board):
+        raise ValueError("The solver can't solve boards of this size")
+    if (problem := validator.infeasibility(cleaned_input_board)) is not None:
+        raise ValueError(problem.message)
     return cleaned_input_board
 
 
-def _display_all_solutions(solved_boards: list[str]) -> None:
-    number_of_solutions = len(solved_boards)
+def _display_all_solutions(solved_boards: Iterable[str]) -> None:
+    """Displays each board as soon as the solver finds it"""
     for idx, board in enumerate(solved_boards):
-        if idx == min([MAX_BOARDS_TO_DISPLAY, number_of_solutions]):
-            break
         print(f"Solved board {idx + 1}:")
         _display_board(board)
 
@@ -35,13 +42,15 @@ def _get_input() -> str:
 
 def _display_board(board) -> None:
     """Display plain text Sudoku board in terminal"""
+    side = int(len(board) ** 0.5)
+    box = int(side**0.5)
     output = ""
     for idx, num in enumerate(board):
-        if idx % 27 == 0 and idx:  # Blank line after every 3 rows (not before row 0)
+        if idx % (box * side) == 0 and idx:  # Blank line after every box of rows
             output += "\n\n"
-        elif idx % 9 == 0 and idx:  # Newline at end of every row (not before row 0)
+        elif idx % side == 0 and idx:  # Newline at end of every row (not before row 0)
             output += "\n"
-        elif idx % 3 == 0 and idx:  # A space between every 3 numbers (not before row 0)
+        elif idx % box == 0 and idx:  # A space between every box of numbers
             output += " "
         output += num
     output += "\n"
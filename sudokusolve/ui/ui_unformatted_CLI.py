@@ -1,4 +1,6 @@
 import logging
+from itertools import islice
+from typing import Iterable
 
 MAX_BOARDS_TO_DISPLAY = 5
 
@@ -6,26 +8,30 @@ MAX_BOARDS_TO_DISPLAY = 5
 def run(input_board: str | None, solver, validator, max_solutions: int = 1):
     if not input_board:
         raise ValueError("This UI needs to be supplied with a valid board")
-    cleaned_input_board = _clean_and_validate(input_board, validator)
-    solved_boards = solver.solve_sudoku(
-        cleaned_input_board, validator.validate_solved_board, max_solutions
+    cleaned_input_board = _clean_and_validate(input_board, validator, solver)
+    solved_boards = solver.iter_solutions(
+        cleaned_input_board, validator.solution_validator(solver)
+    )
+    _display_all_solutions(
+        islice(solved_boards, min(max_solutions, MAX_BOARDS_TO_DISPLAY))
     )
-    logging.info(f"{solved_boards=}")
-    _display_all_solutions(solved_boards)
 
 
-def _clean_and_validate(input_board: str, validator) -> str:
+def _clean_and_validate(input_board: str, validator, solver) -> str:
     cleaned_input_board = validator.clean_string(input_board)
     if not validator.validate_input_board(cleaned_input_board):
         raise ValueError("Input board not valid")
+    if not validator.supports_board(solver, cleaned_input_board):
+        raise ValueError("The solver can't solve boards of this size")
+    if (problem := validator.infeasibility(cleaned_input_board)) is not None:
+        raise ValueError(problem.message)
     return cleaned_input_board
 
 
-def _display_all_solutions(solved_boards: list[str]) -> None:
-    number_of_solutions = len(solved_boards)
-    for idx, board in enumerate(solved_boards):
-        if idx == min([MAX_BOARDS_TO_DISPLAY, number_of_solutions]):
-            break
+def _display_all_solutions(solved_boards: Iterable[str]) -> None:
+    """Displays each board as soon as the solver finds it"""
+    for board in solved_boards:
+        logging.info(f"{board=}")
         _display_board(board)
 
 
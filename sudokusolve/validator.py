@@ -3,7 +3,9 @@
 Functions to check that both input and solved Sudoku boards supplied
 as strings are valid, e.g. correct length, only valid digits present,
 and that there is exactly one of each digit in each row, column and square
-for solved boards and no more than one for an input board (except for "0")
+for solved boards and no more than one for an input board (except for "0").
+Boards can be 9x9, 16x16 or 25x25, with the digits above 9 written as letters (see
+geometry.py).
 
 Typical usage example:
 
@@ -12,73 +14,172 @@ Typical usage example:
 
     if validate_solved_board(my_solved_board):
         do other stuff
+
+    if (problem := infeasibility(my_input_board)) is not None:
+        print(problem.message)
+
+Both checks take a single pass over the board: each (position, digit) is looked up
+in a precomputed table of the digit's bit in the 27 units the position is in, and
+the bits are added together. The units are 12 bits apart so they can't carry into
+each other, and a unit holds 9 different digits exactly when its 9 bits add up to
+0b111111111. Larger boards have their own tables with wider units, built the first
+time a board of that size is checked.
+
+A valid input board can still have no solution, infeasibility looks for the reason
+without searching (see solver/feasibility.py).
 """
 
-from typing import Callable
+from functools import cache, reduce
+from operator import getitem, or_
+from typing import Any, Callable, NamedTuple
+
+from sudokusolve.solver import feasibility
+from sudokusolve.solver.geometry import SIZES, Geometry, geometry
 
 DIGITS_1_TO_9 = {str(n) for n in range(1, 10)}
 DIGITS_0_TO_9 = {str(n) for n in range(10)}
 
 
-def validate_input_board(board: str) -> bool:
-    """Check that input board is valid."""
-
-    # Need to check that the string is the correct length and valid first,
-    # or get an index error when the `_get_all_*` functions in the arguments are
-    # evaluated. Also why need to carry out lazy evaluation in a generator...
-    return all(
-        func(*args)
-        for func, args in [
-            (_correct_number_of_digits, (board,)),
-            (_only_digits_0_9, (board,)),
-            (_digits_present_only_once, (board, _get_all_rows)),
-            (_digits_present_only_once, (board, _get_all_columns)),
-            (_digits_present_only_once, (board, _get_all_squares)),
-        ]
+class UnitTables(NamedTuple):
+    """unit_bits[position][digit]: the digit's bit in each unit the position is in
+    all_units_complete: the sum of the bits when every unit has every digit"""
+
+    unit_bits: tuple[dict[str, int], ...]
+    all_units_complete: int
+
+
+def unit_tables(geo: Geometry) -> UnitTables:
+    """Builds the tables for boards of the geometry's size"""
+    # a unit can hold side copies of its top digit bit, which must not carry over
+    width = geo.side + geo.side.bit_length() - 1
+    side = geo.side
+    unit_bits = tuple(
+        {
+            # the units are the rows, then the columns, then the squares
+            digit: sum(
+                bit << (width * unit_index)
+                for unit_index in (
+                    geo.row_of[pos],
+                    side + geo.col_of[pos],
+                    2 * side + geo.sqr_of[pos],
+                )
+            )
+            for digit, bit in geo.digit_bits.items()
+        }
+        for pos in range(geo.cells)
     )
+    all_units_complete = sum(
+        geo.all_digits << (width * n) for n in range(len(geo.units))
+    )
+    return UnitTables(unit_bits, all_units_complete)
+
+
+UNIT_BITS, ALL_UNITS_COMPLETE = unit_tables(geometry(9))
+
+
+@cache
+def _tables_for_length(length: int) -> UnitTables | None:
+    side = int(length**0.5)
+    if side * side != length or side not in SIZES:
+        return None
+    return unit_tables(geometry(side))
+
+
+def validate_input_board(board: str) -> bool:
+    """Check that input board is valid: 81 digits 0-9 (or 256 or 625 digits 0-9 and
+    A-G or A-P), with no digit other than 0 more than once in a row, column or
+    square."""
+    if len(board) == 81:
+        table = UNIT_BITS
+    elif tables := _tables_for_length(len(board)):
+        table = tables.unit_bits
+    else:
+        return False
+    try:
+        unit_bits = list(map(getitem, table, board))
+    except KeyError:
+        return False
+    # the bits only add up to the same as they OR to if no unit has a digit twice
+    return sum(unit_bits) == reduce(or_, unit_bits)
+
+
+def infeasibility(board: str) -> feasibility.Infeasibility | None:
+    """Returns the reason the valid input board has no solution if propagating its
+    digits finds one, or None. The reason's message is for the user interfaces to
+    show."""
+    return feasibility.check_board(board)
 
 
 def validate_solved_board(board: str) -> bool:
     """Checks whether solved sudoku board is valid.
 
-    Board must have 81 digits, exactly one of each digit in each row, column and square.
-    Needs lazy evaluation in generator as early evalution of
-    _get_all_* functions will lead to index error if
-    _correct_number_of_digits not evaluated first.
+    Board must have 81 digits (or 256 or 625), exactly one of each digit in each
+    row, column and square.
     """
-    return all(
-        func(*args)
-        for func, args in [
-            (_correct_number_of_digits, (board,)),
-            (_all_digits_present, (board, _get_all_rows)),
-            (_all_digits_present, (board, _get_all_columns)),
-            (_all_digits_present, (board, _get_all_squares)),
-        ]
-    )
+    if len(board) == 81:
+        table, complete = UNIT_BITS, ALL_UNITS_COMPLETE
+    elif tables := _tables_for_length(len(board)):
+        table, complete = tables
+    else:
+        return False
+    try:
+        return sum(map(getitem, table, board)) == complete
+    except KeyError:
+        return False
+
+
+def accept_all(board: str) -> bool:
+    """A completed board validator for solvers that don't need one"""
+    return True
+
+
+def solution_validator(solver: Any) -> Callable[[str], bool]:
+    """Returns the completed board validator to pass to the solver plugin.
 
+    Solvers whose solutions are correct by construction (they set
+    correct_by_construction) don't need their solutions checked again, so get
+    accept_all, the rest get validate_solved_board."""
+    if getattr(solver, "correct_by_construction", False):
+        return accept_all
+    return validate_solved_board
 
-def clean_string(board_string: str) -> str:
+
+def supports_board(solver: Any, board: str) -> bool:
+    """Returns True if the solver plugin can solve boards of the board's size, as
+    given by its board_sides (solvers without one only solve 9x9 boards)"""
+    return _geometry(board).side in getattr(solver, "board_sides", (9,))
+
+
+def clean_string(board_string: str, side: int | None = None) -> str:
     """Reformats a text string as a valid board definition
     - removes any characters that are not digits 0-9
+    - for boards of side 16 or 25, keeps the letters of their digits too (in upper
+      case). Without a side, letters are only kept if that leaves a whole board.
     """
-    return "".join([n for n in board_string if n in DIGITS_0_TO_9])
+    if side is None:
+        cleaned = clean_string(board_string, 9)
+        if len(cleaned) != 81:
+            for larger_side in SIZES[1:]:
+                larger = clean_string(board_string, larger_side)
+                if len(larger) == larger_side * larger_side:
+                    return larger
+        return cleaned
+    if side == 9:
+        return "".join([n for n in board_string if n in DIGITS_0_TO_9])
+    symbols = geometry(side).digit_bits
+    return "".join([n for n in board_string.upper() if n in symbols])
 
 
 def _get_all_rows(board):
-    return [board[i : i + 9] for i in range(0, 81, 9)]
+    return ["".join(board[pos] for pos in row) for row in _geometry(board).rows]
 
 
 def _get_all_columns(board):
-    return [board[i::9] for i in range(9)]
+    return ["".join(board[pos] for pos in col) for col in _geometry(board).cols]
 
 
 def _get_all_squares(board):
-    offsets = (0, 1, 2, 9, 10, 11, 18, 19, 20)
-    squares = []
-    for a in range(0, 81, 27):
-        for b in range(0, 9, 3):
-            squares.append("".join([board[a + b + o] for o in offsets]))
-    return squares
+    return ["".join(board[pos] for pos in sqr) for sqr in _geometry(board).sqrs]
 
 
 def _only_digits_0_9(board) -> bool:
@@ -86,13 +187,22 @@ def _only_digits_0_9(board) -> bool:
 
 
 def _correct_number_of_digits(board) -> bool:
-    return len(board) == 81
+    return _tables_for_length(len(board)) is not None
 
 
 def _all_digits_present(board: str, get_rcs: Callable[[str], list[str]]) -> bool:
     """get_rcs: accepts a function that returns a list of digits as strings"""
-    return all(set(list(rcs)) == DIGITS_1_TO_9 for rcs in get_rcs(board))
+    digits = set(_geometry(board).digits)
+    return all(set(list(rcs)) == digits for rcs in get_rcs(board))
 
 
 def _digits_present_only_once(board: str, get_rcs: Callable[[str], list[str]]) -> bool:
-    return all(rcs.count(d) < 2 for rcs in get_rcs(board) for d in DIGITS_1_TO_9)
+    return all(
+        rcs.count(d) < 2 for rcs in get_rcs(board) for d in _geometry(board).digits
+    )
+
+
+def _geometry(board: str) -> Geometry:
+    """The geometry of a board of a supported size, or of a 9x9 board otherwise"""
+    side = int(len(board) ** 0.5)
+    return geometry(side if side * side == len(board) and side in SIZES else 9)
@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from sudokusolve import data, validator
+from sudokusolve.solver import feasibility, solver_bitmask, solver_dlx, variants
+from sudokusolve.solver.geometry import NINE
+
+SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
+STANDARD_VALID_SOLVED = SINGLE_SOLUTION_PUZZLES[0].answers[0]
+# a hidden single puts 9 in square 3, which leaves nothing for row 1, column 9
+HIDDEN_CONTRADICTION = "123456780" + "00000000" + "9" + "0" * 63
+# no solution, but propagation finds nothing: only a search can tell
+IMPOSSIBLE_BOARD = (
+    "000005080000601043000000000010500000000106000300000005530000061000000004000000000"
+)
+
+
+@pytest.mark.parametrize(
+    "puzzle", SINGLE_SOLUTION_PUZZLES, ids=lambda puzzle: puzzle.question[:9]
+)
+def test_solvable_boards_pass(puzzle):
+    assert feasibility.check_board(puzzle.question, require_unique=True) is None
+
+
+@pytest.mark.parametrize(
+    "board, reason, message, positions",
+    [
+        ("11" + "0" * 79, "duplicate_digit", "The digit 1 is in row 1 twice", (0, 1)),
+        (
+            "123456780" + "0" * 71 + "9",
+            "no_candidates",
+            "No digit can go in row 1, column 9",
+            (8,),
+        ),
+        (
+            HIDDEN_CONTRADICTION,
+            "no_candidates",
+            "No digit can go in row 1, column 9",
+            (8,),
+        ),
+        (
+            # the 9s in row 2 and row 4 leave the 9 of row 1 nowhere to go
+            "123450000" + "000000900" + "0" * 9 + "000009000" + "0" * 45,
+            "digit_has_no_place",
+            "The digit 9 can't go anywhere in row 1",
+            NINE.rows[0],
+        ),
+    ],
+)
+def test_reasons(board, reason, message, positions):
+    assert feasibility.check_board(board) == (reason, message, positions)
+    assert reason in feasibility.REASONS
+    assert solver_bitmask.count_solutions(board, 1) == 0
+
+
+def test_propagation_finds_most_contradictions():
+    """Boards made unsolvable by changing one given digit of a puzzle"""
+    rng = random.Random(3)
+    found = []
+    while len(found) < 20:
+        givens = rng.sample(range(81), 30)
+        board = [
+            STANDARD_VALID_SOLVED[pos] if pos in givens else "0" for pos in range(81)
+        ]
+        board[givens[0]] = rng.choice("123456789")
+        board = "".join(board)
+        if validator.validate_input_board(board):
+            if solver_bitmask.count_solutions(board, 1) == 0:
+                found.append(board)
+    assert all(feasibility.check_board(board) for board in found)
+
+
+def test_search_still_needed():
+    assert feasibility.check_board(IMPOSSIBLE_BOARD) is None
+
+
+def test_require_unique():
+    board = SINGLE_SOLUTION_PUZZLES[0].question
+    assert feasibility.check_board("0" * 81) is None
+    problem = feasibility.check_board("0" * 81, require_unique=True)
+    assert problem.reason == "too_few_clues"
+    # 7 different digits, any solution has another with the 2 missing digits swapped
+    fewer_digits = "".join("0" if num in "89" else num for num in STANDARD_VALID_SOLVED)
+    problem = feasibility.check_board(fewer_digits, require_unique=True)
+    assert problem.reason == "too_few_digits"
+    assert not solver_dlx.is_unique(fewer_digits)
+    assert solver_dlx.is_unique(board)
+
+
+def test_variant_units():
+    geo = variants.compile_geometry(9, ["diagonal"])
+    board = "1" + "0" * 79 + "1"
+    assert feasibility.check_board(board) is None
+    problem = feasibility.check_board(board, geo)
+    assert problem.message == "The digit 1 is in region 1 twice"
+    # fewer than 17 givens can be enough with the extra units
+    board = "123456789" + "0" * 72
+    assert feasibility.check_board(board, geo, require_unique=True) is None
+    assert feasibility.check_board(board, require_unique=True).reason == "too_few_clues"
+
+
+def test_large_boards():
+    large = data.sudoku_puzzles("single_solution_puzzles_16x16")[0].question
+    assert feasibility.check_board(large, require_unique=True) is None
+    board = "123456789ABCDEF0" + "0" * 239 + "G"
+    problem = feasibility.check_board(board)
+    assert problem.message == "No digit can go in row 1, column 16"
+
+
+def test_validator_infeasibility():
+    assert validator.infeasibility(SINGLE_SOLUTION_PUZZLES[0].question) is None
+    assert validator.infeasibility(HIDDEN_CONTRADICTION).reason == "no_candidates"
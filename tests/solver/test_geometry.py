@@ -0,0 +1,33 @@
+import pytest
+
+from sudokusolve.solver import geometry
+
+
+@pytest.mark.parametrize("side", geometry.SIZES)
+def test_geometry_tables(side):
+    geo = geometry.geometry(side)
+    assert geo.cells == side * side
+    assert len(geo.units) == 3 * side
+    for unit in geo.units:
+        assert len(unit) == side
+    for pos in range(geo.cells):
+        assert pos in geo.rows[geo.row_of[pos]]
+        assert pos in geo.cols[geo.col_of[pos]]
+        assert pos in geo.sqrs[geo.sqr_of[pos]]
+        assert len(geo.peers[pos]) == 3 * side - 2 * geo.box - 1
+    assert len(geo.digit_bits) == side + 1
+    assert geo.all_digits == sum(geo.bit_digits)
+
+
+def test_nine_by_nine_constants():
+    assert geometry.SQRS[1] == (3, 4, 5, 12, 13, 14, 21, 22, 23)
+    assert len(geometry.PEERS[0]) == 20
+    assert geometry.geometry(9) is geometry.NINE
+
+
+def test_board_geometry():
+    assert geometry.board_geometry("0" * 256).side == 16
+    with pytest.raises(ValueError):
+        geometry.board_geometry("0" * 80)
+    with pytest.raises(ValueError):
+        geometry.board_geometry("0" * 36)
@@ -1,16 +1,50 @@
+import itertools
+import threading
+import time
+
 import pytest
 from sudokusolve import data, validator
 
-from sudokusolve.solver import solver_python_gen, solver_python_sets
+from sudokusolve.solver import (
+    api,
+    solver_bitmask,
+    solver_dlx,
+    solver_parallel,
+    solver_python_gen,
+    solver_python_incremental,
+    solver_python_sets,
+    solver_sat,
+)
 
 SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
 STANDARD_VALID_INPUT = SINGLE_SOLUTION_PUZZLES[0].question
 STANDARD_VALID_SOLVED = SINGLE_SOLUTION_PUZZLES[0].answers[0]
+# no solution, which takes a long search to find without clause learning
+IMPOSSIBLE_BOARD = (
+    "000005080000601043000000000010500000000106000300000005530000061000000004000000000"
+)
+
+
+SOLVERS = [
+    solver_python_gen,
+    solver_python_sets.SudokuSolver(),
+    solver_python_incremental,
+    solver_bitmask.SudokuSolver(),
+    solver_dlx.SudokuSolver(),
+    solver_parallel.SudokuSolver(workers=2),
+    solver_sat.SudokuSolver(),
+]
 
 
-@pytest.fixture(params=[solver_python_gen, solver_python_sets.SudokuSolver()])
-def solver(request):
-    return request.param.solve_sudoku
+@pytest.fixture(params=SOLVERS)
+def solver_plugin(request):
+    return request.param
+
+
+@pytest.fixture
+def solver(solver_plugin):
+    return solver_plugin.solve_sudoku
+
 
 @pytest.fixture
 def completed_board_validator():
@@ -69,9 +103,218 @@ def test_solve_sudoku_multiple_answers(
     input_board = puzzle.question
     expected_answers = puzzle.answers
     # Test with the built in validator and max_solution set to 2
-    answers = solver(
-        input_board, completed_board_validator, len(expected_answers) + 1
-    )
+    answers = solver(input_board, completed_board_validator, len(expected_answers) + 1)
     assert len(answers) == len(expected_answers)
     assert all(expected_answer in answers for expected_answer in expected_answers)
     assert all(answer in expected_answers for answer in answers)
+
+
+def test_iter_solutions(solver_plugin, completed_board_validator):
+    puzzle = data.multiple_solution_puzzles()[0]
+    solutions = solver_plugin.iter_solutions(puzzle.question, completed_board_validator)
+    assert next(solutions) in puzzle.answers
+    assert len(list(solutions)) == len(puzzle.answers) - 1
+    assert sorted(solver_plugin.iter_solutions(puzzle.question)) == sorted(
+        puzzle.answers
+    )
+
+
+@pytest.mark.parametrize("puzzle_number", [4, 5])
+def test_iter_solutions_default_validator(puzzle_number, solver_plugin):
+    puzzle = SINGLE_SOLUTION_PUZZLES[puzzle_number]
+    assert list(solver_plugin.iter_solutions(puzzle.question)) == puzzle.answers
+
+
+def test_iter_solutions_is_lazy(solver_plugin):
+    # the empty board has billions of solutions, so this only finishes if the
+    # search is suspended after the first one
+    solutions = solver_plugin.iter_solutions("0" * 81)
+    assert validator.validate_solved_board(next(solutions))
+    solutions.close()
+
+
+def test_correct_by_construction(solver_plugin):
+    if not getattr(solver_plugin, "correct_by_construction", False):
+        pytest.skip("solver relies on the completed board validator")
+    for puzzle in data.multiple_solution_puzzles():
+        for solution in solver_plugin.iter_solutions(puzzle.question):
+            assert validator.validate_solved_board(solution)
+    empty_board_solutions = solver_plugin.iter_solutions("0" * 81)
+    for solution in itertools.islice(empty_board_solutions, 50):
+        assert validator.validate_solved_board(solution)
+    empty_board_solutions.close()
+
+
+@pytest.mark.parametrize("puzzle_number", [0, 3, 4, 5, 6])
+def test_count_solutions_single(puzzle_number, solver_plugin):
+    input_board = SINGLE_SOLUTION_PUZZLES[puzzle_number].question
+    assert solver_plugin.count_solutions(input_board, 5) == 1
+    assert solver_plugin.is_unique(input_board)
+
+
+def test_count_solutions_multiple(solver_plugin):
+    puzzle = data.multiple_solution_puzzles()[0]
+    number_of_answers = len(puzzle.answers)
+    assert solver_plugin.count_solutions(puzzle.question, 100) == number_of_answers
+    assert solver_plugin.count_solutions(puzzle.question, 1) == 1
+    assert not solver_plugin.is_unique(puzzle.question)
+
+
+def test_count_solutions_unsolvable(solver_plugin):
+    board = "5" + STANDARD_VALID_INPUT[1:]
+    assert solver_plugin.count_solutions(board, 2) == 0
+    assert not solver_plugin.is_unique(board)
+
+
+@pytest.mark.parametrize("puzzle_number", [0, 4])
+def test_solve_with_stats(puzzle_number, solver_plugin, completed_board_validator):
+    puzzle = SINGLE_SOLUTION_PUZZLES[puzzle_number]
+    solutions, stats = solver_plugin.solve_with_stats(
+        puzzle.question, completed_board_validator, 2
+    )
+    assert solutions == puzzle.answers
+    assert stats.wall_time > 0
+    assert stats.backtracks <= stats.nodes
+
+
+def test_solve_within_budget(solver_plugin, completed_board_validator):
+    puzzle = SINGLE_SOLUTION_PUZZLES[4]
+    solutions, stats, exceeded = solver_plugin.solve_within(
+        puzzle.question, completed_board_validator, 2, api.Budget.within(60)
+    )
+    assert solutions == puzzle.answers
+    assert exceeded is None
+    assert stats.wall_time > 0
+
+
+def test_solve_within_deadline(solver_plugin, completed_board_validator):
+    """Enumerating every solution of the empty board never finishes"""
+    solutions, _, exceeded = solver_plugin.solve_within(
+        "0" * 81, completed_board_validator, 10**9, api.Budget.within(0.2)
+    )
+    assert exceeded == "deadline"
+    assert len(set(solutions)) == len(solutions)
+    assert all(map(validator.validate_solved_board, solutions))
+
+
+def test_solve_within_deadline_no_solution(solver_plugin, completed_board_validator):
+    """The budget is spent inside the search, not just between solutions"""
+    start = time.monotonic()
+    solutions, _, exceeded = solver_plugin.solve_within(
+        IMPOSSIBLE_BOARD, completed_board_validator, 1, api.Budget.within(0.5)
+    )
+    assert time.monotonic() - start < 5
+    assert solutions == []
+    # the SAT and DLX solvers may prove there's no solution before the deadline
+    assert exceeded in ("deadline", None)
+
+
+def test_solve_within_cancelled(solver_plugin, completed_board_validator):
+    cancel = threading.Event()
+    cancel.set()
+    result = solver_plugin.solve_within(
+        STANDARD_VALID_INPUT, completed_board_validator, 1, api.Budget(cancel=cancel)
+    )
+    assert result.solutions == []
+    assert result.exceeded == "cancelled"
+
+
+@pytest.mark.parametrize(
+    "searching_solver", [solver_bitmask, solver_dlx, solver_parallel, solver_sat]
+)
+def test_solve_within_node_budget(searching_solver, completed_board_validator):
+    budget = api.Budget(max_nodes=500)
+    solutions, _, exceeded = searching_solver.solve_within(
+        "0" * 81, completed_board_validator, 10**9, budget
+    )
+    assert exceeded == "nodes"
+    assert 0 < len(solutions) < 500
+    assert 500 <= budget.nodes < 600
+
+
+def test_budgeted_solver():
+    solver = api.BudgetedSolver(solver_dlx, max_nodes=100)
+    solutions = solver.solve_sudoku("0" * 81, validator.validate_solved_board, 10**9)
+    assert solutions
+    assert solver.exceeded == "nodes"
+    solutions = solver.solve_sudoku(
+        STANDARD_VALID_INPUT, validator.validate_solved_board, 1
+    )
+    assert solutions == [STANDARD_VALID_SOLVED]
+    assert solver.exceeded is None
+    assert solver.correct_by_construction
+
+
+def test_solve_with_stats_counts_search():
+    puzzle = SINGLE_SOLUTION_PUZZLES[4]
+    _, stats = solver_bitmask.solve_with_stats(puzzle.question, lambda _: True, 1)
+    assert stats.nodes > 1
+    assert stats.guesses >= stats.nodes - 1
+    assert stats.max_depth > 0
+    assert stats.singles["naked_singles"] > 0
+    assert stats.singles["hidden_singles"] > 0
+    _, easy_stats = solver_bitmask.solve_with_stats(
+        SINGLE_SOLUTION_PUZZLES[0].question, lambda _: True, 1
+    )
+    assert easy_stats.nodes == 1
+    assert easy_stats.guesses == 0
+    assert sum(easy_stats.singles.values()) == SINGLE_SOLUTION_PUZZLES[
+        0
+    ].question.count("0")
+
+
+LARGE_PUZZLES = [
+    *data.sudoku_puzzles("single_solution_puzzles_16x16"),
+    *data.sudoku_puzzles("single_solution_puzzles_25x25"),
+]
+LARGE_BOARD_SOLVERS = [
+    solver for solver in SOLVERS if 16 in getattr(solver, "board_sides", ())
+]
+
+
+@pytest.mark.parametrize("puzzle", LARGE_PUZZLES, ids=lambda p: f"{len(p.question)}")
+@pytest.mark.parametrize("large_solver", LARGE_BOARD_SOLVERS)
+def test_solve_large_boards(puzzle, large_solver, completed_board_validator):
+    assert (
+        large_solver.solve_sudoku(puzzle.question, completed_board_validator, 2)
+        == puzzle.answers
+    )
+
+
+@pytest.mark.parametrize("large_solver", LARGE_BOARD_SOLVERS)
+def test_count_solutions_large_boards(large_solver):
+    answer = LARGE_PUZZLES[0].answers[0]
+    assert large_solver.count_solutions("0" * 16 + answer[16:], 2) == 1
+    assert large_solver.count_solutions("0" * 256, 2) == 2
+    assert large_solver.count_solutions("1" * 16 + answer[16:], 2) == 0
+
+
+def test_python_gen_is_unique_checks_feasibility(monkeypatch):
+    """Boards with fewer than 17 givens can't be unique, so aren't searched"""
+
+    def count_solutions(board, limit):
+        raise AssertionError("searched")
+
+    monkeypatch.setattr(solver_python_gen, "count_solutions", count_solutions)
+    assert not solver_python_gen.is_unique("123456789" + "0" * 72)
+
+
+@pytest.mark.parametrize("puzzle_number", [4, 5])
+def test_python_gen_completes_only_valid_grids(puzzle_number):
+    """Conflicting singles prune the branch rather than completing an invalid grid"""
+    puzzle = SINGLE_SOLUTION_PUZZLES[puzzle_number]
+    solutions = solver_python_gen.iter_solutions(puzzle.question, validator.accept_all)
+    assert list(solutions) == puzzle.answers
+
+
+def test_python_gen_merge_substitutions():
+    board = solver_python_gen.to_board("0" * 81)
+    available = [frozenset(range(1, 10))] * 81
+    # positions 0 and 1 both have 5 as their only number, in the same row
+    available[0] = available[1] = frozenset((5,))
+    assert solver_python_gen.merge_substitutions(board, tuple(available)) is None
+    available[1] = frozenset((6,))
+    assert solver_python_gen.merge_substitutions(board, tuple(available)) == {
+        0: 5,
+        1: 6,
+    }
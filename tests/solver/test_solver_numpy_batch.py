@@ -0,0 +1,78 @@
+import pytest
+
+from sudokusolve import data, validator
+from sudokusolve.solver import api, solver_python_sets
+
+np = pytest.importorskip("numpy")
+solver_numpy_batch = pytest.importorskip("sudokusolve.solver.solver_numpy_batch")
+
+SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
+STANDARD_VALID_INPUT = SINGLE_SOLUTION_PUZZLES[0].question
+STANDARD_VALID_SOLVED = SINGLE_SOLUTION_PUZZLES[0].answers[0]
+# no solution, but propagation finds nothing: only a search can tell
+IMPOSSIBLE_BOARD = (
+    "000005080000601043000000000010500000000106000300000005530000061000000004000000000"
+)
+
+
+def test_solve_many_matches_sudoku_solver():
+    boards = [puzzle.question for puzzle in SINGLE_SOLUTION_PUZZLES]
+    expected = [
+        solver_python_sets.SudokuSolver().solve_sudoku(
+            board, validator.validate_solved_board, 2
+        )
+        for board in boards
+    ]
+    answers = solver_numpy_batch.solve_many(
+        boards, validator.validate_solved_board, 2, chunksize=3
+    )
+    assert answers == expected
+
+
+def test_solve_many_multiple_solutions():
+    puzzle = data.multiple_solution_puzzles()[0]
+    answers = solver_numpy_batch.solve_many([puzzle.question], max_solutions=10)[0]
+    assert sorted(answers) == sorted(puzzle.answers)
+
+
+def test_solve_many_unsolvable_board():
+    board = "11" + STANDARD_VALID_INPUT[2:]
+    assert solver_numpy_batch.solve_many([board, STANDARD_VALID_INPUT]) == [
+        [],
+        [STANDARD_VALID_SOLVED],
+    ]
+
+
+def test_candidates():
+    grids = solver_numpy_batch.boards_to_array([STANDARD_VALID_INPUT])
+    available = solver_numpy_batch.candidates(grids)
+    assert available.shape == (1, 81, 9)
+    # position 0 can only be 4 or 5
+    assert np.flatnonzero(available[0, 0]).tolist() == [3, 4]
+    assert not available[0, 2].any()
+
+
+def test_propagate_solves_easy_board():
+    grids = solver_numpy_batch.boards_to_array([STANDARD_VALID_INPUT])
+    failed = solver_numpy_batch.propagate(grids)
+    assert not failed.any()
+    assert solver_numpy_batch.array_to_boards(grids) == [STANDARD_VALID_SOLVED]
+
+
+def test_iter_solutions():
+    solutions = solver_numpy_batch.iter_solutions(STANDARD_VALID_INPUT)
+    assert list(solutions) == [STANDARD_VALID_SOLVED]
+    assert list(solver_numpy_batch.iter_solutions("11" + "0" * 79)) == []
+
+
+def test_solve_within_deadline_no_solution():
+    solutions, _, exceeded = solver_numpy_batch.solve_within(
+        IMPOSSIBLE_BOARD, validator.validate_solved_board, 1, api.Budget.within(0.5)
+    )
+    assert solutions == []
+    assert exceeded == "deadline"
+    result = solver_numpy_batch.solve_within(
+        "11" + "0" * 79, validator.validate_solved_board, 1, api.Budget.within(0.5)
+    )
+    assert result.solutions == []
+    assert result.exceeded is None
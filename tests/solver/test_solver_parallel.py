@@ -0,0 +1,75 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from sudokusolve import data, validator
+from sudokusolve.solver import api, solver_bitmask, solver_parallel
+
+HARD_PUZZLE = data.valid_sudoku_puzzles()[4]
+EMPTY_BOARD = "0" * 81
+
+
+def test_split_covers_the_search_tree():
+    stats = api.SolveStats()
+    solved, subtrees = solver_parallel.split(HARD_PUZZLE.question, 8, stats)
+    assert len(subtrees) >= 8 or solved
+    assert stats.nodes > 1
+    solutions = solved + [
+        solution
+        for subtree_board, _ in subtrees
+        for solution in solver_parallel.iter_subtree(subtree_board)
+    ]
+    assert solutions == HARD_PUZZLE.answers
+
+
+def test_split_unsolvable_board():
+    stats = api.SolveStats()
+    assert solver_parallel.split("11" + "0" * 79, 8, stats) == ([], [])
+    assert stats.backtracks == 1
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_enumerates_disjoint_solutions(workers):
+    solver = solver_parallel.SudokuSolver(workers=workers)
+    solutions = solver.solve_sudoku(EMPTY_BOARD, validator.validate_solved_board, 50)
+    assert len(solutions) == 50
+    assert len(set(solutions)) == 50
+    assert all(validator.validate_solved_board(s) for s in solutions)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_first_solution(workers):
+    solver = solver_parallel.SudokuSolver(workers=workers, subtrees_per_worker=8)
+    solutions, stats = solver.solve_with_stats(EMPTY_BOARD, lambda _: True, 1)
+    assert len(solutions) == 1
+    assert validator.validate_solved_board(solutions[0])
+    assert stats.max_depth > 0
+
+
+def test_search_stops_when_cancelled():
+    cancel = threading.Event()
+    cancel.set()
+    grids = solver_bitmask.search(EMPTY_BOARD, cancel=cancel)
+    count = sum(1 for _ in grids)
+    assert count < solver_bitmask.CANCEL_CHECK_NODES
+
+
+def test_iter_solutions_stops_workers_when_closed():
+    solutions = solver_parallel.SudokuSolver(workers=2).iter_solutions(EMPTY_BOARD)
+    first = list(itertools.islice(solutions, 20))
+    solutions.close()
+    assert len(set(first)) == 20
+
+
+def test_workers_share_the_node_budget():
+    budget = api.Budget.within(60, max_nodes=500)
+    start = time.monotonic()
+    solutions, _, exceeded = solver_parallel.SudokuSolver(workers=2).solve_within(
+        EMPTY_BOARD, validator.accept_all, 10**9, budget
+    )
+    assert time.monotonic() - start < 30
+    assert exceeded == "nodes"
+    assert 0 < len(solutions) < 500
+    assert 500 <= budget.nodes < 500 + 4 * solver_bitmask.CANCEL_CHECK_NODES
@@ -82,3 +82,40 @@ def test_get_sqr(position, expected_answer, solver):
     answer = solver.get_sqr(position)
     assert answer == DIGITS_1_9
 
+
+def test_incremental_undo_restores_state():
+    solver = solver_python_sets.IncrementalSudokuSolver()
+    solver.board = list(STANDARD_VALID_INPUT)
+    assert solver.initialise_candidates()
+    board = solver.board.copy()
+    candidates = [available.copy() for available in solver.candidates]
+    units = [[pos.copy() for pos in unit] for unit in solver.available_pos_units]
+    position = STANDARD_VALID_INPUT.index("0")
+    assert solver.place(position, STANDARD_VALID_SOLVED[position])
+    assert solver.board != board
+    solver.undo(0)
+    assert solver.board == board
+    assert solver.candidates == candidates
+    assert solver.available_pos_units == units
+
+
+def test_incremental_place_updates_peers():
+    solver = solver_python_sets.IncrementalSudokuSolver()
+    solver.board = list(STANDARD_VALID_INPUT)
+    assert solver.initialise_candidates()
+    position = STANDARD_VALID_INPUT.index("0")
+    num = STANDARD_VALID_SOLVED[position]
+    assert solver.place(position, num)
+    assert all(
+        num not in solver.candidates[peer]
+        for peer in solver_python_sets.PEERS[position]
+    )
+    for unit in solver.get_unit_indexes(position):
+        assert not solver.available_pos_units[unit][int(num)]
+
+
+def test_incremental_rejects_duplicate_givens():
+    solver = solver_python_sets.IncrementalSudokuSolver()
+    solver.board = list("11" + "0" * 79)
+    assert not solver.initialise_candidates()
+    assert list(solver.iter_solutions("11" + "0" * 79)) == []
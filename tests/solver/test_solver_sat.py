@@ -0,0 +1,83 @@
+import itertools
+
+from sudokusolve import validator
+from sudokusolve.solver import cdcl, solver_bitmask, solver_sat
+from sudokusolve.solver.geometry import NINE
+
+# no solution, which the backtracking solvers take a very long time to find out
+IMPOSSIBLE_BOARD = (
+    "000005080000601043000000000010500000000106000300000005530000061000000004000000000"
+)
+
+
+def pigeonhole(holes: int) -> list[list[int]]:
+    """holes + 1 pigeons in holes holes, variable p * holes + h + 1 is pigeon p in
+    hole h"""
+    pigeons = range(holes + 1)
+    clauses = [[p * holes + h + 1 for h in range(holes)] for p in pigeons]
+    for h in range(holes):
+        for p, q in itertools.combinations(pigeons, 2):
+            clauses.append([-(p * holes + h + 1), -(q * holes + h + 1)])
+    return clauses
+
+
+def test_luby():
+    assert [cdcl.luby(n) for n in range(1, 16)] == [
+        1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8
+    ]  # fmt: skip
+
+
+def test_unsatisfiable():
+    sat = cdcl.Solver(30)
+    for clause in pigeonhole(5):
+        sat.add_clause(clause)
+    assert sat.solve() is False
+    assert sat.conflicts > 0
+
+
+def test_enumerate_with_blocking_clauses():
+    """Exactly one of 4 variables is true: 4 models"""
+    sat = cdcl.Solver(4)
+    sat.add_clause([1, 2, 3, 4])
+    for a, b in itertools.combinations(range(1, 5), 2):
+        sat.add_clause([-a, -b])
+    models = []
+    while sat.solve():
+        model = sat.model()
+        models.append(model)
+        sat.add_clause([-v for v in range(1, 5) if model[v - 1]])
+    assert sorted(model.index(True) for model in models) == [0, 1, 2, 3]
+
+
+def test_empty_and_unit_clauses():
+    sat = cdcl.Solver(2)
+    assert sat.add_clause([1])
+    assert sat.add_clause([-1, 2])
+    assert sat.solve() and sat.model() == [True, True]
+    assert not sat.add_clause([-2])
+    assert sat.solve() is False
+
+
+def test_encode():
+    choices, clauses = solver_sat.encode("0" * 81, NINE)
+    assert len(choices) == 729
+    assert [1, 2, 3, 4, 5, 6, 7, 8, 9] in clauses
+    assert solver_sat.encode("11" + "0" * 79, NINE) is None
+
+
+def test_impossible_board():
+    solutions, stats = solver_sat.solve_with_stats(
+        IMPOSSIBLE_BOARD, validator.validate_solved_board, 1
+    )
+    assert solutions == []
+    assert stats.backtracks > 0
+    assert not solver_sat.is_unique(IMPOSSIBLE_BOARD)
+
+
+def test_max_solutions_are_distinct():
+    solutions = solver_sat.solve_sudoku("0" * 81, validator.validate_solved_board, 30)
+    assert len(set(solutions)) == 30
+    board = solutions[0][:40] + "0" * 41
+    assert sorted(solver_sat.iter_solutions(board)) == sorted(
+        solver_bitmask.iter_solutions(board)
+    )
@@ -0,0 +1,76 @@
+from collections import Counter
+
+import pytest
+
+from sudokusolve import data, validator
+from sudokusolve.solver import solver_bitmask, techniques
+
+SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
+ALL_DIGITS = 0b111111111
+
+
+def mask(*digits):
+    return sum(1 << (d - 1) for d in digits)
+
+
+def test_naked_pairs():
+    candidates = [ALL_DIGITS] * 81
+    candidates[0] = candidates[1] = mask(1, 2)
+    eliminations = dict(techniques.naked_subsets(candidates, size=2))
+    assert eliminations[2] == mask(1, 2)  # same row
+    assert eliminations[10] == mask(1, 2)  # same square
+    assert 27 not in eliminations  # column only has one of the pair
+
+
+def test_hidden_pairs():
+    candidates = [ALL_DIGITS & ~mask(1, 2)] * 81
+    candidates[0] = candidates[1] = ALL_DIGITS
+    eliminations = dict(techniques.hidden_subsets(candidates, size=2))
+    assert eliminations[0] == ALL_DIGITS & ~mask(1, 2)
+    assert eliminations[1] == ALL_DIGITS & ~mask(1, 2)
+
+
+def test_pointing_pairs():
+    candidates = [ALL_DIGITS] * 81
+    for pos in (9, 10, 11, 18, 19, 20):  # rows 1 and 2 of square 0 can't be 5
+        candidates[pos] &= ~mask(5)
+    eliminations = list(techniques.pointing_pairs(candidates))
+    assert {pos for pos, bits in eliminations if bits == mask(5)} == set(range(3, 9))
+
+
+def test_x_wing():
+    candidates = [ALL_DIGITS & ~mask(7)] * 81
+    for pos in (1, 7, 37, 43):  # rows 0 and 4, columns 1 and 7
+        candidates[pos] = ALL_DIGITS
+    for pos in (19, 20, 61, 70):  # other rows of column 1, and column 7
+        candidates[pos] = ALL_DIGITS
+    eliminations = list(techniques.x_wing(candidates))
+    assert (19, mask(7)) in eliminations
+    assert (61, mask(7)) in eliminations
+    assert (20, mask(7)) not in eliminations
+
+
+def test_unknown_technique():
+    with pytest.raises(ValueError):
+        techniques.get_techniques(["swordfish"])
+
+
+@pytest.mark.parametrize("technique", list(techniques.TECHNIQUES))
+@pytest.mark.parametrize("puzzle_number", [4, 5])
+def test_solve_with_technique(technique, puzzle_number):
+    puzzle = SINGLE_SOLUTION_PUZZLES[puzzle_number]
+    solver = solver_bitmask.SudokuSolver(techniques=[technique])
+    answers = solver.solve_sudoku(puzzle.question, validator.validate_solved_board, 2)
+    assert answers == puzzle.answers
+
+
+def test_eliminations_counted():
+    puzzle = SINGLE_SOLUTION_PUZZLES[4]
+    solver = solver_bitmask.SudokuSolver()
+    solver.solve_sudoku(
+        puzzle.question, validator.validate_solved_board, 1, techniques.TECHNIQUES
+    )
+    assert sum(solver.eliminations.values()) > 0
+    assert set(solver.eliminations) <= set(techniques.TECHNIQUES)
+    solver.solve_sudoku(puzzle.question, validator.validate_solved_board, 1)
+    assert solver.eliminations == Counter()
@@ -0,0 +1,113 @@
+import pytest
+
+from sudokusolve import command_line_parser, data
+from sudokusolve.solver import api, solver_bitmask, solver_python_gen, variants
+
+# unique with the diagonals, 5 or more solutions without them
+DIAGONAL_PUZZLE = (
+    "087000000000000080000000650105000200090000000008003000000006400000005108006100090"
+)
+DIAGONAL_SOLUTION = (
+    "987654321654321987321987654175869243493572816268413579812796435739245168546138792"
+)
+
+
+def test_compile_geometry():
+    geo = variants.compile_geometry(9, ["diagonal"])
+    assert len(geo.units) == 29
+    assert 80 in geo.peers[0]
+    assert 40 in geo.peers[0]
+    assert 80 not in variants.compile_geometry(9).peers[0]
+    assert variants.compile_geometry(9, ["diagonal"]) is geo
+    assert len(variants.compile_geometry(9, ["windoku"]).units) == 31
+    assert len(variants.compile_geometry(16, ["windoku"]).units) == 57
+
+
+def test_compile_geometry_errors():
+    with pytest.raises(ValueError):
+        variants.compile_geometry(9, ["not_a_variant"])
+    with pytest.raises(ValueError):
+        variants.compile_geometry(16, ["phistomefel"])
+    with pytest.raises(ValueError):
+        variants.compile_geometry(9, regions=[range(8)])
+
+
+def test_extra_regions():
+    region = (0, 1, 2, 9, 10, 11, 18, 19, 20)
+    assert variants.compile_geometry(9, regions=[region]) == variants.compile_geometry(
+        9
+    )
+    geo = variants.compile_geometry(9, regions=[range(0, 81, 10)])
+    assert geo.units == variants.compile_geometry(9, ["diagonal"]).units[:-1]
+
+
+def test_solve_diagonal_puzzle():
+    assert solver_bitmask.count_solutions(DIAGONAL_PUZZLE, 5) == 5
+    solver = solver_bitmask.SudokuSolver(variants=["diagonal"])
+    solutions = solver.solve_sudoku(DIAGONAL_PUZZLE, lambda board: True, 2)
+    assert solutions == [DIAGONAL_SOLUTION]
+    geo = variants.compile_geometry(9, ["diagonal"])
+    assert variants.is_solution(DIAGONAL_SOLUTION, geo)
+
+
+def test_solve_with_regions():
+    """The diagonals given as regions, rather than by the variant's name"""
+    regions = [range(0, 81, 10), range(8, 73, 8)]
+    solver = solver_bitmask.SudokuSolver(regions=regions)
+    solutions = solver.solve_sudoku(DIAGONAL_PUZZLE, lambda board: True, 2)
+    assert solutions == [DIAGONAL_SOLUTION]
+    assert solver.count_solutions(DIAGONAL_PUZZLE, 2) == 1
+    grids = solver_bitmask.search(DIAGONAL_PUZZLE, regions=regions)
+    assert ["".join(solver_bitmask.grid_to_str(grid)) for grid in grids] == [
+        DIAGONAL_SOLUTION
+    ]
+
+
+@pytest.mark.parametrize(
+    "puzzle", [puzzle.question for puzzle in data.valid_sudoku_puzzles()]
+)
+def test_phistomefel_pruning(puzzle):
+    """The ring holds for every classic Sudoku, so the solutions can't change"""
+    stats, ring_stats = api.SolveStats(), api.SolveStats()
+    solutions = list(solver_bitmask.search(puzzle, stats=stats))
+    ring_solutions = list(
+        solver_bitmask.search(puzzle, stats=ring_stats, variant_names=["phistomefel"])
+    )
+    assert ring_solutions == solutions
+    assert ring_stats.nodes <= stats.nodes
+
+
+def test_match_equal_sets():
+    """Free ring positions are placed when the ring can only hold a digit as often as
+    the corners already do"""
+    geo = variants.compile_geometry(9, ["phistomefel"])
+    ring, corners = geo.equal_sets[0]
+    grid = [0] * 81
+    candidates = [geo.all_digits] * 81
+    for pos in corners:
+        grid[pos] = geo.digit_bits[DIAGONAL_SOLUTION[pos]]
+        candidates[pos] = 0
+    bit = geo.digit_bits["1"]
+    ones = [pos for pos in ring if DIAGONAL_SOLUTION[pos] == "1"]
+    for pos in ring:
+        if pos not in ones:
+            candidates[pos] &= ~bit
+    singles: list[int] = []
+    assert solver_bitmask._match_equal_sets(grid, candidates, singles, geo.equal_sets)
+    assert all(candidates[pos] == bit and pos in singles for pos in ones)
+
+
+def test_python_gen_phistomefel_positions():
+    assert solver_python_gen.PHISTOMEFAL_POSITIONS[1] == variants.phistomefel_ring()
+    assert set(solver_python_gen.PHISTOMEFAL_POSITIONS[0]) == set(
+        variants.phistomefel_corners()
+    )
+
+
+def test_command_line_variants():
+    args = command_line_parser.parse_commandline_args(
+        ["--variant", "diagonal", "--variant", "phistomefel"]
+    )
+    assert args.variants == ["diagonal", "phistomefel"]
+    for name in variants.VARIANTS:
+        command_line_parser.parse_commandline_args(["--variant", name])
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from sudokusolve import batch, data
+from sudokusolve.solver import api
+
+SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
+INVALID_BOARD = "11" + "0" * 79
+UNSOLVABLE_BOARD = "123456780" + "0" * 71 + "9"
+# no solution, which solver_bitmask takes minutes to find out
+IMPOSSIBLE_BOARD = (
+    "000005080000601043000000000010500000000106000300000005530000061000000004000000000"
+)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_many_in_order(workers):
+    boards = [puzzle.question for puzzle in SINGLE_SOLUTION_PUZZLES]
+    results = batch.solve_many(boards, solver="bitmask", workers=workers, chunksize=2)
+    assert [result.board for result in results] == boards
+    assert [result.solutions[0] for result in results] == [
+        puzzle.answers[0] for puzzle in SINGLE_SOLUTION_PUZZLES
+    ]
+    assert not any(result.error for result in results)
+
+
+def test_solve_many_errors_per_board():
+    boards = [INVALID_BOARD, SINGLE_SOLUTION_PUZZLES[0].question, UNSOLVABLE_BOARD]
+    results = batch.solve_many(boards, solver="bitmask", workers=2, chunksize=1)
+    assert results[0].error == "Input board not valid"
+    assert results[1].solutions == SINGLE_SOLUTION_PUZZLES[0].answers
+    assert results[1].error is None
+    assert results[2].error == "No digit can go in row 1, column 9"
+
+
+def test_solve_many_max_solutions():
+    puzzle = data.multiple_solution_puzzles()[0]
+    results = batch.solve_many([puzzle.question], solver="bitmask", max_solutions=2)
+    assert len(results[0].solutions) == 2
+    results = batch.solve_many([puzzle.question], solver="bitmask", max_solutions=0)
+    assert results[0].solutions == []
+
+
+def test_solve_many_board_sizes():
+    large = data.sudoku_puzzles("single_solution_puzzles_16x16")[0]
+    boards = [large.question, SINGLE_SOLUTION_PUZZLES[0].question]
+    results = batch.solve_many(boards, solver="bitmask", workers=1)
+    assert results[0].solutions == large.answers
+    results = batch.solve_many(boards, solver="python_sets", workers=1)
+    assert results[0].error == "The solver can't solve boards of this size"
+    assert results[1].solutions == SINGLE_SOLUTION_PUZZLES[0].answers
+
+
+def test_solve_boards_stops_at_deadline():
+    boards = [IMPOSSIBLE_BOARD, SINGLE_SOLUTION_PUZZLES[0].question]
+    start = time.monotonic()
+    results = batch.solve_boards("bitmask", boards, 1, start + 0.2)
+    assert time.monotonic() - start < 5
+    assert [result.error for result in results] == [
+        api.EXCEEDED_MESSAGES["deadline"]
+    ] * 2
@@ -0,0 +1,48 @@
+import csv
+
+import pytest
+
+from sudokusolve import bench, command_line_parser, data
+
+SINGLE_SOLUTION_PUZZLES = data.valid_sudoku_puzzles()
+
+
+def test_load_corpus_category():
+    boards = bench.load_corpus("single_solution_puzzles")
+    assert boards == [puzzle.question for puzzle in SINGLE_SOLUTION_PUZZLES]
+
+
+def test_load_corpus_file(tmp_path):
+    corpus_file = tmp_path / "boards.txt"
+    board = SINGLE_SOLUTION_PUZZLES[0].question
+    corpus_file.write_text(f"{board[:40]}-{board[40:]}\n\n{board}\n")
+    assert bench.load_corpus(str(corpus_file)) == [board, board]
+
+
+def test_load_corpus_missing():
+    with pytest.raises(ValueError):
+        bench.load_corpus("no_such_corpus")
+
+
+def test_percentiles():
+    times = [n / 100 for n in range(1, 101)]
+    result = bench.percentiles(times)
+    assert result[50] == pytest.approx(0.505)
+    assert result[90] == pytest.approx(0.901)
+    assert bench.percentiles([0.5]) == {50: 0.5, 90: 0.5, 99: 0.5}
+
+
+def test_bench_appends_scores(tmp_path, capsys):
+    scores_file = tmp_path / "scores.csv"
+    args = command_line_parser.parse_commandline_args(
+        ["bench", "-s", "bitmask", "-c", "multiple_solution_puzzles", "-r", "2"]
+        + ["--csv", str(scores_file)]
+    )
+    bench.main(args)
+    assert "multiple_solution_puzzles" in capsys.readouterr().out
+    with open(scores_file, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2
+    assert rows[0]["sudoku"] == f'"{data.multiple_solution_puzzles()[0].question}"'
+    assert rows[0]["version"].startswith("bitmask-v")
+    assert float(rows[0]["time"]) >= 0
@@ -0,0 +1,160 @@
+import pytest
+
+from sudokusolve import cache, config, data, validator
+from sudokusolve.solver import api, solver_bitmask, solver_python_sets
+
+PUZZLES = data.valid_sudoku_puzzles()
+BOARD = PUZZLES[0].question
+
+
+class CountingSolver:
+    """Solves with solver_bitmask, counting the solves"""
+
+    __name__ = "counting"
+    correct_by_construction = True
+
+    def __init__(self):
+        self.solves = 0
+
+    def solve_sudoku(self, board, completed_board_validator, max_solutions=1):
+        self.solves += 1
+        return solver_bitmask.solve_sudoku(
+            board, completed_board_validator, max_solutions
+        )
+
+
+@pytest.fixture
+def counting_solver():
+    return CountingSolver()
+
+
+def test_hits_and_misses(counting_solver):
+    solver = cache.CachedSolver(counting_solver)
+    first = solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    second = solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    assert first == second == PUZZLES[0].answers
+    assert counting_solver.solves == 1
+    assert (solver.stats.hits, solver.stats.misses) == (1, 1)
+    # the returned list is a copy, so changing it doesn't change the cache
+    second.clear()
+    assert solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+
+
+def test_max_solutions_is_part_of_the_key(counting_solver):
+    solver = cache.CachedSolver(counting_solver)
+    solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    solver.solve_sudoku(BOARD, validator.validate_solved_board, 2)
+    assert counting_solver.solves == 2
+    assert solver.stats.misses == 2
+
+
+def test_least_recently_used_is_evicted(counting_solver):
+    solver = cache.CachedSolver(counting_solver, max_entries=2)
+    boards = [puzzle.question for puzzle in PUZZLES[:3]]
+    solver.solve_sudoku(boards[0], validator.accept_all, 1)
+    solver.solve_sudoku(boards[1], validator.accept_all, 1)
+    solver.solve_sudoku(boards[0], validator.accept_all, 1)
+    solver.solve_sudoku(boards[2], validator.accept_all, 1)
+    assert solver.stats.evictions == 1
+    solver.solve_sudoku(boards[0], validator.accept_all, 1)
+    assert solver.stats.hits == 2
+    solver.solve_sudoku(boards[1], validator.accept_all, 1)
+    assert solver.stats.misses == 4
+    assert counting_solver.solves == 4
+
+
+def test_other_validators_are_not_cached(counting_solver):
+    solver = cache.CachedSolver(counting_solver)
+    solver.solve_sudoku(BOARD, lambda _: True, 1)
+    solver.solve_sudoku(BOARD, lambda _: True, 1)
+    assert counting_solver.solves == 2
+    assert solver.stats.hits == solver.stats.misses == 0
+
+
+def test_unchecked_solutions_are_only_cached_when_correct(counting_solver):
+    counting_solver.correct_by_construction = False
+    solver = cache.CachedSolver(counting_solver)
+    solver.solve_sudoku(BOARD, validator.accept_all, 1)
+    solver.solve_sudoku(BOARD, validator.accept_all, 1)
+    assert counting_solver.solves == 2
+    solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    assert counting_solver.solves == 3
+
+
+def test_store_survives_restart(tmp_path, counting_solver):
+    store = tmp_path / "cache.sqlite"
+    solver = cache.CachedSolver(counting_solver, store=store)
+    solver.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    solver.store.close()
+    restarted = cache.CachedSolver(counting_solver, store=store)
+    solutions = restarted.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    assert solutions == PUZZLES[0].answers
+    assert counting_solver.solves == 1
+    assert restarted.stats.store_hits == 1
+    restarted.clear()
+    restarted.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    assert counting_solver.solves == 2
+
+
+def test_solver_objects_have_their_own_names(tmp_path):
+    store = tmp_path / "cache.sqlite"
+    bitmask = cache.CachedSolver(solver_bitmask.SudokuSolver(), store=store)
+    python_sets = cache.CachedSolver(solver_python_sets.SudokuSolver(), store=store)
+    assert bitmask.name == "sudokusolve.solver.solver_bitmask.SudokuSolver"
+    assert python_sets.name == "sudokusolve.solver.solver_python_sets.SudokuSolver"
+    assert cache.CachedSolver(solver_bitmask).name == solver_bitmask.__name__
+    bitmask.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    python_sets.solve_sudoku(BOARD, validator.validate_solved_board, 1)
+    assert python_sets.stats.store_hits == 0
+
+
+def test_unsolvable_board_is_cached(tmp_path, counting_solver):
+    board = "5" + BOARD[1:]
+    solver = cache.CachedSolver(counting_solver, store=tmp_path / "cache.sqlite")
+    assert solver.solve_sudoku(board, validator.validate_solved_board, 1) == []
+    solver._solutions.clear()
+    assert solver.solve_sudoku(board, validator.validate_solved_board, 1) == []
+    assert solver.stats.store_hits == 1
+
+
+def test_solve_with_stats():
+    solver = cache.CachedSolver(solver_bitmask)
+    _, stats = solver.solve_with_stats(PUZZLES[4].question, validator.accept_all, 1)
+    assert stats.nodes > 0
+    solutions, stats = solver.solve_with_stats(
+        PUZZLES[4].question, validator.accept_all, 1
+    )
+    assert solutions == PUZZLES[4].answers
+    assert stats.nodes == 0
+    assert solver.correct_by_construction
+
+
+def test_iter_solutions_validates_by_default():
+    solver = cache.CachedSolver(solver_python_sets.SudokuSolver())
+    assert list(solver.iter_solutions(PUZZLES[4].question)) == PUZZLES[4].answers
+
+
+def test_exceeded_budget_is_not_cached():
+    solver = cache.CachedSolver(solver_bitmask)
+    board = PUZZLES[4].question
+    result = solver.solve_within(
+        board, validator.accept_all, 1, api.Budget(max_nodes=1)
+    )
+    assert result.exceeded == "nodes"
+    result = solver.solve_within(board, validator.accept_all, 1, api.Budget())
+    assert result.solutions == PUZZLES[4].answers
+    assert result.exceeded is None
+    assert solver.stats.misses == 1
+    result = solver.solve_within(board, validator.accept_all, 1, api.Budget())
+    assert result.solutions == PUZZLES[4].answers
+    assert solver.stats.hits == 1
+
+
+def test_cached_follows_settings():
+    disabled = config.CacheSettings(enabled=False, max_entries=5, persistent=False)
+    assert cache.cached(solver_bitmask, disabled) is solver_bitmask
+    enabled = disabled._replace(enabled=True)
+    solver = cache.cached(solver_bitmask, enabled)
+    assert solver.max_entries == 5
+    assert solver.store is None
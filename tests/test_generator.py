@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from sudokusolve import command_line_parser, generator, validator
+from sudokusolve.solver import solver_bitmask
+
+SOLVED_BOARD = (
+    "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+)
+SINGLE_SOLUTION_BOARD = (
+    "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+)
+
+
+def to_grid(board: str) -> list[int]:
+    return [1 << (int(num) - 1) if num != "0" else 0 for num in board]
+
+
+def test_count_grid_solutions():
+    assert solver_bitmask.count_grid_solutions(to_grid(SINGLE_SOLUTION_BOARD), 2) == 1
+    assert solver_bitmask.count_grid_solutions([0] * 81, 5) == 5
+    assert solver_bitmask.count_grid_solutions([0] * 81, 0) == 0
+    contradiction = to_grid("11" + "0" * 79)
+    assert solver_bitmask.count_grid_solutions(contradiction, 2) == 0
+
+
+def test_solves_with_singles():
+    assert solver_bitmask.solves_with_singles(to_grid(SINGLE_SOLUTION_BOARD))
+    assert not solver_bitmask.solves_with_singles([0] * 81)
+
+
+def test_random_solution_is_valid():
+    rng = random.Random(0)
+    for _ in range(5):
+        grid = generator.random_solution(rng)
+        assert validator.validate_solved_board(generator._grid_to_str(grid))
+
+
+def test_has_other_solution():
+    grid = to_grid(SOLVED_BOARD)
+    bit = grid[0]
+    grid[0] = 0
+    assert not generator.has_other_solution(grid, 0, bit)
+    assert grid[0] == 0
+    grid = to_grid(SOLVED_BOARD[:2] + "0" * 79)
+    bit = grid[0]
+    grid[0] = 0
+    assert generator.has_other_solution(grid, 0, bit)
+
+
+@pytest.mark.parametrize("difficulty", generator.DIFFICULTIES)
+def test_generate_puzzle(difficulty):
+    settings = generator.DIFFICULTIES[difficulty]
+    puzzle = generator.generate_puzzle(difficulty, random.Random(difficulty))
+    assert validator.validate_input_board(puzzle.question)
+    assert solver_bitmask.count_solutions(puzzle.question, 2) == 1
+    assert solver_bitmask.solve_sudoku(
+        puzzle.question, validator.validate_solved_board
+    ) == [puzzle.solution]
+    assert 81 - puzzle.question.count("0") >= settings.min_clues
+    assert (
+        solver_bitmask.solves_with_singles(to_grid(puzzle.question))
+        == settings.solved_by_singles
+    )
+
+
+def test_generate_many_is_reproducible():
+    puzzles = generator.generate_many(6, "hard", workers=1, seed=42)
+    assert len(puzzles) == 6
+    assert len({puzzle.question for puzzle in puzzles}) == 6
+    assert generator.generate_many(6, "hard", workers=2, seed=42) == puzzles
+    assert generator.generate_many(6, "hard", workers=1, seed=43) != puzzles
+
+
+def test_generate_many_unknown_difficulty():
+    with pytest.raises(ValueError):
+        generator.generate_many(1, "impossible")
+
+
+def test_generate_command(tmp_path, capsys):
+    output = tmp_path / "puzzles.txt"
+    args = command_line_parser.parse_commandline_args(
+        ["generate", "-n", "3", "-d", "easy", "-w", "1", "--seed", "7"]
+        + ["-o", str(output)]
+    )
+    generator.main(args)
+    boards = output.read_text().split()
+    assert len(boards) == 3
+    assert all(solver_bitmask.is_unique(board) for board in boards)
+    assert "per minute" in capsys.readouterr().err
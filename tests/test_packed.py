@@ -0,0 +1,88 @@
+import pytest
+
+from sudokusolve import data, packed
+
+PUZZLES = data.valid_sudoku_puzzles()
+BOARDS = [puzzle.question for puzzle in PUZZLES] + [
+    puzzle.answers[0] for puzzle in PUZZLES
+]
+
+
+@pytest.fixture
+def packed_file(tmp_path):
+    path = tmp_path / "boards.packed"
+    assert packed.write_packed(path, iter(BOARDS)) == len(BOARDS)
+    return path
+
+
+def test_pack_round_trip():
+    packed_boards = packed.pack_boards(BOARDS)
+    assert len(packed_boards) == packed.PACKED_SIZE * len(BOARDS)
+    assert packed.unpack_boards(packed_boards) == BOARDS
+    assert packed.pack_boards([]) == b""
+    assert packed.unpack_boards(b"") == []
+
+
+@pytest.mark.parametrize(
+    "boards",
+    [["0" * 80], ["0" * 82], ["0" * 80, "0" * 82], ["x" * 81], [""]],
+    ids=["short", "long", "short and long", "not digits", "empty"],
+)
+def test_pack_bad_boards(boards):
+    with pytest.raises(ValueError):
+        packed.pack_boards(boards)
+
+
+def test_unpack_bad_data():
+    with pytest.raises(ValueError):
+        packed.unpack_boards(b"\0" * 40)
+    with pytest.raises(ValueError):
+        packed.unpack_boards(b"\xaa" * 41)
+    with pytest.raises(ValueError):
+        packed.unpack_boards(b"\0" * 40 + b"\x01")
+
+
+def test_packed_file(packed_file):
+    assert packed_file.stat().st_size == packed.HEADER.size + 41 * len(BOARDS)
+    assert packed.is_packed(packed_file)
+    with packed.PackedBoards(packed_file) as boards:
+        assert len(boards) == len(BOARDS)
+        assert boards[3] == BOARDS[3]
+        assert boards[-1] == BOARDS[-1]
+        assert list(boards) == BOARDS
+        assert boards.data.obj is boards._map
+        with pytest.raises(IndexError):
+            boards[len(BOARDS)]
+
+
+def test_not_a_packed_file(tmp_path):
+    path = tmp_path / "boards.txt"
+    path.write_text("\n".join(BOARDS))
+    assert not packed.is_packed(path)
+    with pytest.raises(ValueError):
+        packed.PackedBoards(path)
+
+
+def test_read_boards(packed_file, tmp_path):
+    text_file = tmp_path / "boards.txt"
+    text_file.write_text("\n".join(BOARDS) + "\n\n")
+    assert list(data.read_boards(packed_file)) == BOARDS
+    assert list(data.read_boards(text_file)) == BOARDS
+
+
+def test_numpy_array_is_zero_copy(packed_file):
+    np = pytest.importorskip("numpy")
+    from sudokusolve.solver import solver_numpy_batch
+
+    with packed.PackedBoards(packed_file) as boards:
+        array = boards.as_array()
+        assert array.shape == (len(BOARDS), packed.PACKED_SIZE)
+        assert not array.flags.owndata
+        digits = packed.unpack_array(array)
+        expected = np.array([[int(d) for d in board] for board in BOARDS])
+        assert (digits == expected).all()
+        solutions = solver_numpy_batch.solve_packed(array, chunksize=5)
+        del array
+    assert [solved[0] for solved in solutions] == [
+        puzzle.answers[0] for puzzle in PUZZLES * 2
+    ]
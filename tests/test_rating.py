@@ -0,0 +1,114 @@
+import pytest
+
+from sudokusolve import command_line_parser, data, rating
+from sudokusolve.solver import techniques
+
+# solved by naked singles alone
+EASY_BOARD = (
+    "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+)
+# needs hidden singles
+HIDDEN_SINGLES_BOARD = (
+    "069800500000000103400000020000170000080006000307020004000040200630000000850000000"
+)
+# needs searching
+SEARCH_BOARD = (
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+)
+SOLVED_BOARD = (
+    "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+)
+
+
+def test_rate_singles():
+    assert rating.rate_board(EASY_BOARD) == rating.Rating(
+        1.0, "easy", "naked_singles", 0
+    )
+    assert rating.rate_board(HIDDEN_SINGLES_BOARD).hardest == "hidden_singles"
+    assert rating.rate_board(SOLVED_BOARD) == rating.Rating(0.0, "easy", "givens", 0)
+
+
+def test_rate_search():
+    result = rating.rate_board(SEARCH_BOARD)
+    assert result.hardest == "search"
+    assert result.guesses > 0
+    assert result.score > rating.LEVELS["search"]
+    assert result.name == rating.score_name(result.score)
+
+
+def test_search_is_capped(monkeypatch):
+    full_search = rating.rate_board(SEARCH_BOARD)
+    monkeypatch.setattr(rating, "MAX_SEARCH_NODES", 64)
+    capped_search = rating.rate_board(SEARCH_BOARD)
+    assert capped_search.hardest == "search"
+    assert 0 < capped_search.guesses < full_search.guesses
+
+
+def test_search_scores_higher_than_rules():
+    ratings = [
+        rating.rate_board(puzzle.question) for puzzle in data.valid_sudoku_puzzles()
+    ]
+    searched = [result.score for result in ratings if result.hardest == "search"]
+    solved_by_rules = [result.score for result in ratings if result.hardest != "search"]
+    assert searched and solved_by_rules
+    assert max(solved_by_rules) < min(searched)
+
+
+def test_score_name():
+    assert rating.score_name(0) == "easy"
+    assert rating.score_name(2.5) == "medium"
+    assert rating.score_name(100) == "extreme"
+
+
+@pytest.mark.parametrize(
+    "board, error",
+    [
+        ("123", "Input board not valid"),
+        ("11" + "0" * 79, "Input board not valid"),
+        # no digit is left for the last position of the first row
+        ("123456780" + "00000000" + "9" + "0" * 63, "no solution"),
+    ],
+)
+def test_rate_board_errors(board, error):
+    with pytest.raises(ValueError, match=error):
+        rating.rate_board(board)
+
+
+def test_singles_skip_the_techniques(monkeypatch):
+    def apply_techniques(*args):
+        raise AssertionError("techniques applied to a full grid")
+
+    monkeypatch.setattr(techniques, "apply_techniques", apply_techniques)
+    assert rating.rate_board(HIDDEN_SINGLES_BOARD).hardest == "hidden_singles"
+
+
+def test_rate_board_gives_the_reason():
+    with pytest.raises(ValueError, match="No digit can go in row 1, column 9"):
+        rating.rate_board("123456780" + "0" * 71 + "9")
+
+
+def test_rate_many():
+    boards = [EASY_BOARD, "not a board", SEARCH_BOARD]
+    results = rating.rate_many(boards, workers=1)
+    assert [result.board for result in results] == boards
+    assert results[0].rating == rating.rate_board(EASY_BOARD)
+    assert results[1].rating is None and results[1].error
+    assert rating.rate_many(boards, workers=2, chunksize=1) == results
+
+
+def test_rate_command(tmp_path, capsys):
+    corpus = tmp_path / "boards.txt"
+    corpus.write_text(f"{EASY_BOARD}\n{SEARCH_BOARD}\n")
+    args = command_line_parser.parse_commandline_args(["rate", str(corpus), "-w", "1"])
+    rating.main(args)
+    out, err = capsys.readouterr()
+    assert f"{EASY_BOARD}   1.00 easy" in out
+    assert "Rated 2 boards" in err
+
+
+def test_rate_large_boards():
+    for category in ("single_solution_puzzles_16x16", "single_solution_puzzles_25x25"):
+        for puzzle in data.sudoku_puzzles(category):
+            result = rating.rate_board(puzzle.question)
+            assert result.hardest in ("hidden_singles", "naked_singles", "search")
+            assert result.name == rating.score_name(result.score)
@@ -0,0 +1,188 @@
+import asyncio
+import json
+
+import pytest
+
+from sudokusolve import data, server
+
+PUZZLE = data.valid_sudoku_puzzles()[0]
+EMPTY_BOARD = "0" * 81
+
+
+async def http(reader, writer, method, path, payload=None):
+    """Sends a request on the connection and returns the status, headers and JSON
+    payload of the response"""
+    if payload is None:
+        body = b""
+    elif isinstance(payload, bytes):
+        body = payload
+    else:
+        body = json.dumps(payload).encode()
+    request = f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(request.encode() + body)
+    status_line = await reader.readline()
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    response = await reader.readexactly(int(headers["content-length"]))
+    return int(status_line.split()[1]), headers, json.loads(response)
+
+
+async def jobs_finished(solve_server, seconds=10):
+    """Waits for the server's pending jobs to finish"""
+    for _ in range(int(seconds / 0.05)):
+        if not solve_server.pending:
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+def serve(check, unix_path=None, **settings):
+    """Runs check(solve_server, reader, writer) with a connection to a server with
+    a single worker"""
+
+    async def main():
+        solve_server = server.SolveServer(["bitmask", "dlx"], workers=1, **settings)
+        await solve_server.start()
+        listener = await solve_server.listen("127.0.0.1", 0, unix_path)
+        try:
+            if unix_path:
+                reader, writer = await asyncio.open_unix_connection(unix_path)
+            else:
+                address = listener.sockets[0].getsockname()[:2]
+                reader, writer = await asyncio.open_connection(*address)
+            await check(solve_server, reader, writer)
+            writer.close()
+        finally:
+            listener.close()
+            solve_server.close()
+
+    asyncio.run(main())
+
+
+def test_solve_batch_and_health_on_one_connection():
+    async def check(solve_server, reader, writer):
+        status, headers, payload = await http(
+            reader, writer, "POST", "/solve", {"board": PUZZLE.question}
+        )
+        assert status == 200
+        assert headers["connection"] == "keep-alive"
+        assert payload == {
+            "board": PUZZLE.question,
+            "solutions": PUZZLE.answers,
+            "error": None,
+        }
+        status, _, payload = await http(
+            reader,
+            writer,
+            "POST",
+            "/batch",
+            {
+                "boards": [PUZZLE.question, "not a board", EMPTY_BOARD],
+                "solver": "dlx",
+                "max_solutions": 2,
+            },
+        )
+        assert status == 200
+        results = payload["results"]
+        assert [result["board"] for result in results] == [
+            PUZZLE.question,
+            "not a board",
+            EMPTY_BOARD,
+        ]
+        assert results[0]["solutions"] == PUZZLE.answers
+        assert results[1]["error"] == "Input board not valid"
+        assert len(results[2]["solutions"]) == 2
+        status, _, payload = await http(reader, writer, "GET", "/health")
+        assert status == 200
+        assert payload["solvers"] == ["bitmask", "dlx"]
+        assert payload["pending"] == 0
+
+    serve(check)
+
+
+def test_unix_socket(tmp_path):
+    async def check(solve_server, reader, writer):
+        status, _, payload = await http(
+            reader, writer, "POST", "/solve", {"board": PUZZLE.question}
+        )
+        assert status == 200
+        assert payload["solutions"] == PUZZLE.answers
+
+    serve(check, unix_path=str(tmp_path / "sudoku.sock"))
+
+
+@pytest.mark.parametrize(
+    "method, path, payload, status",
+    [
+        ("GET", "/nowhere", None, 404),
+        ("GET", "/solve", None, 405),
+        ("POST", "/solve", b"not json", 400),
+        ("POST", "/solve", [PUZZLE.question], 400),
+        ("POST", "/solve", {"boards": [PUZZLE.question]}, 400),
+        ("POST", "/solve", {"board": PUZZLE.question, "solver": "python_gen"}, 400),
+        ("POST", "/solve", {"board": PUZZLE.question, "max_solutions": 0}, 400),
+        ("POST", "/solve", {"board": PUZZLE.question, "timeout": "soon"}, 400),
+        ("POST", "/batch", {"boards": [1, 2]}, 400),
+        ("POST", "/batch", {"boards": [PUZZLE.question] * 3}, 413),
+    ],
+)
+def test_bad_requests(method, path, payload, status):
+    async def check(solve_server, reader, writer):
+        response = await http(reader, writer, method, path, payload)
+        assert response[0] == status
+        assert response[2]["error"]
+        # the connection can still be used
+        assert (await http(reader, writer, "GET", "/health"))[0] == 200
+
+    serve(check, max_batch=2)
+
+
+def test_busy_server_turns_requests_away():
+    async def check(solve_server, reader, writer):
+        solve_server.pending = solve_server.max_pending
+        status, headers, _ = await http(
+            reader, writer, "POST", "/solve", {"board": PUZZLE.question}
+        )
+        assert status == 503
+        assert headers["retry-after"] == str(server.RETRY_AFTER_SECONDS)
+        solve_server.pending = 0
+        status, _, _ = await http(
+            reader, writer, "POST", "/solve", {"board": PUZZLE.question}
+        )
+        assert status == 200
+
+    serve(check, max_pending=2)
+
+
+def test_timeout():
+    async def check(solve_server, reader, writer):
+        boards = [puzzle.question for puzzle in data.valid_sudoku_puzzles()] * 50
+        status, _, payload = await http(
+            reader, writer, "POST", "/batch", {"boards": boards, "timeout": 0.001}
+        )
+        assert status == 504
+        assert "0.001" in payload["error"]
+        # the job keeps its place until the worker has finished it
+        assert await jobs_finished(solve_server)
+
+    serve(check)
+
+
+def test_request_timeout_is_capped():
+    async def check(solve_server, reader, writer):
+        boards = [puzzle.question for puzzle in data.valid_sudoku_puzzles()] * 50
+        status, _, payload = await http(
+            reader, writer, "POST", "/batch", {"boards": boards, "timeout": 60}
+        )
+        assert status == 504
+        assert "0.001" in payload["error"]
+        assert await jobs_finished(solve_server)
+
+    serve(check, timeout=0.001)
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        server.SolveServer(["no_such_solver"])
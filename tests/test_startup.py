@@ -0,0 +1,103 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sudokusolve import config, plugins
+
+REPO_DIRECTORY = Path(__file__).parents[1]
+SOLVE_ARGS = ["-b", "0", "-u", "unformatted_CLI"]
+SOLVE_COMMAND = ["-m", "sudokusolve", *SOLVE_ARGS]
+# solves the board, then prints the names of the modules that were imported
+LIST_IMPORTS = (
+    "import runpy, sys;"
+    f"sys.argv = ['sudokusolve', *{SOLVE_ARGS!r}];"
+    "runpy.run_module('sudokusolve', run_name='__main__');"
+    "print(*sys.modules, file=sys.stderr)"
+)
+# seconds that solving a preset board may take on top of starting python
+STARTUP_BUDGET = 0.2
+RUNS = 5
+# modules that solving a board with the default settings doesn't need
+LAZY_MODULES = {
+    "sudokusolve.bench",
+    "sudokusolve.cache",
+    "sudokusolve.generator",
+    "sudokusolve.rating",
+    "sudokusolve.server",
+    "sudokusolve.packed",
+    "csv",
+    "numpy",
+    "pkgutil",
+    "sqlite3",
+    "statistics",
+    "tempfile",
+}
+
+
+def run_python(args: list[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def median_run_time(args: list[str]) -> float:
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        run_python(args)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def test_solve_does_not_import_unused_modules():
+    imported = set(run_python(["-c", LIST_IMPORTS]).stderr.split())
+    assert "sudokusolve.solver.solver_bitmask" in imported
+    assert not imported & LAZY_MODULES
+
+
+def test_startup_budget():
+    run_python(SOLVE_COMMAND)  # compile the bytecode first
+    startup_time = median_run_time(SOLVE_COMMAND) - median_run_time(["-c", "pass"])
+    assert startup_time < STARTUP_BUDGET
+
+
+@pytest.fixture
+def manifest_path(tmp_path, monkeypatch):
+    path = tmp_path / "plugin_manifest.json"
+    monkeypatch.setattr(
+        config, "filepaths", config.filepaths._replace(plugin_manifest=path)
+    )
+    return path
+
+
+def test_plugin_manifest_is_reused(manifest_path, monkeypatch):
+    found = plugins.find_available_plugins()
+    assert "bitmask" in found["solver"]
+    assert manifest_path.exists()
+
+    def scan_plugins():
+        raise AssertionError("the plugin directories were scanned again")
+
+    monkeypatch.setattr(plugins, "_scan_plugins", scan_plugins)
+    assert plugins.find_available_plugins() == found
+
+
+def test_stale_plugin_manifest_is_rebuilt(manifest_path):
+    found = plugins.find_available_plugins()
+    directories = plugins._plugin_directories()
+    directories["solver"][1] -= 1
+    plugins._write_manifest({"directories": directories, "plugins": {}})
+    assert plugins.find_available_plugins() == found
+
+
+def test_unreadable_plugin_manifest_is_rebuilt(manifest_path):
+    manifest_path.write_text("not json")
+    assert "bitmask" in plugins.find_available_plugins()["solver"]
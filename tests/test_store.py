@@ -0,0 +1,90 @@
+import pytest
+
+from sudokusolve import data, store
+
+PUZZLES = data.valid_sudoku_puzzles()
+MULTIPLE = data.multiple_solution_puzzles()
+BLANK = store.TestSudoku("", [PUZZLES[0].answers[0]])
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "puzzles.store"
+    store.write_store(
+        path, {"single": iter(PUZZLES), "multiple": MULTIPLE, "blank": [BLANK]}
+    )
+    return path
+
+
+def test_round_trip(store_path):
+    with store.PuzzleStore(store_path) as puzzle_store:
+        assert list(puzzle_store.categories) == ["single", "multiple", "blank"]
+        assert len(puzzle_store) == len(PUZZLES) + len(MULTIPLE) + 1
+        assert puzzle_store.count("single") == len(PUZZLES)
+        assert list(puzzle_store.iter_puzzles("single")) == PUZZLES
+        assert list(puzzle_store.iter_puzzles("multiple")) == MULTIPLE
+        assert list(puzzle_store.iter_puzzles("blank")) == [BLANK]
+        assert list(puzzle_store.iter_puzzles()) == PUZZLES + MULTIPLE + [BLANK]
+
+
+def test_random_access(store_path):
+    with store.PuzzleStore(store_path) as puzzle_store:
+        assert puzzle_store.get("single", 3) == PUZZLES[3]
+        assert puzzle_store.get("single", -1) == PUZZLES[-1]
+        assert puzzle_store.get("multiple", 0) == MULTIPLE[0]
+        with pytest.raises(IndexError):
+            puzzle_store.get("single", len(PUZZLES))
+        with pytest.raises(KeyError):
+            puzzle_store.get("daily", 0)
+
+
+def test_streams_generated_puzzles(tmp_path):
+    path = tmp_path / "many.store"
+    count = 20_000
+    puzzles = (store.TestSudoku(f"{n:081d}", []) for n in range(count))
+    store.write_store(path, {"many": puzzles})
+    with store.PuzzleStore(path) as puzzle_store:
+        assert puzzle_store.get("many", 12345).question == f"{12345:081d}"
+        assert sum(1 for _ in puzzle_store.iter_puzzles("many")) == count
+
+
+def test_larger_boards(tmp_path):
+    path = tmp_path / "large.store"
+    puzzles = data.sudoku_puzzles("single_solution_puzzles_25x25")
+    store.write_store(path, {"25x25": puzzles, "9x9": PUZZLES}, board_size=625)
+    with store.PuzzleStore(path) as puzzle_store:
+        assert puzzle_store.board_size == 625
+        assert puzzle_store.get("25x25", -1) == puzzles[-1]
+        assert list(puzzle_store.iter_puzzles("9x9")) == PUZZLES
+
+
+def test_not_a_store(tmp_path):
+    path = tmp_path / "puzzles.json"
+    path.write_text('{"single_solution_puzzles": []}' * 10)
+    with pytest.raises(store.StoreError):
+        store.PuzzleStore(path)
+    path.write_text("")
+    with pytest.raises(store.StoreError):
+        store.PuzzleStore(path)
+
+
+def test_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        store.write_store(tmp_path / "a", {"x" * 100: []})
+    with pytest.raises(ValueError):
+        store.write_store(tmp_path / "b", {"long": [store.TestSudoku("0" * 82, [])]})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_data_layer():
+    assert data.categories() == [
+        "single_solution_puzzles",
+        "invalid_boards",
+        "multiple_solution_puzzles",
+        "single_solution_puzzles_16x16",
+        "single_solution_puzzles_25x25",
+    ]
+    assert data.valid_sudoku_question(2) == PUZZLES[2].question
+    assert next(data.iter_sudoku_puzzles("multiple_solution_puzzles")) == MULTIPLE[0]
+    with pytest.raises(KeyError):
+        data.sudoku_puzzles("daily")
@@ -72,3 +72,99 @@ def test_validate_solved_board(board, expected_answer):
 def test_clean_strings():
     assert validator.clean_string(STANDARD_VALID_INPUT) == STANDARD_VALID_INPUT
     assert validator.clean_string(r"  %01af\df2/3'#45qq 6=789 ") == "0123456789"
+
+
+def _reference_validate_solved_board(board):
+    return validator._correct_number_of_digits(board) and all(
+        validator._all_digits_present(board, get_rcs)
+        for get_rcs in (
+            validator._get_all_rows,
+            validator._get_all_columns,
+            validator._get_all_squares,
+        )
+    )
+
+
+def _reference_validate_input_board(board):
+    return (
+        validator._correct_number_of_digits(board)
+        and validator._only_digits_0_9(board)
+        and all(
+            validator._digits_present_only_once(board, get_rcs)
+            for get_rcs in (
+                validator._get_all_rows,
+                validator._get_all_columns,
+                validator._get_all_squares,
+            )
+        )
+    )
+
+
+@pytest.mark.parametrize("position", range(0, 81, 7))
+@pytest.mark.parametrize("digit", "0159x")
+def test_fast_validators_match_reference(position, digit):
+    for board in (STANDARD_VALID_SOLVED, STANDARD_VALID_INPUT, INVALID_BOARD_SOLVED):
+        changed = board[:position] + digit + board[position + 1 :]
+        assert validator.validate_solved_board(
+            changed
+        ) == _reference_validate_solved_board(changed)
+        assert validator.validate_input_board(
+            changed
+        ) == _reference_validate_input_board(changed)
+
+
+def test_solution_validator():
+    class Checked:
+        correct_by_construction = False
+
+    class Unchecked:
+        correct_by_construction = True
+
+    assert validator.solution_validator(Checked) is validator.validate_solved_board
+    assert validator.solution_validator(object()) is validator.validate_solved_board
+    assert validator.solution_validator(Unchecked) is validator.accept_all
+
+
+LARGE_PUZZLES = [
+    *data.sudoku_puzzles("single_solution_puzzles_16x16"),
+    *data.sudoku_puzzles("single_solution_puzzles_25x25"),
+]
+
+
+@pytest.mark.parametrize("puzzle", LARGE_PUZZLES, ids=lambda p: f"{len(p.question)}")
+def test_validate_large_boards(puzzle):
+    answer = puzzle.answers[0]
+    side = int(len(answer) ** 0.5)
+    assert validator.validate_input_board(puzzle.question)
+    assert validator.validate_solved_board(answer)
+    swapped = answer[1] + answer[0] + answer[2:]
+    assert not validator.validate_solved_board(swapped)
+    assert not validator.validate_input_board(swapped)
+    assert not validator.validate_solved_board(answer.lower())
+    # the first digit that's too large for the side
+    too_large = "123456789ABCDEFGHIJKLMNOPQ"[side]
+    assert not validator.validate_input_board(too_large + puzzle.question[1:])
+    assert not validator.validate_input_board(puzzle.question[1:])
+
+
+def test_clean_large_boards():
+    board = LARGE_PUZZLES[0].question
+    rows = [board[i : i + 16].lower() for i in range(0, 256, 16)]
+    assert validator.clean_string("\n".join(rows)) == board
+    assert validator.clean_string(board, 16) == board
+    assert validator.clean_string(board, 9) == board.translate(
+        str.maketrans("", "", "ABCDEFG")
+    )
+
+
+def test_supports_board():
+    class NineOnly:
+        pass
+
+    class AllSizes:
+        board_sides = (9, 16, 25)
+
+    large_board = LARGE_PUZZLES[0].question
+    assert validator.supports_board(NineOnly, STANDARD_VALID_INPUT)
+    assert not validator.supports_board(NineOnly, large_board)
+    assert validator.supports_board(AllSizes, large_board)